@@ -0,0 +1,541 @@
+"""A machine-wide, content-addressed store of files shared between projects
+
+Each distinct file content is stored once, as a read-only object. A published directory becomes a tree, a listing of
+the objects at each relative path along with its directories and symlinks. With hardlinks enabled, the published
+directory and every directory the tree is checked out to link their files to the objects. Otherwise files are
+cloned, and content that can only be copied is not published at all, since the store would then hold a second copy
+of it. Directories register a reference to the tree they hold, and garbage collection only removes trees that no
+existing directory refers to, followed by the objects that no remaining tree lists
+
+Readers hold the store lock shared and garbage collection holds it exclusively, so a tree is never collected while
+it is being published or linked
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from collections.abc import Collection
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from cppython.cache import cache_directory, write_atomic
+from cppython.locking import FileLock
+
+REFERENCE_NAME = ".cppython-artifacts"
+
+# The Linux ioctl that clones the extents of one file into another
+_FICLONE = 0x40049409
+
+
+def hash_file(path: Path) -> str:
+    """Hashes the content of a file
+
+    Args:
+        path: The file
+
+    Returns:
+        The SHA-256 hex digest
+    """
+
+    hasher = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        while chunk := file.read(1024 * 1024):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def _clonefile(source: Path, destination: Path) -> bool:
+    """Clones a file with the macOS 'clonefile' call, which APFS supports
+
+    Args:
+        source: The file to clone
+        destination: The new file, which must not exist yet
+
+    Returns:
+        Whether the clone was made
+    """
+
+    import ctypes  # pylint: disable=import-outside-toplevel
+
+    if (clonefile := getattr(ctypes.CDLL(None, use_errno=True), "clonefile", None)) is None:
+        return False
+
+    return bool(clonefile(os.fsencode(source), os.fsencode(destination), 0) == 0)
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    """Clones a file without copying its data, on filesystems that support it
+
+    Args:
+        source: The file to clone
+        destination: The new file, which must not exist yet
+
+    Returns:
+        Whether the clone was made
+    """
+
+    if sys.platform == "darwin":
+        return _clonefile(source, destination)
+
+    if sys.platform != "linux":
+        return False
+
+    import fcntl  # pylint: disable=import-outside-toplevel
+
+    try:
+        with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+            fcntl.ioctl(destination_file.fileno(), _FICLONE, source_file.fileno())
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+
+    return True
+
+
+def _clone(source: Path, destination: Path) -> None:
+    """Copies a file, sharing its data on filesystems that support reflinks
+
+    Args:
+        source: The file to copy
+        destination: The new file
+    """
+
+    if not _reflink(source, destination):
+        shutil.copyfile(source, destination)
+
+
+def link_file(source: Path, destination: Path, hardlink: bool = False) -> None:
+    """Places a file at a path without copying it where possible: a hardlink if enabled, then a reflink, then a
+    copy. Copies and clones are private to the destination, so they are made writable
+
+    Args:
+        source: The file to link
+        destination: The path to place it at, replacing any file there
+        hardlink: Whether the destination may share the source's inode. Writing through such a link alters the
+            source, so only enable it for directories that are never modified in place
+    """
+
+    try:
+        if destination.exists() and os.path.samefile(source, destination):
+            return
+    except OSError:
+        pass
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.link")
+    temporary.unlink(missing_ok=True)
+
+    linked = False
+
+    if hardlink:
+        try:
+            os.link(source, temporary)
+            linked = True
+        except OSError:
+            pass
+
+    if not linked:
+        _clone(source, temporary)
+        os.chmod(temporary, stat.S_IMODE(os.stat(source).st_mode) | stat.S_IWUSR)
+
+    os.replace(temporary, destination)
+
+
+def _place_symlink(target: str, destination: Path) -> None:
+    """Creates a symlink, replacing any file or symlink at its path
+
+    Args:
+        target: The link target, as recorded
+        destination: The path of the link
+    """
+
+    if destination.is_symlink() and os.readlink(destination) == target:
+        return
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.link")
+    temporary.unlink(missing_ok=True)
+
+    os.symlink(target, temporary)
+    os.replace(temporary, destination)
+
+
+class TreeFile(BaseModel):
+    """A file of a tree"""
+
+    sha256: str
+    size: int
+    executable: bool = False
+
+
+class Tree(BaseModel):
+    """The content of a published directory, keyed by POSIX path relative to the directory"""
+
+    files: dict[str, TreeFile] = {}
+    symlinks: dict[str, str] = {}
+    directories: list[str] = []
+
+    def digest(self) -> str:
+        """Derives the content address of the tree
+
+        Returns:
+            The digest
+        """
+
+        content = {
+            "files": [[relative, file.sha256, file.executable] for relative, file in sorted(self.files.items())],
+            "symlinks": sorted(self.symlinks.items()),
+            "directories": sorted(self.directories),
+        }
+        return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+class ArtifactStore:
+    """The machine-wide store. Providers may publish their own artifacts to it and link them into projects. Writing
+    through a hardlink alters the store, so hardlinks are only for directories that are treated as read-only
+    """
+
+    def __init__(self, root: Path | None = None, hardlink: bool = False) -> None:
+
+        self._root = root if root is not None else cache_directory() / "artifacts"
+        self._hardlink = hardlink
+
+    @property
+    def root(self) -> Path:
+        """The store directory"""
+        return self._root
+
+    def _lock(self, shared: bool) -> FileLock:
+        """Creates a lock on the whole store
+
+        Args:
+            shared: Whether the lock is a reader's lock
+
+        Returns:
+            The lock
+        """
+
+        return FileLock(self._root / "lock", shared=shared)
+
+    def _object_path(self, file: TreeFile) -> Path:
+        """Locates the object holding a file's content
+
+        Args:
+            file: The file
+
+        Returns:
+            The object path. Executable and plain content are separate objects, since links share permissions
+        """
+
+        name = f"{file.sha256}.x" if file.executable else file.sha256
+        return self._root / "objects" / file.sha256[:2] / name
+
+    def _tree_path(self, digest: str) -> Path:
+        """Locates the listing of a tree
+
+        Args:
+            digest: The tree digest
+
+        Returns:
+            The listing path. Its modification time is the last time the tree was used
+        """
+
+        return self._root / "trees" / f"{digest}.json"
+
+    def _reference_path(self, digest: str, directory: Path) -> Path:
+        """Locates the reference of a directory to a tree
+
+        Args:
+            digest: The tree digest
+            directory: The directory holding the tree
+
+        Returns:
+            The reference path
+        """
+
+        key = hashlib.sha256(str(directory.absolute()).encode()).hexdigest()
+        return self._root / "refs" / digest / key
+
+    def read_tree(self, digest: str) -> Tree | None:
+        """Reads a published tree
+
+        Args:
+            digest: The tree digest
+
+        Returns:
+            The tree, or None if the store does not hold it
+        """
+
+        try:
+            return Tree.model_validate_json(self._tree_path(digest).read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    def has(self, digest: str) -> bool:
+        """Queries whether the store holds a tree
+
+        Args:
+            digest: The tree digest
+
+        Returns:
+            The query result
+        """
+
+        return self._tree_path(digest).is_file()
+
+    def _store_object(self, path: Path, file: TreeFile) -> Path | None:
+        """Adds a file's content to the store unless it is already there, by hardlinking the file where enabled or
+        cloning it
+
+        Args:
+            path: The file
+            file: Its tree entry
+
+        Returns:
+            The object path, or None if the content could only have been stored as a copy
+        """
+
+        destination = self._object_path(file)
+
+        if destination.exists():
+            return destination
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temporary = destination.with_name(f"{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.unlink(missing_ok=True)
+
+        linked = False
+
+        if self._hardlink:
+            try:
+                os.link(path, temporary)
+                linked = True
+            except OSError:
+                pass
+
+        if not linked and not _reflink(path, temporary):
+            return None
+
+        # A hardlinked file becomes read-only along with its object
+        os.chmod(temporary, 0o555 if file.executable else 0o444)
+
+        # Publishers of the same content race harmlessly, since every candidate is identical
+        os.replace(temporary, destination)
+
+        return destination
+
+    def _reference(self, digest: str, directory: Path) -> None:
+        """Records that a directory holds a tree
+
+        Args:
+            digest: The tree digest
+            directory: The directory
+        """
+
+        write_atomic(directory / REFERENCE_NAME, digest)
+        write_atomic(self._reference_path(digest, directory), str(directory.absolute()))
+
+    def publish(self, directory: Path, excluded: Collection[str] = ()) -> str | None:
+        """Adds the content of a directory to the store. With hardlinks enabled, the files of the directory are
+        replaced with links to the stored objects, and otherwise the directory is left as it is
+
+        Args:
+            directory: The directory
+            excluded: Names of files and directories that are not published, such as manifests
+
+        Raises:
+            OSError: Raised if the directory holds something other than files, directories and symlinks
+
+        Returns:
+            The tree digest, or None if the content could only have been stored as a copy
+        """
+
+        excluded = {*excluded, REFERENCE_NAME}
+        tree = Tree()
+        paths: dict[str, Path] = {}
+
+        # Symlinked directories are recorded as symlinks rather than walked
+        for root, directory_names, file_names in os.walk(directory):
+            directory_names[:] = sorted(name for name in directory_names if name not in excluded)
+
+            for name in [*directory_names, *sorted(file_names)]:
+                if name in excluded:
+                    continue
+
+                path = Path(root) / name
+                relative = path.relative_to(directory).as_posix()
+
+                if path.is_symlink():
+                    tree.symlinks[relative] = os.readlink(path)
+                elif path.is_dir():
+                    tree.directories.append(relative)
+                elif path.is_file():
+                    status = path.stat()
+                    tree.files[relative] = TreeFile(
+                        sha256=hash_file(path), size=status.st_size, executable=bool(status.st_mode & stat.S_IXUSR)
+                    )
+                    paths[relative] = path
+                else:
+                    raise OSError(f"The special file {path} can't be published")
+
+        digest = tree.digest()
+
+        with self._lock(shared=True):
+            for relative, file in tree.files.items():
+                if (stored := self._store_object(paths[relative], file)) is None:
+                    return None
+
+                if self._hardlink:
+                    link_file(stored, paths[relative], hardlink=True)
+
+            if not self.has(digest):
+                write_atomic(self._tree_path(digest), tree.model_dump_json())
+
+            os.utime(self._tree_path(digest))
+            self._reference(digest, directory)
+
+        return digest
+
+    def checkout(self, digest: str, directory: Path) -> bool:
+        """Recreates the directories and symlinks of a tree in a directory, and links its files there
+
+        Args:
+            digest: The tree digest
+            directory: The directory
+
+        Returns:
+            Whether the store held the tree
+        """
+
+        with self._lock(shared=True):
+            if (tree := self.read_tree(digest)) is None:
+                return False
+
+            for relative in tree.directories:
+                (directory / relative).mkdir(parents=True, exist_ok=True)
+
+            for relative, file in tree.files.items():
+                source = self._object_path(file)
+
+                if not source.is_file():
+                    return False
+
+                link_file(source, directory / relative, self._hardlink)
+
+            for relative, target in tree.symlinks.items():
+                _place_symlink(target, directory / relative)
+
+            os.utime(self._tree_path(digest))
+            self._reference(digest, directory)
+
+        return True
+
+    def release(self, directory: Path) -> None:
+        """Drops the reference of a directory and removes the files it hardlinks from the store, so that new content
+        written there can't alter the stored objects. The tree can be collected once no other directory holds it
+
+        Args:
+            directory: The directory
+        """
+
+        try:
+            digest = (directory / REFERENCE_NAME).read_text(encoding="utf-8").strip()
+        except OSError:
+            return
+
+        if (tree := self.read_tree(digest)) is not None:
+            for relative, file in tree.files.items():
+                path = directory / relative
+
+                try:
+                    if os.path.samefile(path, self._object_path(file)):
+                        path.unlink()
+                except OSError:
+                    continue
+
+        self._reference_path(digest, directory).unlink(missing_ok=True)
+        (directory / REFERENCE_NAME).unlink(missing_ok=True)
+
+    def _live_references(self, digest: str) -> int:
+        """Counts the directories that still hold a tree, dropping the references of those that do not
+
+        Args:
+            digest: The tree digest
+
+        Returns:
+            The number of live references
+        """
+
+        references = self._root / "refs" / digest
+        live = 0
+
+        if not references.is_dir():
+            return 0
+
+        for reference in references.iterdir():
+            try:
+                directory = Path(reference.read_text(encoding="utf-8"))
+                held = (directory / REFERENCE_NAME).read_text(encoding="utf-8").strip()
+            except OSError:
+                held = None
+
+            if held == digest:
+                live += 1
+            else:
+                reference.unlink(missing_ok=True)
+
+        if not live:
+            shutil.rmtree(references, ignore_errors=True)
+
+        return live
+
+    def collect(self, keep: Collection[str] = (), max_age: float = 0.0) -> int:
+        """Removes the trees that no directory holds, then the objects that no remaining tree lists
+
+        Args:
+            keep: Tree digests to keep regardless of their references
+            max_age: Unreferenced trees used more recently than this many seconds ago are kept as well
+
+        Returns:
+            The number of bytes freed
+        """
+
+        freed = 0
+        now = time.time()
+        trees = self._root / "trees"
+
+        with self._lock(shared=False):
+            kept: list[Tree] = []
+
+            for path in sorted(trees.glob("*.json")) if trees.is_dir() else []:
+                digest = path.stem
+
+                try:
+                    recent = now - path.stat().st_mtime <= max_age
+                except OSError:
+                    continue
+
+                if digest in keep or recent or self._live_references(digest):
+                    if (tree := self.read_tree(digest)) is not None:
+                        kept.append(tree)
+                    continue
+
+                path.unlink(missing_ok=True)
+
+            needed = {self._object_path(file) for tree in kept for file in tree.files.values()}
+            objects = self._root / "objects"
+
+            for path in objects.rglob("*") if objects.is_dir() else []:
+                if path.is_file() and path not in needed:
+                    freed += path.stat().st_size
+                    path.unlink()
+
+        return freed
@@ -1,8 +1,8 @@
 """Defines the data and routines for building a CPPython project type"""
 
 import logging
-from importlib import metadata
-from inspect import getmodule
+from collections.abc import Sequence
+from dataclasses import dataclass
 from logging import Logger
 from typing import Any
 
@@ -26,14 +26,48 @@ from cppython_core.schema import (
     CorePluginData,
     CPPythonGlobalConfiguration,
     CPPythonLocalConfiguration,
-    DataPlugin,
     PEP621Configuration,
     PEP621Data,
+    Plugin,
     ProjectConfiguration,
     ProjectData,
 )
 
 from cppython.data import Data, Plugins
+from cppython.discovery import PluginHandle, PluginRegistry, PluginSelection
+from cppython.isolation import shared_pool
+from cppython.logger import install_logging, set_verbosity
+from cppython.scm import SCMCache
+from cppython.snapshot import BuildSnapshot, SnapshotStore, fingerprint_build
+from cppython.state import fingerprint_state
+from cppython.tracing import traced
+
+
+def _rank[T: Plugin](plugin_handles: list[PluginHandle[T]], preferences: Sequence[str]) -> list[PluginHandle[T]]:
+    """Orders plugins by preference, keeping the discovery order otherwise
+
+    Args:
+        plugin_handles: The plugin handles
+        preferences: Plugin names in order of preference
+
+    Returns:
+        The ordered plugin handles
+    """
+
+    if not preferences:
+        return plugin_handles
+
+    ranks = {name: rank for rank, name in enumerate(preferences)}
+    return sorted(plugin_handles, key=lambda handle: ranks.get(handle.name(), len(ranks)))
+
+
+@dataclass
+class Rejection:
+    """Why a generator and provider pair could not be used together"""
+
+    generator: str
+    provider: str
+    reason: str
 
 
 class Resolver:
@@ -43,18 +77,31 @@ class Resolver:
 
         self._project_configuration = project_configuration
         self._logger = logger
+        self._registry: PluginRegistry | None = None
+        self._rejections: list[Rejection] = []
+        self._scm_cache = SCMCache.shared()
 
+    @traced
     def generate_plugins(
-        self, cppython_local_configuration: CPPythonLocalConfiguration, project_data: ProjectData
-    ) -> PluginBuildData:
-        """Generates the plugin data from the local configuration and project data
+        self,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        project_data: ProjectData,
+        provider_names: Sequence[str] = (),
+    ) -> PluginSelection:
+        """Selects the plugins from the local configuration and project data. Generator and provider plugins are
+        not imported until they are created
 
         Args:
             cppython_local_configuration: The local configuration
             project_data: The project data
+            provider_names: The providers of the 'tool.cppython.providers' tables. When given, every one of them is
+                selected instead of a single provider
+
+        Raises:
+            PluginError: Raised if a named provider is missing or no generator supports all of them
 
         Returns:
-            The resolved plugin data
+            The selected plugins
         """
 
         raw_generator_plugins = self.find_generators()
@@ -65,37 +112,51 @@ class Resolver:
         )
 
         raw_provider_plugins = self.find_providers()
-        provider_plugins = self.filter_plugins(
-            raw_provider_plugins,
-            cppython_local_configuration.provider_name,
-            "Provider",
-        )
 
         scm_plugins = self.find_source_managers()
 
-        scm_type = self.select_scm(scm_plugins, project_data)
+        scm = self.select_scm(scm_plugins, project_data)
+
+        if not provider_names:
+            provider_plugins = self.filter_plugins(
+                raw_provider_plugins,
+                cppython_local_configuration.provider_name,
+                "Provider",
+            )
+
+            # Solve the messy interactions between plugins
+            generator, provider = self.solve(generator_plugins, provider_plugins)
+
+            return PluginSelection(generator=generator, provider=provider, scm=scm)
 
-        # Solve the messy interactions between plugins
-        generator_type, provider_type = self.solve(generator_plugins, provider_plugins)
+        providers_by_name = {plugin.name(): plugin for plugin in raw_provider_plugins}
+        if missing := [name for name in provider_names if name not in providers_by_name]:
+            raise PluginError(f"The providers {', '.join(missing)} were not found")
+
+        generator, providers = self.solve_all(
+            generator_plugins, [providers_by_name[name] for name in provider_names], provider_names, require_all=True
+        )
 
-        return PluginBuildData(generator_type=generator_type, provider_type=provider_type, scm_type=scm_type)
+        return PluginSelection(generator=generator, provider=providers[0], scm=scm, providers=providers)
 
-    def generate_cppython_plugin_data(self, plugin_build_data: PluginBuildData) -> PluginCPPythonData:
-        """Generates the CPPython plugin data from the resolved plugins
+    @traced
+    def generate_cppython_plugin_data(self, plugin_selection: PluginSelection) -> PluginCPPythonData:
+        """Generates the CPPython plugin data from the selected plugins
 
         Args:
-            plugin_build_data: The resolved plugin data
+            plugin_selection: The selected plugins
 
         Returns:
             The plugin data used by CPPython
         """
 
         return PluginCPPythonData(
-            generator_name=plugin_build_data.generator_type.name(),
-            provider_name=plugin_build_data.provider_type.name(),
-            scm_name=plugin_build_data.scm_type.name(),
+            generator_name=plugin_selection.generator.name(),
+            provider_name=plugin_selection.provider.name(),
+            scm_name=plugin_selection.scm.name(),
         )
 
+    @traced
     def generate_pep621_data(
         self, pep621_configuration: PEP621Configuration, project_configuration: ProjectConfiguration, scm: SCM | None
     ) -> PEP621Data:
@@ -109,8 +170,15 @@ class Resolver:
         Returns:
             The resolved PEP621 data
         """
+
+        # Reuse the cached SCM version instead of asking the plugin again
+        if "version" in pep621_configuration.dynamic and project_configuration.version is None and scm is not None:
+            version = self._scm_cache.version(scm, project_configuration.pyproject_file.parent)
+            project_configuration = project_configuration.model_copy(update={"version": version})
+
         return resolve_pep621(pep621_configuration, project_configuration, scm)
 
+    @traced
     def resolve_global_config(self) -> CPPythonGlobalConfiguration:
         """Generates the global configuration object
 
@@ -120,103 +188,80 @@ class Resolver:
 
         return CPPythonGlobalConfiguration()
 
-    def find_generators(self) -> list[type[Generator]]:
-        """Extracts the generator plugins from the package's entry points
-
-        Raises:
-            PluginError: Raised if no plugins can be found
+    def _plugin_registry(self) -> PluginRegistry:
+        """Retrieves the shared plugin registry on first use and keeps it for the lifetime of the resolver
 
         Returns:
-            The list of generator plugin types
+            The plugin registry for the running environment
         """
 
-        group_name = "generator"
-        plugin_types: list[type[Generator]] = []
+        if self._registry is None:
+            self._registry = PluginRegistry.shared(self._logger)
 
-        # Filter entries by type
-        for entry_point in list(metadata.entry_points(group=f"cppython.{group_name}")):
-            loaded_type = entry_point.load()
-            if not issubclass(loaded_type, Generator):
-                self._logger.warning(
-                    f"Found incompatible plugin. The '{loaded_type.name()}' plugin must be an instance of"
-                    f" '{group_name}'"
-                )
-            else:
-                self._logger.warning(f"{group_name} plugin found: {loaded_type.name()} from {getmodule(loaded_type)}")
-                plugin_types.append(loaded_type)
+        return self._registry
 
-        if not plugin_types:
-            raise PluginError(f"No {group_name} plugin was found")
+    def _find_plugins(self, group_name: str) -> list[PluginHandle[Any]]:
+        """Extracts the plugin handles of a group from the plugin registry
 
-        return plugin_types
-
-    def find_providers(self) -> list[type[Provider]]:
-        """Extracts the provider plugins from the package's entry points
+        Args:
+            group_name: The plugin group
 
         Raises:
             PluginError: Raised if no plugins can be found
 
         Returns:
-            The list of provider plugin types
+            The list of plugin handles
         """
 
-        group_name = "provider"
-        plugin_types: list[type[Provider]] = []
+        plugins = self._plugin_registry().group(group_name)
 
-        # Filter entries by type
-        for entry_point in list(metadata.entry_points(group=f"cppython.{group_name}")):
-            loaded_type = entry_point.load()
-            if not issubclass(loaded_type, Provider):
-                self._logger.warning(
-                    f"Found incompatible plugin. The '{loaded_type.name()}' plugin must be an instance of"
-                    f" '{group_name}'"
-                )
-            else:
-                self._logger.warning(f"{group_name} plugin found: {loaded_type.name()} from {getmodule(loaded_type)}")
-                plugin_types.append(loaded_type)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            for plugin in plugins:
+                self._logger.debug("%s plugin found: %s from %s", group_name, plugin.name(), plugin.record.target)
 
-        if not plugin_types:
+        if not plugins:
             raise PluginError(f"No {group_name} plugin was found")
 
-        return plugin_types
+        return plugins
 
-    def find_source_managers(self) -> list[type[SCM]]:
-        """Extracts the source control manager plugins from the package's entry points
+    @traced
+    def find_generators(self) -> list[PluginHandle[Generator]]:
+        """Extracts the generator plugins from the plugin registry
 
-        Raises:
-            PluginError: Raised if no plugins can be found
+        Returns:
+            The list of generator plugin handles
+        """
+
+        return self._find_plugins("generator")
+
+    @traced
+    def find_providers(self) -> list[PluginHandle[Provider]]:
+        """Extracts the provider plugins from the plugin registry
 
         Returns:
-            The list of source control manager plugin types
+            The list of provider plugin handles
         """
 
-        group_name = "scm"
-        plugin_types: list[type[SCM]] = []
+        return self._find_plugins("provider")
 
-        # Filter entries by type
-        for entry_point in list(metadata.entry_points(group=f"cppython.{group_name}")):
-            loaded_type = entry_point.load()
-            if not issubclass(loaded_type, SCM):
-                self._logger.warning(
-                    f"Found incompatible plugin. The '{loaded_type.name()}' plugin must be an instance of"
-                    f" '{group_name}'"
-                )
-            else:
-                self._logger.warning(f"{group_name} plugin found: {loaded_type.name()} from {getmodule(loaded_type)}")
-                plugin_types.append(loaded_type)
+    @traced
+    def find_source_managers(self) -> list[PluginHandle[SCM]]:
+        """Extracts the source control manager plugins from the plugin registry
 
-        if not plugin_types:
-            raise PluginError(f"No {group_name} plugin was found")
+        Returns:
+            The list of source control manager plugin handles
+        """
 
-        return plugin_types
+        return self._find_plugins("scm")
 
+    @traced
     def filter_plugins[
-        T: DataPlugin
-    ](self, plugin_types: list[type[T]], pinned_name: str | None, group_name: str) -> list[type[T]]:
+        T: Plugin
+    ](self, plugin_handles: list[PluginHandle[T]], pinned_name: str | None, group_name: str) -> list[PluginHandle[T]]:
         """Finds and filters data plugins
 
         Args:
-            plugin_types: The plugin type to lookup
+            plugin_handles: The plugin handles to lookup
             pinned_name: The configuration name
             group_name: The group name
 
@@ -229,96 +274,175 @@ class Resolver:
 
         # Lookup the requested plugin if given
         if pinned_name is not None:
-            for loaded_type in plugin_types:
-                if loaded_type.name() == pinned_name:
-                    self._logger.warning(
-                        f"Using {group_name} plugin: {loaded_type.name()} from {getmodule(loaded_type)}"
-                    )
-                    return [loaded_type]
+            for plugin in plugin_handles:
+                if plugin.name() == pinned_name:
+                    self._logger.info("Using %s plugin: %s from %s", group_name, plugin.name(), plugin.record.target)
+                    return [plugin]
 
-        self._logger.warning(f"'{group_name}_name' was empty. Trying to deduce {group_name}s")
+            self._logger.warning("The %s plugin '%s' was not found. Trying to deduce it", group_name, pinned_name)
+        else:
+            self._logger.info("'%s_name' was empty. Trying to deduce %ss", group_name.lower(), group_name)
 
-        supported_types: list[type[T]] = []
+        supported_plugins: list[PluginHandle[T]] = []
 
         # Deduce types
-        for loaded_type in plugin_types:
-            self._logger.warning(
-                f"A {group_name} plugin is supported: {loaded_type.name()} from {getmodule(loaded_type)}"
-            )
-            supported_types.append(loaded_type)
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        for plugin in plugin_handles:
+            if debug:
+                self._logger.debug(
+                    "A %s plugin is supported: %s from %s", group_name, plugin.name(), plugin.record.target
+                )
+            supported_plugins.append(plugin)
 
         # Fail
-        if supported_types is None:
+        if not supported_plugins:
             raise PluginError(f"No {group_name} could be deduced from the root directory.")
 
-        return supported_types
+        return supported_plugins
 
-    def select_scm(self, scm_plugins: list[type[SCM]], project_data: ProjectData) -> type[SCM]:
-        """Given data constraints, selects the SCM plugin to use
+    @traced
+    def select_scm(self, scm_plugins: list[PluginHandle[SCM]], project_data: ProjectData) -> PluginHandle[SCM]:
+        """Given data constraints, selects the SCM plugin to use. Feature probes are cached per repository state
 
         Args:
-            scm_plugins: The list of SCM plugin types
+            scm_plugins: The list of SCM plugin handles
             project_data: The project data
 
         Raises:
             PluginError: Raised if no SCM plugin was found that supports the given data
 
         Returns:
-            The selected SCM plugin type
+            The selected SCM plugin handle
         """
 
-        for scm_type in scm_plugins:
-            if scm_type.features(project_data.pyproject_file.parent).repository:
-                return scm_type
+        for scm in scm_plugins:
+            if self._scm_cache.supports(scm, project_data.pyproject_file.parent):
+                return scm
 
         raise PluginError("No SCM plugin was found that supports the given path")
 
+    @traced
     def solve(
-        self, generator_types: list[type[Generator]], provider_types: list[type[Provider]]
-    ) -> tuple[type[Generator], type[Provider]]:
+        self,
+        generator_handles: list[PluginHandle[Generator]],
+        provider_handles: list[PluginHandle[Provider]],
+        preferences: Sequence[str] = (),
+    ) -> tuple[PluginHandle[Generator], PluginHandle[Provider]]:
         """Selects the first generator and provider that can work together
 
         Args:
-            generator_types: The list of generator plugin types
-            provider_types: The list of provider plugin types
+            generator_handles: The list of generator plugin handles
+            provider_handles: The list of provider plugin handles
+            preferences: Plugin names in order of preference. Preferred plugins are tried before the others, which
+                keep their discovery order
+
+        Returns:
+            A tuple of the selected generator and provider plugin handles
+        """
+
+        generator_handle, compatible_handles = self.solve_all(generator_handles, provider_handles, preferences)
+        return generator_handle, compatible_handles[0]
+
+    @traced
+    def solve_all(
+        self,
+        generator_handles: list[PluginHandle[Generator]],
+        provider_handles: list[PluginHandle[Provider]],
+        preferences: Sequence[str] = (),
+        require_all: bool = False,
+    ) -> tuple[PluginHandle[Generator], list[PluginHandle[Provider]]]:
+        """Selects the first generator that any provider can work with, along with every such provider. Providers
+        are indexed by the sync types they support, so each generator is matched without visiting every provider
+
+        Args:
+            generator_handles: The list of generator plugin handles
+            provider_handles: The list of provider plugin handles
+            preferences: Plugin names in order of preference. Preferred plugins are tried before the others, which
+                keep their discovery order
+            require_all: Whether the generator must work with every provider, rather than with any of them
 
         Raises:
             PluginError: Raised if no provider that supports a given generator could be deduced
 
         Returns:
-            A tuple of the selected generator and provider plugin types
+            A tuple of the selected generator and its compatible provider plugin handles, best ranked first
+        """
+
+        generator_handles = _rank(generator_handles, preferences)
+        provider_handles = _rank(provider_handles, preferences)
+
+        # Each list keeps the provider ranking
+        providers_by_sync_type: dict[str, list[tuple[int, PluginHandle[Provider]]]] = {}
+        for rank, provider_handle in enumerate(provider_handles):
+            for sync_type in provider_handle.record.supported_sync_types:
+                providers_by_sync_type.setdefault(sync_type, []).append((rank, provider_handle))
+
+        self._rejections = []
+
+        for generator_handle in generator_handles:
+            candidates = {
+                rank: provider_handle
+                for sync_type in generator_handle.sync_types()
+                for rank, provider_handle in providers_by_sync_type.get(sync_type, [])
+            }
+
+            if candidates and (not require_all or len(candidates) == len(provider_handles)):
+                return generator_handle, [candidates[rank] for rank in sorted(candidates)]
+
+            self._reject(
+                generator_handle,
+                [provider_handle for rank, provider_handle in enumerate(provider_handles) if rank not in candidates],
+            )
+
+        reasons = "\n".join(
+            f"  {rejection.generator} + {rejection.provider}: {rejection.reason}" for rejection in self._rejections
+        )
+        raise PluginError(f"No provider that supports a given generator could be deduced\n{reasons}")
+
+    def _reject(
+        self, generator_handle: PluginHandle[Generator], provider_handles: list[PluginHandle[Provider]]
+    ) -> None:
+        """Records why a generator could not be paired with providers
+
+        Args:
+            generator_handle: The rejected generator
+            provider_handles: The providers it can't work with
         """
 
-        combos: list[tuple[type[Generator], type[Provider]]] = []
+        sync_types = generator_handle.sync_types()
 
-        for generator_type in generator_types:
-            sync_types = generator_type.sync_types()
-            for provider_type in provider_types:
-                for sync_type in sync_types:
-                    if provider_type.supported_sync_type(sync_type):
-                        combos.append((generator_type, provider_type))
-                        break
+        for provider_handle in provider_handles:
+            if not sync_types:
+                reason = "the generator declares no sync types"
+            else:
+                reason = f"the provider supports none of the sync types {', '.join(sync_types)}"
 
-        if not combos:
-            raise PluginError("No provider that supports a given generator could be deduced")
+            rejection = Rejection(generator=generator_handle.name(), provider=provider_handle.name(), reason=reason)
+            self._logger.debug("Rejected %s + %s: %s", rejection.generator, rejection.provider, rejection.reason)
+            self._rejections.append(rejection)
 
-        return combos[0]
+    @property
+    def rejections(self) -> list[Rejection]:
+        """The generator and provider pairs that the last solve rejected, with the reason for each"""
+        return self._rejections
 
+    @traced
     def create_scm(
         self,
         core_data: CoreData,
-        scm_type: type[SCM],
+        scm: PluginHandle[SCM],
     ) -> SCM:
         """Creates a source control manager from input configuration
 
         Args:
             core_data: The resolved configuration data
-            scm_type: The plugin type
+            scm: The plugin handle
 
         Returns:
             The constructed source control manager
         """
 
+        scm_type = scm.load()
         cppython_plugin_data = resolve_cppython_plugin(core_data.cppython_data, scm_type)
         scm_data = resolve_scm(core_data.project_data, cppython_plugin_data)
 
@@ -326,25 +450,27 @@ class Resolver:
 
         return plugin
 
+    @traced
     def create_generator(
         self,
         core_data: CoreData,
         pep621_data: PEP621Data,
         generator_configuration: dict[str, Any],
-        generator_type: type[Generator],
+        generator: PluginHandle[Generator],
     ) -> Generator:
-        """Creates a generator from input configuration
+        """Creates a generator from input configuration. This is where the generator plugin is imported
 
         Args:
             core_data: The resolved configuration data
             pep621_data: The PEP621 data
             generator_configuration: The generator table of the CPPython configuration data
-            generator_type: The plugin type
+            generator: The plugin handle
 
         Returns:
             The constructed generator
         """
 
+        generator_type = generator.load()
         cppython_plugin_data = resolve_cppython_plugin(core_data.cppython_data, generator_type)
 
         generator_data = resolve_generator(core_data.project_data, cppython_plugin_data)
@@ -362,25 +488,27 @@ class Resolver:
 
         return generator_type(generator_data, core_plugin_data, generator_configuration)
 
+    @traced
     def create_provider(
         self,
         core_data: CoreData,
         pep621_data: PEP621Data,
         provider_configuration: dict[str, Any],
-        provider_type: type[Provider],
+        provider: PluginHandle[Provider],
     ) -> Provider:
-        """Creates Providers from input data
+        """Creates Providers from input data. This is where the provider plugin is imported
 
         Args:
             core_data: The resolved configuration data
             pep621_data: The PEP621 data
             provider_configuration: The provider data table
-            provider_type: The type to instantiate
+            provider: The plugin handle to instantiate
 
         Returns:
             A constructed provider plugins
         """
 
+        provider_type = provider.load()
         cppython_plugin_data = resolve_cppython_plugin(core_data.cppython_data, provider_type)
 
         provider_data = resolve_provider(core_data.project_data, cppython_plugin_data)
@@ -406,22 +534,22 @@ class Builder:
         self._project_configuration = project_configuration
         self._logger = logger
 
-        # Default logging levels
-        levels = [logging.WARNING, logging.INFO, logging.DEBUG]
+        # The output stream is shared by every builder in the process, so it is attached only once
+        install_logging()
+        set_verbosity(self._logger, project_configuration.verbosity)
 
-        # Add default output stream
-        self._logger.addHandler(logging.StreamHandler())
-        self._logger.setLevel(levels[project_configuration.verbosity])
-
-        self._logger.info("Logging setup complete")
+        self._logger.debug("Logging setup complete")
 
         self._resolver = Resolver(self._project_configuration, self._logger)
+        self._snapshots = SnapshotStore()
 
+    @traced
     def build(
         self,
         pep621_configuration: PEP621Configuration,
         cppython_local_configuration: CPPythonLocalConfiguration,
         plugin_build_data: PluginBuildData | None = None,
+        provider_configurations: dict[str, dict[str, Any]] | None = None,
     ) -> Data:
         """Builds the project data
 
@@ -429,38 +557,248 @@ class Builder:
             pep621_configuration: The PEP621 configuration
             cppython_local_configuration: The local configuration
             plugin_build_data: Plugin override data. If it exists, the build will use the given types instead of resolving them
+            provider_configurations: The 'tool.cppython.providers' tables. If given, every named provider is used
+                with its table instead of the single configured provider
 
         Returns:
             The built data object
         """
 
-        project_data = resolve_project_configuration(self._project_configuration)
+        provider_configurations = provider_configurations or {}
 
+        global_configuration = self._resolver.resolve_global_config()
+
+        # Overridden plugins are not part of the fingerprint, so those builds are never snapshotted
+        snapshot_fingerprint = None
         if plugin_build_data is None:
-            plugin_build_data = self._resolver.generate_plugins(cppython_local_configuration, project_data)
+            snapshot_fingerprint = fingerprint_build(
+                self._project_configuration,
+                pep621_configuration,
+                cppython_local_configuration,
+                global_configuration,
+                provider_configurations,
+            )
+
+            pyproject_file = self._project_configuration.pyproject_file
+            if (snapshot := self._snapshots.read(pyproject_file, snapshot_fingerprint)) is not None:
+                self._logger.info("Reusing the resolved build snapshot of %s", pyproject_file)
+                return self._rehydrate(snapshot, cppython_local_configuration, provider_configurations)
+
+        plugin_selection = None
+        if plugin_build_data is not None:
+            plugin_selection = PluginSelection.from_build_data(plugin_build_data)
+
+        core_data, pep621_data, plugin_selection, scm = self._resolve(
+            pep621_configuration,
+            cppython_local_configuration,
+            global_configuration,
+            provider_configurations,
+            plugin_selection,
+        )
 
-        plugin_cppython_data = self._resolver.generate_cppython_plugin_data(plugin_build_data)
+        if snapshot_fingerprint is not None:
+            self._record_snapshot(snapshot_fingerprint, core_data, pep621_data, plugin_selection)
+
+        return self._assemble(
+            core_data, pep621_data, cppython_local_configuration, plugin_selection, scm, provider_configurations
+        )
+
+    @traced
+    def snapshot(
+        self,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        provider_configurations: dict[str, dict[str, Any]] | None = None,
+    ) -> tuple[BuildSnapshot, bool]:
+        """Resolves the build without creating the generator or the providers, for queries about the project
+
+        Args:
+            pep621_configuration: The PEP621 configuration
+            cppython_local_configuration: The local configuration
+            provider_configurations: The 'tool.cppython.providers' tables
+
+        Returns:
+            The snapshot, and whether it was read from the snapshot store rather than resolved
+        """
+
+        provider_configurations = provider_configurations or {}
 
         global_configuration = self._resolver.resolve_global_config()
 
+        fingerprint = fingerprint_build(
+            self._project_configuration,
+            pep621_configuration,
+            cppython_local_configuration,
+            global_configuration,
+            provider_configurations,
+        )
+
+        if (snapshot := self._snapshots.read(self._project_configuration.pyproject_file, fingerprint)) is not None:
+            return snapshot, True
+
+        core_data, pep621_data, plugin_selection, _ = self._resolve(
+            pep621_configuration, cppython_local_configuration, global_configuration, provider_configurations
+        )
+
+        return self._record_snapshot(fingerprint, core_data, pep621_data, plugin_selection), False
+
+    def _resolve(
+        self,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        global_configuration: CPPythonGlobalConfiguration,
+        provider_configurations: dict[str, dict[str, Any]],
+        plugin_selection: PluginSelection | None = None,
+    ) -> tuple[CoreData, PEP621Data, PluginSelection, SCM]:
+        """Runs every resolution step of a build
+
+        Args:
+            pep621_configuration: The PEP621 configuration
+            cppython_local_configuration: The local configuration
+            global_configuration: The global configuration
+            provider_configurations: The 'tool.cppython.providers' tables
+            plugin_selection: The plugins to use. Resolved from the installed plugins if not given
+
+        Returns:
+            The resolved core and PEP621 data, the plugin selection and the constructed source control manager
+        """
+
+        project_data = resolve_project_configuration(self._project_configuration)
+
+        if plugin_selection is None:
+            plugin_selection = self._resolver.generate_plugins(
+                cppython_local_configuration, project_data, list(provider_configurations)
+            )
+
+        plugin_cppython_data = self._resolver.generate_cppython_plugin_data(plugin_selection)
+
         cppython_data = resolve_cppython(
             cppython_local_configuration, global_configuration, project_data, plugin_cppython_data
         )
 
         core_data = CoreData(project_data=project_data, cppython_data=cppython_data)
 
-        scm = self._resolver.create_scm(core_data, plugin_build_data.scm_type)
+        scm = self._resolver.create_scm(core_data, plugin_selection.scm)
 
         pep621_data = self._resolver.generate_pep621_data(pep621_configuration, self._project_configuration, scm)
 
+        return core_data, pep621_data, plugin_selection, scm
+
+    def _record_snapshot(
+        self, fingerprint: str, core_data: CoreData, pep621_data: PEP621Data, plugin_selection: PluginSelection
+    ) -> BuildSnapshot:
+        """Writes the snapshot of a resolved build. A snapshot that cannot be written only costs the next build time
+
+        Args:
+            fingerprint: The fingerprint of the build inputs
+            core_data: The resolved configuration data
+            pep621_data: The resolved PEP621 data
+            plugin_selection: The selected plugins
+
+        Returns:
+            The snapshot
+        """
+
+        snapshot = BuildSnapshot(
+            fingerprint=fingerprint,
+            core_data=core_data,
+            pep621_data=pep621_data,
+            generator=plugin_selection.generator.record,
+            provider=plugin_selection.provider.record,
+            scm=plugin_selection.scm.record,
+            providers=[handle.record for handle in plugin_selection.providers],
+        )
+
+        try:
+            self._snapshots.write(self._project_configuration.pyproject_file, snapshot)
+        except OSError as error:
+            self._logger.warning("The build snapshot could not be written: %s", error)
+
+        return snapshot
+
+    def _rehydrate(
+        self,
+        snapshot: BuildSnapshot,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        provider_configurations: dict[str, dict[str, Any]],
+    ) -> Data:
+        """Builds the project data from a snapshot without running any resolution step
+
+        Args:
+            snapshot: The snapshot of an earlier build with the same inputs
+            cppython_local_configuration: The local configuration
+            provider_configurations: The 'tool.cppython.providers' tables
+
+        Returns:
+            The built data object
+        """
+
+        plugin_selection = PluginSelection(
+            generator=PluginHandle(snapshot.generator),
+            provider=PluginHandle(snapshot.provider),
+            scm=PluginHandle(snapshot.scm),
+            providers=[PluginHandle(record) for record in snapshot.providers],
+        )
+
+        # Output settings are not part of the fingerprint, so they come from this run rather than the snapshot
+        core_data = snapshot.core_data.model_copy(
+            update={"project_data": resolve_project_configuration(self._project_configuration)}
+        )
+
+        scm = self._resolver.create_scm(core_data, plugin_selection.scm)
+
+        return self._assemble(
+            core_data,
+            snapshot.pep621_data,
+            cppython_local_configuration,
+            plugin_selection,
+            scm,
+            provider_configurations,
+        )
+
+    def _assemble(
+        self,
+        core_data: CoreData,
+        pep621_data: PEP621Data,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        plugin_selection: PluginSelection,
+        scm: SCM,
+        provider_configurations: dict[str, dict[str, Any]],
+    ) -> Data:
+        """Creates the chosen plugins and wraps them with the resolved data
+
+        Args:
+            core_data: The resolved configuration data
+            pep621_data: The resolved PEP621 data
+            cppython_local_configuration: The local configuration
+            plugin_selection: The selected plugins
+            scm: The constructed source control manager
+            provider_configurations: The 'tool.cppython.providers' tables
+
+        Returns:
+            The built data object
+        """
+
         # Create the chosen plugins
         generator = self._resolver.create_generator(
-            core_data, pep621_data, cppython_local_configuration.generator, plugin_build_data.generator_type
+            core_data, pep621_data, cppython_local_configuration.generator, plugin_selection.generator
         )
-        provider = self._resolver.create_provider(
-            core_data, pep621_data, cppython_local_configuration.provider, plugin_build_data.provider_type
+        providers = [
+            self._resolver.create_provider(
+                core_data,
+                pep621_data,
+                provider_configurations.get(handle.name(), cppython_local_configuration.provider),
+                handle,
+            )
+            for handle in plugin_selection.providers
+        ]
+
+        plugins = Plugins(generator=generator, provider=providers[0], scm=scm, providers=providers)
+
+        fingerprint = fingerprint_state(
+            core_data, cppython_local_configuration, plugin_selection.records, provider_configurations
         )
 
-        plugins = Plugins(generator=generator, provider=provider, scm=scm)
+        versions = {record.name: record.version for record in plugin_selection.records}
 
-        return Data(core_data, plugins, self._logger)
+        return Data(core_data, plugins, self._logger, fingerprint, versions, shared_pool())
@@ -0,0 +1,56 @@
+"""Shared helpers for the on-disk caches maintained by CPPython"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+CACHE_DIRECTORY_VARIABLE = "CPPYTHON_CACHE_DIR"
+
+
+def cache_directory() -> Path:
+    """Resolves the machine-wide CPPython cache directory, creating it if needed
+
+    The location can be overridden with the 'CPPYTHON_CACHE_DIR' environment variable
+
+    Returns:
+        The cache directory
+    """
+
+    if override := os.environ.get(CACHE_DIRECTORY_VARIABLE):
+        path = Path(override)
+    else:
+        path = Path.home() / ".cppython" / "cache"
+
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+
+def interpreter_key() -> str:
+    """Names the running interpreter's environment, so that virtual environments sharing the cache directory keep
+    apart the entries that depend on their installed packages
+
+    Returns:
+        A short hash of 'sys.prefix'
+    """
+
+    return hashlib.sha256(sys.prefix.encode()).hexdigest()[:16]
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Writes text to a file so that readers never observe a partial write
+
+    Args:
+        path: The destination file
+        content: The text to write
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False, suffix=".tmp") as file:
+        file.write(content)
+        temporary_path = Path(file.name)
+
+    os.replace(temporary_path, path)
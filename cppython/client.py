@@ -0,0 +1,112 @@
+"""The client side of the CPPython daemon protocol
+
+Only the standard library is imported so that the CLI can hand a command to a running daemon without loading the
+project machinery itself. Requests and responses are single JSON lines exchanged over a Unix socket
+"""
+
+import json
+import socket
+from pathlib import Path
+from typing import NotRequired, TypedDict
+
+from cppython.cache import cache_directory, interpreter_key
+
+
+class Request(TypedDict):
+    """A command sent to the daemon"""
+
+    command: str
+    pyproject: NotRequired[str]
+    verbosity: NotRequired[int]
+    debug: NotRequired[bool]
+
+
+class Response(TypedDict):
+    """The daemon's answer to a request"""
+
+    success: bool
+    error: str | None
+    messages: list[str]
+
+
+def socket_path() -> Path:
+    """Locates the socket of the daemon serving this user and interpreter. A daemon started from another virtual
+    environment has other plugins installed, so it never serves this one
+
+    Returns:
+        The socket path
+    """
+
+    return cache_directory() / f"daemon-{interpreter_key()}.sock"
+
+
+class DaemonClient:
+    """Sends requests to a running daemon"""
+
+    def __init__(self, path: Path | None = None, timeout: float | None = None) -> None:
+        self._path = path if path is not None else socket_path()
+        self._timeout = timeout
+
+    @property
+    def path(self) -> Path:
+        """The socket the client connects to"""
+        return self._path
+
+    def available(self) -> bool:
+        """Queries whether a daemon is listening. A socket left behind by a daemon that died counts as absent
+
+        Returns:
+            The query result
+        """
+
+        if not hasattr(socket, "AF_UNIX") or not self._path.exists():
+            return False
+
+        try:
+            with self._connect():
+                return True
+        except OSError:
+            return False
+
+    def request(self, request: Request) -> Response:
+        """Sends a request and waits for its response
+
+        Args:
+            request: The request
+
+        Raises:
+            ConnectionError: Raised if the daemon closed the connection without answering
+
+        Returns:
+            The response
+        """
+
+        with self._connect() as connection:
+            connection.sendall(json.dumps(request).encode() + b"\n")
+
+            with connection.makefile("rb") as stream:
+                line = stream.readline()
+
+        if not line:
+            raise ConnectionError(f"The daemon at {self._path} closed the connection without answering")
+
+        response: Response = json.loads(line)
+        return response
+
+    def _connect(self) -> socket.socket:
+        """Opens a connection to the daemon
+
+        Returns:
+            The connected socket
+        """
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self._timeout)
+
+        try:
+            connection.connect(str(self._path))
+        except OSError:
+            connection.close()
+            raise
+
+        return connection
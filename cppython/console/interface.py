@@ -1,69 +1,241 @@
-"""A click CLI for CPPython interfacing"""
+"""A click CLI for CPPython interfacing
 
+Only click is imported up front. Each command imports the project machinery it needs, so that '--help', shell
+completion and the informational commands start without loading pydantic, the plugins or the resolver
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import json
+import os
+from functools import cache
 from logging import getLogger
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
-import tomlkit
-from cppython_core.schema import Interface, ProjectConfiguration
 
-from cppython.project import Project
+if TYPE_CHECKING:
+    from cppython_core.schema import ProjectConfiguration, PyProject
 
+    from cppython.console.schema import ConsoleInterface
+    from cppython.project import Project
+    from cppython.workspace import MemberResult
 
-def _find_pyproject_file() -> Path:
-    """Searches upward for a pyproject.toml file
+
+PYPROJECT_VARIABLE = "CPPYTHON_PYPROJECT"
+
+
+@cache
+def _search_upward(start: Path) -> Path:
+    """Walks from a directory towards the filesystem root looking for a pyproject.toml file. The walk ends at the
+    root of the enclosing repository or at a mount point, whichever comes first
+
+    Args:
+        start: The directory to start from
+
+    Raises:
+        ClickException: Raised if no pyproject.toml file was found
 
     Returns:
-        The found directory
+        The directory containing the pyproject.toml file
     """
 
-    # Search for a path upward
-    path = Path.cwd()
+    for directory in (start, *start.parents):
+        if (directory / "pyproject.toml").is_file():
+            return directory
+
+        if (directory / ".git").exists() or os.path.ismount(directory):
+            break
+
+    raise click.ClickException(
+        f"This is not a valid project. No pyproject.toml found in {start} or any of its parents."
+    )
 
-    while not path.glob("pyproject.toml"):
-        if path.is_absolute():
-            assert (
-                False
-            ), "This is not a valid project. No pyproject.toml found in the current directory or any of its parents."
 
-    path = Path(path)
+def _find_pyproject_file() -> Path:
+    """Searches upward for a pyproject.toml file. The 'CPPYTHON_PYPROJECT' environment variable overrides the search
+    with either the file or its directory
 
-    return path
+    Returns:
+        The found directory
+    """
+
+    if override := os.environ.get(PYPROJECT_VARIABLE):
+        path = Path(override).absolute()
+        return path.parent if path.name == "pyproject.toml" else path
+
+    return _search_upward(Path.cwd())
 
 
 class Configuration:
-    """Click configuration object"""
+    """Click configuration object. Nothing touches the filesystem until a command asks for the project"""
 
     def __init__(self) -> None:
-        self.interface = ConsoleInterface()
-
         self.logger = getLogger("cppython.console")
 
-        path = _find_pyproject_file()
-        file_path = path / "pyproject.toml"
+        self.verbosity = 0
+        self.debug = False
+        self.use_daemon = True
+
+        self._interface: ConsoleInterface | None = None
+        self._configuration: ProjectConfiguration | None = None
+
+    @property
+    def interface(self) -> "ConsoleInterface":
+        """The interface passed to projects"""
+
+        if self._interface is None:
+            from cppython.console.schema import ConsoleInterface
+
+            self._interface = ConsoleInterface()
+
+        return self._interface
+
+    @property
+    def configuration(self) -> "ProjectConfiguration":
+        """The project configuration, built from the pyproject.toml file found on first access"""
+
+        if self._configuration is None:
+            from cppython_core.schema import ProjectConfiguration
+
+            path = _find_pyproject_file()
+            file_path = path / "pyproject.toml"
+
+            self._configuration = ProjectConfiguration(
+                pyproject_file=file_path, version=None, verbosity=self.verbosity, debug=self.debug
+            )
+
+        return self._configuration
+
+    def describe(self) -> dict[str, Any]:
+        """Describes the project from its cached resolution. Only a changed project is resolved again
+
+        Returns:
+            The JSON-compatible description. A project whose configuration is invalid, or whose plugins can't be
+            resolved, is described as disabled along with the error
+        """
+
+        from cppython_core.exceptions import ConfigException, PluginError
+
+        from cppython.pyproject import load_providers, load_pyproject
+        from cppython.report import describe_project
+
+        path: Path = self.configuration.pyproject_file
+
+        try:
+            pyproject = load_pyproject(path)
+            provider_configurations = load_providers(path)
+            return describe_project(self.configuration, pyproject, self.logger, provider_configurations)
+        except (ConfigException, PluginError) as error:
+            return {"pyproject_file": str(path), "enabled": False, "error": str(error)}
+
+    def forward(self, action: str) -> bool:
+        """Hands an API call to the daemon if one is running. The project is never loaded in this process
 
-        self.configuration = ProjectConfiguration(pyproject_file=file_path, version=None)
+        Args:
+            action: The API call, 'install' or 'update'
 
-    def query_scm(self) -> str:
-        """Queries the SCM system for its version
+        Raises:
+            ClickException: Raised if the daemon reported a failure
 
         Returns:
-            The version
+            Whether the daemon served the call
         """
 
-        return "TODO"
+        if not self.use_daemon:
+            return False
 
-    def generate_project(self) -> Project:
+        from cppython.client import DaemonClient
+
+        client = DaemonClient()
+
+        if not client.available():
+            return False
+
+        response = client.request(
+            {
+                "command": action,
+                "pyproject": str(_find_pyproject_file() / "pyproject.toml"),
+                "verbosity": self.verbosity,
+                "debug": self.debug,
+            }
+        )
+
+        for message in response["messages"]:
+            click.echo(message, err=True)
+
+        if not response["success"]:
+            raise click.ClickException(f"The daemon failed to {action}: {response['error']}")
+
+        return True
+
+    def generate_project(self) -> "Project":
         """Aids in project generation. Allows deferred configuration from within the "config" object
 
         Returns:
             The constructed Project
         """
 
+        from cppython_core.exceptions import ConfigException
+
+        from cppython.project import Project
+        from cppython.pyproject import load_providers, load_pyproject, read_pyproject
+
         path: Path = self.configuration.pyproject_file
-        pyproject_data = tomlkit.loads(path.read_text(encoding="utf-8"))
 
-        return Project(self.configuration, self.interface, pyproject_data)
+        try:
+            pyproject_data: dict[str, Any] | PyProject = load_pyproject(path)
+            provider_configurations: dict[str, dict[str, Any]] | None = load_providers(path)
+        except ConfigException:
+            # The project reports the validation errors
+            pyproject_data = read_pyproject(path)
+            provider_configurations = None
+
+        return Project(self.configuration, self.interface, pyproject_data, provider_configurations)
+
+    def run_workspace(self, action: str, patterns: tuple[str, ...], jobs: int) -> None:
+        """Runs an API call on every member of the workspace rooted at the found pyproject.toml
+
+        Args:
+            action: The API call, 'install' or 'update'
+            patterns: Member globs given on the command line. Defaults to the 'tool.cppython-workspace' table
+            jobs: The maximum number of members processed at once
+
+        Raises:
+            UsageError: Raised if the workspace has no members
+            ClickException: Raised if any member failed
+        """
+
+        from cppython.pyproject import read_pyproject
+        from cppython.workspace import Workspace, find_members, read_member_patterns
+
+        path: Path = self.configuration.pyproject_file
+
+        if not patterns:
+            patterns = tuple(read_member_patterns(read_pyproject(path)))
+
+        if not (members := find_members(path.parent, patterns)):
+            raise click.UsageError(f"No workspace members were found from {path}")
+
+        workspace = Workspace(
+            members, self.interface, self.logger, self.configuration.verbosity, self.configuration.debug
+        )
+
+        def report(result: "MemberResult") -> None:
+            """Prints the outcome of a member as soon as it is known
+
+            Args:
+                result: The outcome
+            """
+
+            status = "done" if result.success else f"failed: {result.error}"
+            click.echo(f"[{result.pyproject_file.parent}] {action} {status} ({result.duration:.2f}s)")
+
+        results = workspace.run(action, jobs, report)
+
+        if failures := [result for result in results if not result.success]:
+            raise click.ClickException(f"{len(failures)} of {len(results)} workspace members failed to {action}")
 
 
 # Attach our config object to click's hook
@@ -73,74 +245,289 @@ pass_config = click.make_pass_decorator(Configuration, ensure=True)
 @click.group()
 @click.option("-v", "--verbose", count=True, help="Print additional output")
 @click.option("--debug/--no-debug", default=False)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Time each phase, printing a summary and writing a Chrome trace to the given file",
+)
+@click.option("--daemon/--no-daemon", default=True, help="Hand commands to a running daemon")
+@click.option(
+    "--isolate/--no-isolate",
+    default=None,
+    help="Run plugin hooks in worker processes. Defaults to the CPPYTHON_ISOLATE environment variable",
+)
+@click.option("--plugin-timeout", type=click.FloatRange(min=0, min_open=True), help="Seconds an isolated hook may run")
+@click.option("--plugin-memory", type=click.IntRange(min=1), help="MiB of address space an isolated hook may use")
 @pass_config
-def cli(config: Configuration, verbose: int, debug: bool) -> None:
+def cli(
+    config: Configuration,
+    verbose: int,
+    debug: bool,
+    trace: Path | None,
+    daemon: bool,
+    isolate: bool | None,
+    plugin_timeout: float | None,
+    plugin_memory: int | None,
+) -> None:
     """entry_point group for the CLI commands
 
     Args:
         config: The CLI configuration object
         verbose: The verbosity level
         debug: Debug mode
+        trace: The trace file, if tracing
+        daemon: Whether a running daemon may serve the command
+        isolate: Whether plugin hooks run in worker processes, if given
+        plugin_timeout: The timeout of isolated hooks, if given
+        plugin_memory: The memory limit of isolated hooks, if given
     """
-    config.configuration.verbosity = verbose
-    config.configuration.debug = debug
+    config.verbosity = verbose
+    config.debug = debug
+
+    from cppython.logger import install_logging, set_verbosity
+
+    set_verbosity(install_logging(), verbose)
+
+    from cppython.isolation import IsolationPolicy, configure, isolation_policy
+    from cppython.tracing import tracer
+
+    isolation_options = isolate is not None or plugin_timeout is not None or plugin_memory is not None
+
+    if isolation_options:
+        policy = IsolationPolicy.from_environment()
+        configure(
+            IsolationPolicy(
+                enabled=policy.enabled if isolate is None else isolate,
+                timeout=policy.timeout if plugin_timeout is None else plugin_timeout,
+                memory_limit=policy.memory_limit if plugin_memory is None else plugin_memory * 1024 * 1024,
+            )
+        )
+
+    if trace is not None:
+        tracer().enable(trace)
+
+    # Traces describe this process, and the daemon has its own isolation policy, so these commands run locally. Both
+    # may also come from the environment
+    config.use_daemon = daemon and not tracer().enabled and not isolation_options and not isolation_policy().enabled
+
+
+json_option = click.option("--json", "as_json", is_flag=True, help="Print the report as JSON")
 
 
 @cli.command(name="info")
+@json_option
 @pass_config
-def info_command(config: Configuration) -> None:
-    """Prints project information
+def info_command(config: Configuration, as_json: bool) -> None:
+    """Prints project information: the resolved plugins, versions, paths, cache state and last step timings
 
     Args:
         config: The CLI configuration object
+        as_json: Whether to print JSON
     """
 
-    version = config.query_scm()
-    config.logger.info("The SCM project version is: %s", version)
+    description = config.describe()
+
+    if as_json:
+        click.echo(json.dumps(description, indent=2))
+        return
+
+    from cppython.report import format_report
+
+    click.echo("\n".join(format_report(description)))
 
 
 @cli.command(name="list")
+@json_option
 @pass_config
-def list_command(config: Configuration) -> None:
-    """Prints project information
+def list_command(config: Configuration, as_json: bool) -> None:
+    """Prints the installed plugins and which of them the project uses
 
     Args:
         config: The CLI configuration object
+        as_json: Whether to print JSON
     """
 
-    version = config.query_scm()
-    config.logger.info("The SCM project version is: %s", version)
+    from cppython.report import list_plugins
+
+    # The project only marks the plugins it selected, so listing works outside of a project too
+    try:
+        description = config.describe()
+    except click.ClickException as error:
+        config.logger.debug("The project could not be described: %s", error)
+        description = None
+
+    plugins = list_plugins(config.logger, description)
+
+    if as_json:
+        click.echo(json.dumps(plugins, indent=2))
+        return
+
+    for plugin in plugins:
+        marker = "*" if plugin["selected"] else " "
+        click.echo(f"{marker} {plugin['group']}: {plugin['name']} {plugin['version'] or ''}".rstrip())
+
+
+workspace_option = click.option(
+    "--workspace", is_flag=True, help="Run on every member of the 'tool.cppython-workspace' table"
+)
+member_option = click.option(
+    "--member", "members", multiple=True, help="Glob of workspace members to run on. Implies --workspace"
+)
+jobs_option = click.option(
+    "-j", "--jobs", default=os.cpu_count() or 1, show_default=True, help="Workspace members processed at once"
+)
+plan_option = click.option(
+    "--plan", is_flag=True, help="Print what would be done, as JSON, without doing it. Not available for workspaces"
+)
 
 
 @cli.command(name="install")
+@workspace_option
+@member_option
+@jobs_option
+@plan_option
 @pass_config
-def install_command(config: Configuration) -> None:
+def install_command(config: Configuration, workspace: bool, members: tuple[str, ...], jobs: int, plan: bool) -> None:
     """Install API call
 
     Args:
         config: The CLI configuration object
+        workspace: Whether to install every workspace member
+        members: Workspace member globs
+        jobs: The number of members installed at once
+        plan: Whether to only print the install plan
+
+    Raises:
+        UsageError: Raised if a plan is requested for a workspace
     """
+    if plan:
+        if workspace or members:
+            raise click.UsageError("--plan cannot be combined with workspace options")
+
+        click.echo(json.dumps(config.generate_project().plan(update=False), indent=2))
+        return
+
+    if workspace or members:
+        config.run_workspace("install", members, jobs)
+        return
+
+    if config.forward("install"):
+        return
+
     project = config.generate_project()
     project.install()
 
 
 @cli.command(name="update")
+@workspace_option
+@member_option
+@jobs_option
+@plan_option
 @pass_config
-def update_command(config: Configuration) -> None:
+def update_command(config: Configuration, workspace: bool, members: tuple[str, ...], jobs: int, plan: bool) -> None:
     """Update API call
 
     Args:
         config: The CLI configuration object
+        workspace: Whether to update every workspace member
+        members: Workspace member globs
+        jobs: The number of members updated at once
+        plan: Whether to only print the update plan
+
+    Raises:
+        UsageError: Raised if a plan is requested for a workspace
     """
+    if plan:
+        if workspace or members:
+            raise click.UsageError("--plan cannot be combined with workspace options")
+
+        click.echo(json.dumps(config.generate_project().plan(update=True), indent=2))
+        return
+
+    if workspace or members:
+        config.run_workspace("update", members, jobs)
+        return
+
+    if config.forward("update"):
+        return
+
     project = config.generate_project()
     project.update()
 
 
-class ConsoleInterface(Interface):
-    """Interface implementation to pass to the project"""
+@cli.group(name="daemon")
+def daemon_group() -> None:
+    """Manages the daemon that keeps projects warm between commands"""
+
+
+@daemon_group.command(name="start")
+@pass_config
+def daemon_start_command(config: Configuration) -> None:
+    """Runs the daemon in the foreground until it is stopped
+
+    Args:
+        config: The CLI configuration object
+
+    Raises:
+        ClickException: Raised if a daemon is already running
+    """
+
+    from cppython.daemon import Daemon
+
+    try:
+        Daemon(config.logger).run()
+    except RuntimeError as error:
+        raise click.ClickException(str(error)) from error
+
+
+@daemon_group.command(name="stop")
+def daemon_stop_command() -> None:
+    """Stops the running daemon"""
+
+    from cppython.client import DaemonClient
+
+    client = DaemonClient()
+
+    if not client.available():
+        click.echo("No daemon is running")
+        return
+
+    client.request({"command": "stop"})
+    click.echo("Stopped the daemon")
+
+
+@daemon_group.command(name="status")
+def daemon_status_command() -> None:
+    """Reports whether a daemon is running"""
+
+    from cppython.client import DaemonClient
+
+    client = DaemonClient()
+
+    if not client.available():
+        click.echo("No daemon is running")
+        return
+
+    for message in client.request({"command": "status"})["messages"]:
+        click.echo(message)
+
+
+def __getattr__(name: str) -> Any:
+    """Resolves 'ConsoleInterface' on first access, keeping its pydantic dependencies out of the CLI startup
+
+    Args:
+        name: The attribute name
+
+    Raises:
+        AttributeError: Raised for unknown attributes
+
+    Returns:
+        The attribute
+    """
+
+    if name == "ConsoleInterface":
+        from cppython.console.schema import ConsoleInterface
 
-    def write_pyproject(self) -> None:
-        """Write output"""
+        return ConsoleInterface
 
-    def write_configuration(self) -> None:
-        """Write output"""
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,13 @@
+"""Console specific schema definitions"""
+
+from cppython_core.schema import Interface
+
+
+class ConsoleInterface(Interface):
+    """Interface implementation to pass to the project"""
+
+    def write_pyproject(self) -> None:
+        """Write output"""
+
+    def write_configuration(self) -> None:
+        """Write output"""
@@ -0,0 +1,248 @@
+"""A long-running process that keeps resolved projects warm between CLI invocations
+
+The daemon holds the plugin registry and one constructed Project per pyproject.toml. Before serving a request it
+re-stamps the project's pyproject.toml and repository, so that edits, checkouts and tags rebuild the project instead
+of serving stale data
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Any
+
+from cppython_core.exceptions import ConfigException
+from cppython_core.schema import ProjectConfiguration, PyProject
+
+from cppython.client import DaemonClient, Request, Response, socket_path
+from cppython.console.schema import ConsoleInterface
+from cppython.project import Project
+from cppython.pyproject import load_providers, load_pyproject, read_pyproject
+from cppython.scm import repository_state
+
+
+@dataclass
+class WarmProject:
+    """A constructed project and the revision of the inputs it was built from"""
+
+    revision: tuple[object, ...]
+    project: Project
+
+
+class _Capture(logging.Handler):
+    """Collects the formatted log records of a request so they can be returned to the client"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Records a log message
+
+        Args:
+            record: The log record
+        """
+
+        self.messages.append(self.format(record))
+
+
+@contextmanager
+def _capture_logs(logger: Logger) -> Iterator[list[str]]:
+    """Collects the messages logged while the block runs
+
+    Args:
+        logger: The logger to listen to
+
+    Yields:
+        The collected messages, filled in as they are logged
+    """
+
+    handler = _Capture()
+    logger.addHandler(handler)
+
+    try:
+        yield handler.messages
+    finally:
+        logger.removeHandler(handler)
+
+
+def _revision(pyproject_file: Path, verbosity: int, debug: bool) -> tuple[object, ...]:
+    """Stamps every input a warm project depends on
+
+    Args:
+        pyproject_file: The project's pyproject.toml file
+        verbosity: The requested verbosity
+        debug: The requested debug mode
+
+    Returns:
+        A value that changes whenever the project must be rebuilt
+    """
+
+    stat = pyproject_file.stat()
+    return (stat.st_mtime_ns, stat.st_size, repository_state(pyproject_file.parent), verbosity, debug)
+
+
+class Daemon:
+    """Serves install and update requests for any number of projects over a Unix socket"""
+
+    def __init__(self, logger: Logger, path: Path | None = None) -> None:
+        self._logger = logger
+        self._path = path if path is not None else socket_path()
+        self._projects: dict[Path, WarmProject] = {}
+
+        # Projects share the 'cppython' logger, so requests are served one at a time to keep their output apart
+        self._lock = threading.Lock()
+        self._stopping = asyncio.Event()
+
+    @property
+    def path(self) -> Path:
+        """The socket the daemon listens on"""
+        return self._path
+
+    def project(self, pyproject_file: Path, verbosity: int = 0, debug: bool = False) -> Project:
+        """Retrieves the warm project of a pyproject.toml file, rebuilding it if its inputs changed
+
+        Args:
+            pyproject_file: The project's pyproject.toml file
+            verbosity: The requested verbosity
+            debug: The requested debug mode
+
+        Returns:
+            The project
+        """
+
+        pyproject_file = pyproject_file.resolve()
+        revision = _revision(pyproject_file, verbosity, debug)
+
+        if (warm := self._projects.get(pyproject_file)) is not None and warm.revision == revision:
+            return warm.project
+
+        self._logger.info("Building %s", pyproject_file)
+
+        try:
+            pyproject_data: dict[str, Any] | PyProject = load_pyproject(pyproject_file)
+            provider_configurations: dict[str, dict[str, Any]] | None = load_providers(pyproject_file)
+        except ConfigException:
+            # The project reports the validation errors
+            pyproject_data = read_pyproject(pyproject_file)
+            provider_configurations = None
+
+        configuration = ProjectConfiguration(
+            pyproject_file=pyproject_file, version=None, verbosity=verbosity, debug=debug
+        )
+        project = Project(configuration, ConsoleInterface(), pyproject_data, provider_configurations)
+
+        self._projects[pyproject_file] = WarmProject(revision, project)
+
+        return project
+
+    def handle(self, request: Request) -> Response:
+        """Serves a single request. Runs on a worker thread
+
+        Args:
+            request: The request
+
+        Returns:
+            The response
+        """
+
+        command = request.get("command")
+
+        if command == "status":
+            return {
+                "success": True,
+                "error": None,
+                "messages": [f"Serving {len(self._projects)} warm projects from process {os.getpid()}"],
+            }
+
+        if command not in ("install", "update") or "pyproject" not in request:
+            return {"success": False, "error": f"Unknown request: {request}", "messages": []}
+
+        with self._lock, _capture_logs(logging.getLogger("cppython")) as messages:
+            try:
+                project = self.project(
+                    Path(request["pyproject"]), request.get("verbosity", 0), request.get("debug", False)
+                )
+
+                if command == "install":
+                    project.install()
+                else:
+                    project.update()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                self._logger.exception("The %s request failed", command)
+                return {"success": False, "error": str(error), "messages": messages}
+
+        return {"success": True, "error": None, "messages": messages}
+
+    async def serve(self) -> None:
+        """Listens for requests until a 'stop' request arrives
+
+        Raises:
+            RuntimeError: Raised if another daemon already listens on the socket
+        """
+
+        if DaemonClient(self._path).available():
+            raise RuntimeError(f"A daemon is already listening on {self._path}")
+
+        # Left behind by a daemon that did not shut down cleanly
+        self._path.unlink(missing_ok=True)
+
+        self._stopping.clear()
+        server = await asyncio.start_unix_server(self._connection, path=str(self._path))
+        os.chmod(self._path, 0o600)
+
+        self._logger.info("Listening on %s", self._path)
+
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            self._path.unlink(missing_ok=True)
+
+    def run(self) -> None:
+        """Serves requests on the calling thread until stopped"""
+
+        asyncio.run(self.serve())
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the request of one connection
+
+        Args:
+            reader: The incoming stream
+            writer: The outgoing stream
+        """
+
+        try:
+            # Availability probes connect and hang up without sending anything
+            if not (line := await reader.readline()):
+                return
+
+            try:
+                request: Request = json.loads(line)
+
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as error:
+                response: Response = {"success": False, "error": f"Malformed request: {error}", "messages": []}
+            else:
+                if request.get("command") == "stop":
+                    response = {"success": True, "error": None, "messages": ["Stopping the daemon"]}
+                    self._stopping.set()
+                else:
+                    response = await asyncio.to_thread(self.handle, request)
+
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            self._logger.debug("A client hung up before receiving its response")
+        finally:
+            writer.close()
+
+            with suppress(ConnectionError):
+                await writer.wait_closed()
@@ -1,13 +1,30 @@
 """Defines the post-construction data management for CPPython"""
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from logging import Logger
+from typing import Any
 
 from cppython_core.exceptions import PluginError
 from cppython_core.plugin_schema.generator import Generator
 from cppython_core.plugin_schema.provider import Provider
 from cppython_core.plugin_schema.scm import SCM
-from cppython_core.schema import CoreData
+from cppython_core.schema import CoreData, SyncData
+
+from cppython.isolation import PluginPool
+from cppython.locking import FileLock, resource_lock
+from cppython.pipeline import Estimate, call_hook
+from cppython.state import (
+    PROVIDER_STATE_DIRECTORY,
+    STATE_FILE_NAME,
+    TIMINGS_FILE_NAME,
+    InstallState,
+    StateFile,
+    TimingsFile,
+)
+from cppython.sync import SYNC_FILE_NAME, OutputWatch, SyncFile, SyncState, sync_digest
+from cppython.tooling import ToolingCache
+from cppython.tracing import traced
 
 
 @dataclass
@@ -17,40 +34,305 @@ class Plugins:
     generator: Generator
     provider: Provider
     scm: SCM
+    providers: list[Provider] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        # Every provider of the project, the primary 'provider' first
+        if not self.providers:
+            self.providers = [self.provider]
 
 
 class Data:
     """Contains and manages the project data"""
 
-    def __init__(self, core_data: CoreData, plugins: Plugins, logger: Logger) -> None:
+    def __init__(
+        self,
+        core_data: CoreData,
+        plugins: Plugins,
+        logger: Logger,
+        fingerprint: str | None = None,
+        versions: dict[str, str | None] | None = None,
+        pool: PluginPool | None = None,
+    ) -> None:
         self._core_data = core_data
         self._plugins = plugins
         self.logger = logger
+        self._fingerprint = fingerprint
+        self._versions = versions or {}
+        self._pool = pool
+
+        tool_path = core_data.cppython_data.tool_path
+
+        self._state_file = StateFile(tool_path / STATE_FILE_NAME)
+        self._sync_file = SyncFile(tool_path / SYNC_FILE_NAME)
+        self._timings_file = TimingsFile(tool_path / TIMINGS_FILE_NAME)
+        self._output_watch = OutputWatch(
+            core_data.project_data.pyproject_file.parent,
+            tool_path,
+            [
+                self._state_file.path,
+                self._sync_file.path,
+                self._timings_file.path,
+                tool_path / PROVIDER_STATE_DIRECTORY,
+                core_data.cppython_data.install_path,
+            ],
+        )
 
     @property
     def plugins(self) -> Plugins:
         """The plugin data for CPPython"""
         return self._plugins
 
+    async def call_plugin(self, plugin: Any, hook: str, *arguments: Any) -> Any:
+        """Calls a plugin lifecycle hook, in a worker process if plugin isolation is enabled
+
+        Args:
+            plugin: The plugin
+            hook: The name of the hook, such as 'install'
+            arguments: The positional arguments of the hook
+
+        Returns:
+            The value the hook returned
+        """
+
+        if self._pool is None:
+            return await call_hook(getattr(plugin, hook), *arguments)
+
+        return await self._pool.call(plugin, hook, *arguments)
+
     def sync(self) -> None:
-        """Gathers sync information from providers and passes it to the generator
+        """Gathers sync information from providers and passes it to the generator. Blocking form of 'sync_async'"""
+
+        asyncio.run(self.sync_async())
+
+    @traced
+    async def sync_async(self) -> None:
+        """Gathers sync information from every provider at once and then passes it to the generator, awaiting
+        plugins that implement the hooks asynchronously
 
         Raises:
             PluginError: Plugin error
         """
 
-        if (sync_data := self.plugins.provider.sync_data(self.plugins.generator)) is None:
-            raise PluginError("The provider doesn't support the generator")
+        providers = self.plugins.providers
+        results = await asyncio.gather(
+            *(self.call_plugin(provider, "sync_data", self.plugins.generator) for provider in providers)
+        )
+
+        sync_data_list: list[SyncData] = []
+        for provider, sync_data in zip(providers, results):
+            if sync_data is None:
+                raise PluginError(f"The provider {provider.name()} doesn't support the generator")
+
+            sync_data_list.append(sync_data)
+
+        generator = self.plugins.generator
+        digest = sync_digest(generator.name(), sync_data_list)
+
+        # The record is read under the lock, so a sync that another process just finished is reused
+        async with resource_lock(self._sync_file.path):
+            state = self._sync_file.read()
+
+            if state is not None and state.digest == digest and OutputWatch.intact(state.outputs):
+                self.logger.info("Skipping the %s sync because its data is unchanged", generator.name())
+                return
+
+            previous = state.outputs if state is not None else {}
+            before = await asyncio.to_thread(self._output_watch.survey)
+
+            for sync_data in sync_data_list:
+                await self.call_plugin(generator, "sync", sync_data)
+
+            after = await asyncio.to_thread(self._output_watch.survey)
+            outputs = await asyncio.to_thread(OutputWatch.settle, previous, before, after)
+
+            self._sync_file.write(SyncState(digest=digest, outputs=outputs))
+
+    @traced
+    def is_current(self) -> bool:
+        """Queries whether the last successful install used exactly the inputs of this data
+
+        Returns:
+            The query result
+        """
+
+        if self._fingerprint is None:
+            return False
+
+        if (state := self._state_file.read()) is None or state.fingerprint != self._fingerprint:
+            return False
+
+        # Someone may have removed the installed tooling or edited the generator outputs since, or synced other data
+        sync_state = self._sync_file.read()
+
+        if sync_state is None or sync_state.digest != state.sync_digest or not OutputWatch.intact(sync_state.outputs):
+            return False
+
+        install_path = self._core_data.cppython_data.install_path
+        return all((install_path / provider.name()).is_dir() for provider in self.plugins.providers)
+
+    def estimate_tools(self, provider: Provider) -> Estimate:
+        """Predicts whether the tooling of a provider would be downloaded
+
+        Args:
+            provider: The provider
+
+        Returns:
+            The estimate
+        """
+
+        name = provider.name()
+        version = self._versions.get(name)
+        path = self._core_data.cppython_data.install_path / name
+
+        cache = ToolingCache()
+
+        if cache.is_valid(path, name, version):
+            return Estimate(cached=True, detail=[f"present in {path}"])
+
+        if cache.stored(name, version):
+            return Estimate(cached=True, detail=[f"restore to {path} from the tooling cache"])
+
+        return Estimate(cached=False, detail=[f"download to {path}"])
+
+    def estimate_sync(self) -> Estimate:
+        """Predicts whether the generator would be synced, and which files it would write
+
+        Returns:
+            The estimate. It counts as cached only if the provider data it depends on is cached as well
+        """
+
+        if (state := self._sync_file.read()) is None:
+            return Estimate(cached=False, detail=["the generator outputs are unknown until the first sync"])
+
+        return Estimate(cached=OutputWatch.intact(state.outputs), detail=sorted(state.outputs))
+
+    def timings(self) -> dict[str, float]:
+        """The step durations of the last runs
+
+        Returns:
+            The durations in seconds, keyed by step name
+        """
+
+        return self._timings_file.read().durations
+
+    def record_timings(self, durations: dict[str, float]) -> None:
+        """Records the step durations of a run
+
+        Args:
+            durations: The durations in seconds, keyed by step name
+        """
+
+        self._timings_file.update(durations)
+
+    def record_state(self) -> None:
+        """Records the inputs of a successful install"""
+
+        if self._fingerprint is None:
+            return
+
+        sync_state = self._sync_file.read()
+        sync_digest = sync_state.digest if sync_state is not None else None
+
+        self._state_file.write(InstallState(fingerprint=self._fingerprint, sync_digest=sync_digest))
+
+    def _provider_state(self, provider: Provider) -> StateFile:
+        """Locates the install record of a single provider
+
+        Args:
+            provider: The provider
+
+        Returns:
+            The state file
+        """
+
+        directory = self._core_data.cppython_data.tool_path / PROVIDER_STATE_DIRECTORY
+        return StateFile(directory / f"{provider.name()}.json")
+
+    def provider_lock(self, provider: Provider) -> FileLock:
+        """Creates the lock that processes hold while they install into the directory of a provider
+
+        Args:
+            provider: The provider
+
+        Returns:
+            The exclusive lock, not yet acquired
+        """
+
+        return resource_lock(self._core_data.cppython_data.install_path / provider.name())
 
-        self.plugins.generator.sync(sync_data)
+    def provider_current(self, provider: Provider) -> bool:
+        """Queries whether a provider was installed with exactly the inputs of this data, by this process or another
 
+        Args:
+            provider: The provider
+
+        Returns:
+            The query result
+        """
+
+        if self._fingerprint is None:
+            return False
+
+        if (state := self._provider_state(provider).read()) is None or state.fingerprint != self._fingerprint:
+            return False
+
+        return (self._core_data.cppython_data.install_path / provider.name()).is_dir()
+
+    def record_provider(self, provider: Provider) -> None:
+        """Records that a provider installed successfully with the inputs of this data
+
+        Args:
+            provider: The provider
+        """
+
+        if self._fingerprint is None:
+            return
+
+        self._provider_state(provider).write(InstallState(fingerprint=self._fingerprint))
+
+    @traced
     async def download_provider_tools(self) -> None:
-        """Download the provider tooling if required"""
+        """Downloads the tooling of every provider at once"""
+
+        await asyncio.gather(*(self.download_tools(provider) for provider in self.plugins.providers))
+
+    async def download_tools(self, provider: Provider) -> None:
+        """Download the tooling of a provider if required. Tooling that is already present and intact, or that
+        another project on this machine already downloaded, is reused
+
+        Args:
+            provider: The provider
+        """
         base_path = self._core_data.cppython_data.install_path
 
-        path = base_path / self.plugins.provider.name()
+        name = provider.name()
+        version = self._versions.get(name)
+        path = base_path / name
 
         path.mkdir(parents=True, exist_ok=True)
 
-        self.logger.warning("Downloading the %s requirements to %s", self.plugins.provider.name(), path)
-        await self.plugins.provider.download_tooling(path)
+        cache = ToolingCache()
+
+        async with resource_lock(path, shared=True):
+            if cache.is_valid(path, name, version):
+                self.logger.info("The %s requirements are already present in %s", name, path)
+                return
+
+        async with resource_lock(path):
+            # Another process may have provided the tooling while this one waited for the lock
+            if cache.is_valid(path, name, version):
+                self.logger.info("The %s requirements were provided in %s by another process", name, path)
+                return
+
+            if cache.restore(path, name, version):
+                self.logger.info("Restored the %s requirements to %s from the tooling cache", name, path)
+                return
+
+            # Writing through hardlinks into the artifact store would alter every project's copy
+            cache.release(path)
+
+            self.logger.warning("Downloading the %s requirements to %s", name, path)
+            await self.call_plugin(provider, "download_tooling", path)
+
+            cache.record(path, name, version)
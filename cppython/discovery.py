@@ -0,0 +1,414 @@
+"""Discovery and indexing of the installed CPPython plugins"""
+
+import hashlib
+import os
+import sys
+from dataclasses import dataclass, field
+from importlib import metadata
+from logging import Logger
+from pathlib import Path
+from typing import Any, ClassVar, Self
+
+from cppython_core.plugin_schema.generator import Generator
+from cppython_core.plugin_schema.provider import Provider
+from cppython_core.plugin_schema.scm import SCM
+from cppython_core.resolution import PluginBuildData
+from cppython_core.schema import Plugin, SyncData
+from pydantic import BaseModel, ValidationError
+
+from cppython.cache import cache_directory, interpreter_key, write_atomic
+
+INDEX_VERSION = 1
+
+plugin_groups: dict[str, type[Plugin]] = {
+    "generator": Generator,
+    "provider": Provider,
+    "scm": SCM,
+}
+
+
+def _qualified_name(sync_type: type[SyncData]) -> str:
+    """Names a sync type so that it can be compared without importing it
+
+    Args:
+        sync_type: The sync data type
+
+    Returns:
+        The fully qualified name of the type
+    """
+
+    return f"{sync_type.__module__}.{sync_type.__qualname__}"
+
+
+def scan_entry_points() -> dict[str, list[metadata.EntryPoint]]:
+    """Gathers the entry points of every plugin group in a single pass over the installed distributions
+
+    Returns:
+        The entry points, keyed by plugin group
+    """
+
+    entry_points = metadata.entry_points()
+
+    return {group_name: list(entry_points.select(group=f"cppython.{group_name}")) for group_name in plugin_groups}
+
+
+def environment_fingerprint() -> str:
+    """Fingerprints the installed distributions of the running interpreter
+
+    Installing, upgrading or removing a distribution touches the directory it lives in, so the modification
+    times of the import path entries stand in for a walk over every distribution's metadata
+
+    Returns:
+        The fingerprint
+    """
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{sys.executable}\0{sys.version}\0{INDEX_VERSION}".encode())
+
+    for entry in sys.path:
+        # The working directory changes constantly and never holds installed plugins
+        if not entry:
+            continue
+
+        try:
+            modified = os.stat(entry).st_mtime_ns
+        except OSError:
+            continue
+
+        hasher.update(f"\0{entry}\0{modified}".encode())
+
+    return hasher.hexdigest()
+
+
+class PluginRecord(BaseModel):
+    """The indexed metadata of a single plugin, available without importing it"""
+
+    group: str
+    name: str
+    target: str
+    distribution: str | None = None
+    version: str | None = None
+    sync_types: list[str] = []
+    supported_sync_types: list[str] = []
+
+    def load(self) -> type[Any]:
+        """Imports the plugin type that this record describes
+
+        Returns:
+            The plugin type
+        """
+
+        entry_point = metadata.EntryPoint(name=self.name, value=self.target, group=f"cppython.{self.group}")
+        return entry_point.load()  # type: ignore[no-any-return]
+
+
+class PluginHandle[T: Plugin]:
+    """A stand-in for a plugin type that answers metadata queries from its record and imports the type on demand"""
+
+    def __init__(self, record: PluginRecord, plugin_type: type[T] | None = None) -> None:
+        self._record = record
+        self._type = plugin_type
+
+    @classmethod
+    def from_type(cls, group_name: str, plugin_type: type[T]) -> "PluginHandle[T]":
+        """Wraps an already imported plugin type
+
+        Args:
+            group_name: The plugin group
+            plugin_type: The plugin type
+
+        Returns:
+            The handle
+        """
+
+        record = PluginRecord(
+            group=group_name,
+            name=plugin_type.name(),
+            target=f"{plugin_type.__module__}:{plugin_type.__qualname__}",
+        )
+
+        if issubclass(plugin_type, Generator):
+            record.sync_types = [_qualified_name(sync_type) for sync_type in plugin_type.sync_types()]
+
+        return cls(record, plugin_type)
+
+    @property
+    def record(self) -> PluginRecord:
+        """The indexed metadata of the plugin"""
+        return self._record
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the plugin type has been imported"""
+        return self._type is not None
+
+    def name(self) -> str:
+        """The name of the plugin
+
+        Returns:
+            The plugin name
+        """
+
+        return self._record.name
+
+    def sync_types(self) -> list[str]:
+        """The qualified names of the sync types a generator plugin consumes
+
+        Returns:
+            The sync type names
+        """
+
+        return self._record.sync_types
+
+    def supported_sync_type(self, sync_type: str) -> bool:
+        """Queries whether a provider plugin can produce the named sync type
+
+        Args:
+            sync_type: The qualified name of the sync type
+
+        Returns:
+            The query result
+        """
+
+        return sync_type in self._record.supported_sync_types
+
+    def load(self) -> type[T]:
+        """Imports the plugin type, once
+
+        Returns:
+            The plugin type
+        """
+
+        if self._type is None:
+            self._type = self._record.load()
+
+        return self._type
+
+
+@dataclass
+class PluginSelection:
+    """The plugins chosen for a project. Only the SCM plugin is guaranteed to be imported"""
+
+    generator: PluginHandle[Generator]
+    provider: PluginHandle[Provider]
+    scm: PluginHandle[SCM]
+    providers: list[PluginHandle[Provider]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        # Every provider of the project, the primary 'provider' first
+        if not self.providers:
+            self.providers = [self.provider]
+
+    @property
+    def records(self) -> list[PluginRecord]:
+        """The records of every selected plugin"""
+        return [self.generator.record, *(provider.record for provider in self.providers), self.scm.record]
+
+    @classmethod
+    def from_build_data(cls, plugin_build_data: PluginBuildData) -> Self:
+        """Wraps explicitly given plugin types
+
+        Args:
+            plugin_build_data: The plugin types
+
+        Returns:
+            The selection
+        """
+
+        return cls(
+            generator=PluginHandle.from_type("generator", plugin_build_data.generator_type),
+            provider=PluginHandle.from_type("provider", plugin_build_data.provider_type),
+            scm=PluginHandle.from_type("scm", plugin_build_data.scm_type),
+        )
+
+
+class PluginIndex(BaseModel):
+    """An index of every installed plugin, keyed by the environment it was built from"""
+
+    version: int = INDEX_VERSION
+    fingerprint: str
+    records: list[PluginRecord] = []
+
+    @classmethod
+    def build(cls, fingerprint: str, logger: Logger) -> Self:
+        """Imports every installed plugin once to record its metadata
+
+        Args:
+            fingerprint: The environment fingerprint the index is valid for
+            logger: The logger for reporting incompatible plugins
+
+        Returns:
+            The built index
+        """
+
+        loaded: list[tuple[str, metadata.EntryPoint, type[Plugin]]] = []
+
+        for group_name, entry_points in scan_entry_points().items():
+            for entry_point in entry_points:
+                loaded_type = entry_point.load()
+                if not issubclass(loaded_type, plugin_groups[group_name]):
+                    logger.warning(
+                        f"Found incompatible plugin. The '{loaded_type.name()}' plugin must be an instance of"
+                        f" '{group_name}'"
+                    )
+                    continue
+
+                loaded.append((group_name, entry_point, loaded_type))
+
+        # Providers are only asked about the sync types that some installed generator can consume
+        known_sync_types: dict[str, type[SyncData]] = {}
+        for _, _, loaded_type in loaded:
+            if issubclass(loaded_type, Generator):
+                for sync_type in loaded_type.sync_types():
+                    known_sync_types[_qualified_name(sync_type)] = sync_type
+
+        records: list[PluginRecord] = []
+        for group_name, entry_point, loaded_type in loaded:
+            record = PluginRecord(
+                group=group_name,
+                name=loaded_type.name(),
+                target=entry_point.value,
+                distribution=entry_point.dist.name if entry_point.dist else None,
+                version=entry_point.dist.version if entry_point.dist else None,
+            )
+
+            if issubclass(loaded_type, Generator):
+                record.sync_types = [_qualified_name(sync_type) for sync_type in loaded_type.sync_types()]
+            elif issubclass(loaded_type, Provider):
+                record.supported_sync_types = [
+                    name for name, sync_type in known_sync_types.items() if loaded_type.supported_sync_type(sync_type)
+                ]
+
+            records.append(record)
+
+        return cls(fingerprint=fingerprint, records=records)
+
+    @classmethod
+    def read(cls, path: Path, fingerprint: str) -> Self | None:
+        """Reads a previously written index if it is still valid
+
+        Args:
+            path: The index file
+            fingerprint: The fingerprint of the current environment
+
+        Returns:
+            The index, or None if it is missing, unreadable or stale
+        """
+
+        try:
+            index = cls.model_validate_json(path.read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+        if index.version != INDEX_VERSION or index.fingerprint != fingerprint:
+            return None
+
+        return index
+
+    def write(self, path: Path) -> None:
+        """Persists the index
+
+        Args:
+            path: The index file
+        """
+
+        write_atomic(path, self.model_dump_json())
+
+    def group(self, group_name: str) -> list[PluginRecord]:
+        """Lists the plugins of a single group, in discovery order
+
+        Args:
+            group_name: The plugin group, such as 'generator'
+
+        Returns:
+            The records of the group
+        """
+
+        return [record for record in self.records if record.group == group_name]
+
+
+def resolve_plugin_index(logger: Logger, path: Path | None = None, fingerprint: str | None = None) -> PluginIndex:
+    """Loads the persisted plugin index, rebuilding it when the environment has changed
+
+    Args:
+        logger: The logger
+        path: The index file. Defaults to a file in the CPPython cache directory named after the interpreter's
+            prefix, so that virtual environments sharing the cache don't rebuild each other's index
+        fingerprint: The environment fingerprint, if already computed
+
+    Returns:
+        The plugin index for the running environment
+    """
+
+    if path is None:
+        path = cache_directory() / f"plugins-{interpreter_key()}.json"
+
+    if fingerprint is None:
+        fingerprint = environment_fingerprint()
+
+    if (index := PluginIndex.read(path, fingerprint)) is not None:
+        return index
+
+    logger.info("Rebuilding the plugin index at %s", path)
+
+    index = PluginIndex.build(fingerprint, logger)
+
+    try:
+        index.write(path)
+    except OSError as error:
+        logger.warning("The plugin index could not be written: %s", error)
+
+    return index
+
+
+class PluginRegistry:
+    """The in-memory view of the installed plugins, shared by every Builder in the process"""
+
+    _shared: ClassVar[dict[tuple[str, Path | None], "PluginRegistry"]] = {}
+
+    def __init__(self, index: PluginIndex) -> None:
+        self._index = index
+        self._groups: dict[str, list[PluginHandle[Any]]] = {group_name: [] for group_name in plugin_groups}
+
+        # Handles are shared so that a plugin imported for one Builder stays imported for the next
+        for record in index.records:
+            self._groups.setdefault(record.group, []).append(PluginHandle(record))
+
+    @property
+    def index(self) -> PluginIndex:
+        """The plugin index backing the registry"""
+        return self._index
+
+    def group(self, group_name: str) -> list[PluginHandle[Any]]:
+        """Lists the plugins of a single group, in discovery order
+
+        Args:
+            group_name: The plugin group, such as 'generator'
+
+        Returns:
+            The plugin handles of the group
+        """
+
+        return list(self._groups.get(group_name, []))
+
+    @classmethod
+    def shared(cls, logger: Logger, path: Path | None = None) -> "PluginRegistry":
+        """Retrieves the registry of the running environment, building it at most once per environment state
+
+        Args:
+            logger: The logger
+            path: The index file. Defaults to a file in the CPPython cache directory named after the interpreter's
+            prefix, so that virtual environments sharing the cache don't rebuild each other's index
+
+        Returns:
+            The shared registry
+        """
+
+        fingerprint = environment_fingerprint()
+        key = (fingerprint, path)
+
+        if (registry := cls._shared.get(key)) is None:
+            registry = cls(resolve_plugin_index(logger, path, fingerprint))
+            cls._shared[key] = registry
+
+        return registry
@@ -0,0 +1,423 @@
+"""Execution of plugin lifecycle hooks in worker processes
+
+A hung or runaway plugin must not take the CLI down with it. With isolation enabled, each hook call is pickled, along
+with the plugin it is bound to, and sent to a worker process of a shared pool. Calls are bounded by a timeout, workers
+by an address space limit, and a worker whose call timed out, was cancelled, or failed is killed and replaced
+"""
+
+import asyncio
+import atexit
+import inspect
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from cppython_core.exceptions import PluginError
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+ISOLATE_VARIABLE = "CPPYTHON_ISOLATE"
+TIMEOUT_VARIABLE = "CPPYTHON_PLUGIN_TIMEOUT"
+MEMORY_VARIABLE = "CPPYTHON_PLUGIN_MEMORY"
+
+_POLL_INTERVAL = 0.1
+
+
+class PluginTimeoutError(PluginError):
+    """Raised when a plugin hook exceeds the call timeout"""
+
+
+class PluginCrashError(PluginError):
+    """Raised when the worker running a plugin hook dies"""
+
+
+@dataclass(frozen=True)
+class IsolationPolicy:
+    """How plugin hooks are run"""
+
+    enabled: bool = False
+    timeout: float | None = None
+    memory_limit: int | None = None
+
+    @classmethod
+    def from_environment(cls) -> "IsolationPolicy":
+        """Reads the policy from 'CPPYTHON_ISOLATE', 'CPPYTHON_PLUGIN_TIMEOUT' (seconds) and
+        'CPPYTHON_PLUGIN_MEMORY' (MiB)
+
+        Returns:
+            The policy
+        """
+
+        timeout = os.environ.get(TIMEOUT_VARIABLE)
+        memory = os.environ.get(MEMORY_VARIABLE)
+
+        return cls(
+            enabled=os.environ.get(ISOLATE_VARIABLE, "").lower() in ("1", "true", "yes", "on"),
+            timeout=float(timeout) if timeout else None,
+            memory_limit=int(memory) * 1024 * 1024 if memory else None,
+        )
+
+
+@dataclass
+class CallResult:
+    """The outcome of a hook call, as reported by the worker"""
+
+    success: bool
+    value: Any = None
+    error: str | None = None
+    traceback: str | None = None
+    duration: float = 0.0
+    max_rss: int | None = None
+
+
+def _limit_memory(memory_limit: int | None) -> None:
+    """Caps the address space of the calling process where the platform supports it
+
+    Args:
+        memory_limit: The limit in bytes, or None for no limit
+    """
+
+    if memory_limit is None or resource is None:
+        return
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+
+    if hard != resource.RLIM_INFINITY:
+        memory_limit = min(memory_limit, hard)
+
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+
+def _max_rss() -> int | None:
+    """The peak resident set size of the calling process
+
+    Returns:
+        The size in kilobytes, or None where the platform does not report it
+    """
+
+    if resource is None:
+        return None
+
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def invoke(plugin: Any, hook: str, arguments: tuple[Any, ...]) -> CallResult:
+    """Calls a plugin hook, running it to completion if it is asynchronous, and captures the outcome
+
+    Args:
+        plugin: The plugin
+        hook: The name of the hook method
+        arguments: The positional arguments of the hook
+
+    Returns:
+        The outcome
+    """
+
+    start = time.perf_counter()
+
+    try:
+        value = getattr(plugin, hook)(*arguments)
+
+        if inspect.isawaitable(value):
+            value = asyncio.run(_await(value))
+
+        result = CallResult(success=True, value=value)
+    except Exception as exception:  # pylint: disable=broad-exception-caught
+        result = CallResult(
+            success=False, error=f"{type(exception).__name__}: {exception}", traceback=traceback.format_exc()
+        )
+
+    result.duration = time.perf_counter() - start
+    result.max_rss = _max_rss()
+
+    return result
+
+
+async def _await(awaitable: Any) -> Any:
+    """Awaits an awaitable, so that 'asyncio.run' accepts any awaitable and not only coroutines
+
+    Args:
+        awaitable: The awaitable
+
+    Returns:
+        The result
+    """
+
+    return await awaitable
+
+
+def _serve(connection: Connection, memory_limit: int | None) -> None:
+    """The main loop of a worker process. Serves calls until the pool closes the connection
+
+    Args:
+        connection: The worker's end of the pipe
+        memory_limit: The address space limit in bytes
+    """
+
+    _limit_memory(memory_limit)
+
+    while True:
+        try:
+            payload = connection.recv_bytes()
+        except (EOFError, OSError):
+            return
+
+        try:
+            plugin, hook, arguments = pickle.loads(payload)
+            result = invoke(plugin, hook, arguments)
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            result = CallResult(success=False, error=f"The call could not be unpickled: {exception}")
+
+        try:
+            connection.send(result)
+        except (pickle.PicklingError, TypeError, AttributeError) as exception:
+            connection.send(CallResult(success=False, error=f"The result could not be pickled: {exception}"))
+
+
+@dataclass
+class _Worker:
+    """A worker process and the parent's end of its pipe"""
+
+    process: BaseProcess
+    connection: Connection
+
+    def kill(self) -> None:
+        """Stops the worker without waiting for its current call"""
+
+        self.connection.close()
+        self.process.kill()
+        self.process.join()
+
+
+class PluginPool:
+    """A bounded pool of worker processes that run plugin hooks. The pool is thread-safe, so the projects of a
+    workspace, each driven from its own thread, share it
+    """
+
+    def __init__(self, policy: IsolationPolicy, max_workers: int | None = None) -> None:
+        self._policy = policy
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(max(1, max_workers or os.cpu_count() or 1))
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def policy(self) -> IsolationPolicy:
+        """The policy the pool enforces"""
+        return self._policy
+
+    def _spawn(self) -> _Worker:
+        """Starts a worker process
+
+        Returns:
+            The worker
+        """
+
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_serve, args=(child, self._policy.memory_limit), name="cppython-plugin", daemon=True
+        )
+        process.start()
+        child.close()
+
+        return _Worker(process, parent)
+
+    def _checkout(self) -> _Worker:
+        """Takes an idle worker, starting one if none is left
+
+        Returns:
+            The worker
+        """
+
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+
+                worker.kill()
+
+        return self._spawn()
+
+    def _checkin(self, worker: _Worker) -> None:
+        """Returns a healthy worker to the pool
+
+        Args:
+            worker: The worker
+        """
+
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+
+        worker.kill()
+
+    def call_blocking(
+        self, plugin: Any, hook: str, arguments: tuple[Any, ...] = (), cancelled: threading.Event | None = None
+    ) -> CallResult:
+        """Runs a hook in a worker and waits for the outcome
+
+        Args:
+            plugin: The plugin. It and the arguments must be picklable
+            hook: The name of the hook method
+            arguments: The positional arguments of the hook
+            cancelled: Set by another thread to abandon the call
+
+        Raises:
+            PluginError: Raised if the call could not be sent, or was cancelled
+            PluginTimeoutError: Raised if the call exceeded the timeout
+            PluginCrashError: Raised if the worker died during the call
+
+        Returns:
+            The outcome reported by the worker
+        """
+
+        try:
+            payload = pickle.dumps((plugin, hook, arguments))
+        except (pickle.PicklingError, TypeError, AttributeError) as exception:
+            raise PluginError(f"The '{hook}' call of {plugin.name()} cannot be sent to a worker: {exception}") from None
+
+        timeout = self._policy.timeout
+
+        with self._slots:
+            if self._closed:
+                raise PluginError("The plugin pool is closed")
+
+            worker = self._checkout()
+
+            try:
+                worker.connection.send_bytes(payload)
+
+                # Time spent waiting for a free worker doesn't count against the call
+                deadline = None if timeout is None else time.monotonic() + timeout
+
+                while not worker.connection.poll(_POLL_INTERVAL):
+                    if cancelled is not None and cancelled.is_set():
+                        raise PluginError(f"The '{hook}' call of {plugin.name()} was cancelled")
+
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise PluginTimeoutError(f"The '{hook}' call of {plugin.name()} timed out after {timeout}s")
+
+                    if not worker.process.is_alive():
+                        raise PluginCrashError(
+                            f"The worker running the '{hook}' call of {plugin.name()} exited with code"
+                            f" {worker.process.exitcode}"
+                        )
+
+                result: CallResult = worker.connection.recv()
+            except (EOFError, OSError) as exception:
+                worker.kill()
+                raise PluginCrashError(f"The worker running the '{hook}' call of {plugin.name()} died") from exception
+            except BaseException:
+                worker.kill()
+                raise
+
+            # A failed hook may have left the worker in any state, so it is not reused
+            if result.success:
+                self._checkin(worker)
+            else:
+                worker.kill()
+
+        return result
+
+    async def call(self, plugin: Any, hook: str, *arguments: Any) -> Any:
+        """Runs a hook in a worker without blocking the event loop. Cancelling the awaiting task kills the worker
+
+        Args:
+            plugin: The plugin
+            hook: The name of the hook method
+            arguments: The positional arguments of the hook
+
+        Raises:
+            PluginError: Raised if the hook raised, with the worker's traceback attached as a note
+
+        Returns:
+            The value the hook returned
+        """
+
+        cancelled = threading.Event()
+
+        try:
+            result = await asyncio.to_thread(self.call_blocking, plugin, hook, arguments, cancelled)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+        if not result.success:
+            error = PluginError(f"The '{hook}' call of {plugin.name()} failed: {result.error}")
+
+            if result.traceback:
+                error.add_note(result.traceback)
+
+            raise error
+
+        return result.value
+
+    def close(self) -> None:
+        """Stops every idle worker. Calls in flight finish and then stop their worker"""
+
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for worker in idle:
+            worker.kill()
+
+
+_shared: dict[IsolationPolicy, PluginPool] = {}
+_shared_lock = threading.Lock()
+_policy: IsolationPolicy | None = None
+
+
+def configure(policy: IsolationPolicy) -> None:
+    """Replaces the process-wide policy, which otherwise comes from the environment
+
+    Args:
+        policy: The policy
+    """
+
+    global _policy  # pylint: disable=global-statement
+    _policy = policy
+
+
+def isolation_policy() -> IsolationPolicy:
+    """Retrieves the process-wide policy
+
+    Returns:
+        The configured policy, or the one described by the environment
+    """
+
+    return _policy if _policy is not None else IsolationPolicy.from_environment()
+
+
+def shared_pool() -> PluginPool | None:
+    """Retrieves the pool of the process-wide policy, so that every project in the process reuses its workers
+
+    Returns:
+        The pool, or None if isolation is disabled
+    """
+
+    policy = isolation_policy()
+
+    if not policy.enabled:
+        return None
+
+    with _shared_lock:
+        if (pool := _shared.get(policy)) is None:
+            pool = PluginPool(policy)
+            _shared[policy] = pool
+            atexit.register(pool.close)
+
+    return pool
@@ -0,0 +1,156 @@
+"""Advisory file locks shared by every CPPython process on a machine
+
+Locks are taken with 'fcntl.flock' where available, which supports shared (reader) and exclusive (writer) modes.
+Windows falls back to 'msvcrt.locking', which only knows exclusive locks, so shared locks are exclusive there
+"""
+
+import asyncio
+import hashlib
+import sys
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Self
+
+from cppython.cache import cache_directory
+
+_RETRY_INTERVAL = 0.05
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(file: IO[bytes], shared: bool) -> None:  # pylint: disable=unused-argument
+        """Blocks until the first byte of a file is locked. Windows only has exclusive locks
+
+        Args:
+            file: The open lock file
+            shared: Ignored
+        """
+
+        file.seek(0)
+
+        # 'LK_LOCK' gives up after ten seconds, so keep asking
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(_RETRY_INTERVAL)
+
+    def _unlock(file: IO[bytes]) -> None:
+        """Unlocks the first byte of a file
+
+        Args:
+            file: The open lock file
+        """
+
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(file: IO[bytes], shared: bool) -> None:
+        """Blocks until a file is locked
+
+        Args:
+            file: The open lock file
+            shared: Whether to take a shared lock rather than an exclusive one
+        """
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+    def _unlock(file: IO[bytes]) -> None:
+        """Unlocks a file
+
+        Args:
+            file: The open lock file
+        """
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class FileLock:
+    """An advisory lock on a file. Each acquisition opens the file anew, so threads of one process exclude each other
+    just like separate processes do
+    """
+
+    def __init__(self, path: Path, shared: bool = False) -> None:
+        self._path = path
+        self._shared = shared
+        self._file: IO[bytes] | None = None
+
+    @property
+    def path(self) -> Path:
+        """The lock file"""
+        return self._path
+
+    def acquire(self) -> None:
+        """Blocks until the lock is held"""
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(self._path, "a+b")  # pylint: disable=consider-using-with
+
+        try:
+            _lock(file, self._shared)
+        except BaseException:
+            file.close()
+            raise
+
+        self._file = file
+
+    def release(self) -> None:
+        """Releases the lock if it is held"""
+
+        if self._file is None:
+            return
+
+        file, self._file = self._file, None
+
+        try:
+            _unlock(file)
+        finally:
+            file.close()
+
+    def __enter__(self) -> Self:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.release()
+
+    async def __aenter__(self) -> Self:
+        # Waiting happens in a worker thread so the event loop keeps running other steps
+        waiter = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+
+        try:
+            await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The thread can't be interrupted, so the lock is released as soon as it is granted
+            waiter.add_done_callback(lambda _: self.release())
+            raise
+
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.release()
+
+
+def resource_lock(resource: Path, shared: bool = False) -> FileLock:
+    """Creates a lock guarding a file or directory. Lock files live in the cache directory, so that project trees
+    stay clean and every project that shares a resource, such as an install path, shares its lock
+
+    Args:
+        resource: The guarded path
+        shared: Whether the lock is a reader's lock
+
+    Returns:
+        The lock, not yet acquired
+    """
+
+    key = hashlib.sha256(str(resource.absolute()).encode()).hexdigest()
+    return FileLock(cache_directory() / "locks" / f"{key}.lock", shared=shared)
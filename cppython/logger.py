@@ -0,0 +1,104 @@
+"""Process-wide logging setup for CPPython
+
+Records of the 'cppython' logger are handed to a queue, and a single listener thread writes them to stderr, so callers
+never wait on the stream. Each project logs through its own child logger, keyed by the project directory, and its
+messages are prefixed with the project name
+"""
+
+import atexit
+import hashlib
+import logging
+import queue
+from logging import Logger, LogRecord
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from threading import Lock
+
+LOGGER_NAME = "cppython"
+PROJECT_LOGGER_PREFIX = f"{LOGGER_NAME}.project."
+
+levels = [logging.WARNING, logging.INFO, logging.DEBUG]
+
+_listeners: list[QueueListener] = []
+_install_lock = Lock()
+
+# The displayed name of each project logger
+_project_names: dict[str, str] = {}
+
+
+class ProjectFormatter(logging.Formatter):
+    """Prefixes the messages of project loggers with the project name"""
+
+    def format(self, record: LogRecord) -> str:
+        """Formats a record
+
+        Args:
+            record: The log record
+
+        Returns:
+            The formatted message
+        """
+
+        message = super().format(record)
+
+        if (name := _project_names.get(record.name)) is not None:
+            return f"[{name}] {message}"
+
+        return message
+
+
+def install_logging() -> Logger:
+    """Attaches the queue handler to the 'cppython' logger. Only the first call in a process has an effect
+
+    Returns:
+        The 'cppython' logger
+    """
+
+    logger = logging.getLogger(LOGGER_NAME)
+
+    with _install_lock:
+        if not _listeners:
+            records: queue.SimpleQueue[LogRecord] = queue.SimpleQueue()
+
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(ProjectFormatter())
+
+            listener = QueueListener(records, stream_handler, respect_handler_level=True)
+            listener.start()
+
+            # Flush what is still queued when the interpreter exits
+            atexit.register(listener.stop)
+
+            logger.addHandler(QueueHandler(records))
+            _listeners.append(listener)
+
+    return logger
+
+
+def project_logger(directory: Path) -> Logger:
+    """Retrieves the logger of a single project. Projects in directories of the same name, such as workspace
+    members, get loggers of their own, so their verbosity is set independently
+
+    Args:
+        directory: The project directory. Its name is displayed with the project's messages
+
+    Returns:
+        The child logger of 'cppython' for the project
+    """
+
+    key = hashlib.sha256(str(directory.resolve()).encode()).hexdigest()[:16]
+    logger_name = f"{PROJECT_LOGGER_PREFIX}{key}"
+    _project_names[logger_name] = directory.name
+
+    return logging.getLogger(logger_name)
+
+
+def set_verbosity(logger: Logger, verbosity: int) -> None:
+    """Sets the level of a logger from a CLI verbosity count
+
+    Args:
+        logger: The logger
+        verbosity: The number of '-v' flags
+    """
+
+    logger.setLevel(levels[min(verbosity, len(levels) - 1)])
@@ -0,0 +1,199 @@
+"""Dependency-ordered execution of the steps behind the project API"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import cast
+
+from cppython.tracing import span
+
+
+async def call_hook[**P, R](hook: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """Calls a plugin lifecycle hook. Plugins may declare 'install', 'update', 'sync_data' or 'sync' with
+    'async def' to run on the event loop; blocking hooks are moved to a worker thread instead
+
+    Args:
+        hook: The bound plugin method
+        args: The positional arguments of the hook
+        kwargs: The keyword arguments of the hook
+
+    Returns:
+        The result of the hook
+    """
+
+    if inspect.iscoroutinefunction(hook):
+        return cast(R, await hook(*args, **kwargs))  # type: ignore[misc]
+
+    result = await asyncio.to_thread(hook, *args, **kwargs)
+
+    # A blocking wrapper around a coroutine function, such as a decorated async hook
+    if inspect.isawaitable(result):
+        return cast(R, await result)
+
+    return result
+
+
+@dataclass
+class Estimate:
+    """What a step would do if the pipeline ran now"""
+
+    cached: bool
+    detail: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PlannedStep:
+    """A step of a plan. A step counts as cached only if it and every step it depends on are cached"""
+
+    name: str
+    kind: str
+    dependencies: list[str]
+    cached: bool
+    cost: float | None
+    detail: list[str]
+
+
+@dataclass
+class Step:
+    """A unit of work in a pipeline"""
+
+    name: str
+    action: Callable[[], Awaitable[None]]
+    dependencies: list[str] = field(default_factory=list)
+    kind: str = "step"
+    estimate: Callable[[], Estimate] | None = None
+
+
+class Pipeline:
+    """Runs steps on a single event loop, starting each one as soon as the steps it depends on have finished"""
+
+    def __init__(self, logger: Logger) -> None:
+        self._logger = logger
+        self._steps: dict[str, Step] = {}
+        self._durations: dict[str, float] = {}
+
+    @property
+    def steps(self) -> list[Step]:
+        """The steps, in the order they were added"""
+        return list(self._steps.values())
+
+    @property
+    def durations(self) -> dict[str, float]:
+        """The wall time in seconds of each step that finished in the last run"""
+        return dict(self._durations)
+
+    def add(
+        self,
+        name: str,
+        action: Callable[[], Awaitable[None]],
+        dependencies: Sequence[str] = (),
+        kind: str = "step",
+        estimate: Callable[[], Estimate] | None = None,
+    ) -> None:
+        """Adds a step. Dependencies must be added first, which also rules out cycles
+
+        Args:
+            name: The unique step name
+            action: The coroutine function performing the step
+            dependencies: The names of the steps that must finish beforehand
+            kind: The kind of work, such as 'download' or 'install', reported in plans
+            estimate: Predicts, without side effects, whether the step's work is already done. Steps without one
+                always count as work to do
+
+        Raises:
+            ValueError: Raised if the name is taken or a dependency is unknown
+        """
+
+        if name in self._steps:
+            raise ValueError(f"The step '{name}' already exists")
+
+        for dependency in dependencies:
+            if dependency not in self._steps:
+                raise ValueError(f"The step '{name}' depends on the unknown step '{dependency}'")
+
+        self._steps[name] = Step(name, action, list(dependencies), kind, estimate)
+
+    def add_blocking(
+        self,
+        name: str,
+        function: Callable[[], None],
+        dependencies: Sequence[str] = (),
+        kind: str = "step",
+        estimate: Callable[[], Estimate] | None = None,
+    ) -> None:
+        """Adds a step that blocks, running it in a worker thread so independent steps can progress
+
+        Args:
+            name: The unique step name
+            function: The blocking function performing the step
+            dependencies: The names of the steps that must finish beforehand
+            kind: The kind of work, reported in plans
+            estimate: Predicts whether the step's work is already done
+        """
+
+        async def action() -> None:
+            await asyncio.to_thread(function)
+
+        self.add(name, action, dependencies, kind, estimate)
+
+    def plan(self, history: dict[str, float] | None = None) -> list[PlannedStep]:
+        """Predicts what a run would do without running any step
+
+        Args:
+            history: The durations of an earlier run, used as the cost of steps that are not cached
+
+        Returns:
+            The planned steps, in the order they were added
+        """
+
+        history = history or {}
+        planned: dict[str, PlannedStep] = {}
+
+        for step in self._steps.values():
+            estimate = step.estimate() if step.estimate is not None else Estimate(cached=False)
+            cached = estimate.cached and all(planned[dependency].cached for dependency in step.dependencies)
+
+            planned[step.name] = PlannedStep(
+                name=step.name,
+                kind=step.kind,
+                dependencies=list(step.dependencies),
+                cached=cached,
+                cost=0.0 if cached else history.get(step.name),
+                detail=estimate.detail,
+            )
+
+        return list(planned.values())
+
+    async def run(self) -> None:
+        """Runs every step. The first failure cancels the steps still waiting and is raised"""
+
+        tasks: dict[str, asyncio.Task[None]] = {}
+
+        async def run_step(step: Step) -> None:
+            await asyncio.gather(*(tasks[dependency] for dependency in step.dependencies))
+
+            self._logger.debug("Starting step '%s'", step.name)
+            start = time.perf_counter()
+
+            with span(step.name, category="step"):
+                await step.action()
+
+            self._durations[step.name] = time.perf_counter() - start
+            self._logger.debug("Finished step '%s'", step.name)
+
+        self._durations = {}
+
+        for step in self._steps.values():
+            tasks[step.name] = asyncio.create_task(run_step(step), name=step.name)
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
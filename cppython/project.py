@@ -1,42 +1,70 @@
 """Manages data flow to and from plugins"""
 
 import asyncio
-import logging
+import dataclasses
+import functools
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from cppython_core.exceptions import ConfigException
+from cppython_core.plugin_schema.provider import Provider
 from cppython_core.resolution import resolve_model
 from cppython_core.schema import Interface, ProjectConfiguration, PyProject
 
 from cppython.builder import Builder
+from cppython.logger import project_logger
+from cppython.pipeline import Estimate, Pipeline
+from cppython.pyproject import split_providers
 from cppython.schema import API
+from cppython.tracing import span, traced
 
 
 class Project(API):
     """The object that should be constructed at each entry_point"""
 
+    @traced
     def __init__(
-        self, project_configuration: ProjectConfiguration, interface: Interface, pyproject_data: dict[str, Any]
+        self,
+        project_configuration: ProjectConfiguration,
+        interface: Interface,
+        pyproject_data: dict[str, Any] | PyProject,
+        provider_configurations: dict[str, dict[str, Any]] | None = None,
     ) -> None:
+        """Initializes the project
+
+        Args:
+            project_configuration: The project configuration
+            interface: The interface of the caller
+            pyproject_data: The pyproject.toml data, either raw or already validated
+            provider_configurations: The 'tool.cppython.providers' tables. Read from 'pyproject_data' when it is raw
+        """
+
         self._enabled = False
         self._interface = interface
-        self.logger = logging.getLogger("cppython")
+        self.logger = project_logger(project_configuration.pyproject_file.parent)
 
         builder = Builder(project_configuration, self.logger)
 
         self.logger.info("Initializing project")
 
-        try:
-            pyproject = resolve_model(PyProject, pyproject_data)
-        except ConfigException as error:
-            self.logger.error(error, exc_info=True)
-            return
+        if isinstance(pyproject_data, PyProject):
+            pyproject = pyproject_data
+        else:
+            pyproject_data, provider_configurations = split_providers(pyproject_data)
+
+            try:
+                pyproject = resolve_model(PyProject, pyproject_data)
+            except ConfigException as error:
+                self.logger.error(error, exc_info=True)
+                return
 
         if not pyproject.tool or not pyproject.tool.cppython:
             self.logger.warning("The pyproject.toml file doesn't contain the `tool.cppython` table")
             return
 
-        self._data = builder.build(pyproject.project, pyproject.tool.cppython)
+        self._data = builder.build(
+            pyproject.project, pyproject.tool.cppython, provider_configurations=provider_configurations
+        )
 
         self._enabled = True
 
@@ -54,6 +82,23 @@ class Project(API):
     def install(self) -> None:
         """Installs project dependencies
 
+        Raises:
+            Exception: Raised if failed
+        """
+        asyncio.run(self.install_async())
+
+    def update(self) -> None:
+        """Updates project dependencies
+
+        Raises:
+            Exception: Raised if failed
+        """
+        asyncio.run(self.update_async())
+
+    @traced
+    async def install_async(self) -> None:
+        """Installs project dependencies on the running event loop, so that one loop can drive many projects
+
         Raises:
             Exception: Raised if failed
         """
@@ -61,22 +106,16 @@ class Project(API):
             self.logger.info("Skipping install because the project is not enabled")
             return
 
-        self.logger.info("Installing tools")
-        asyncio.run(self._data.download_provider_tools())
+        if self._data.is_current():
+            self.logger.info("Skipping install because nothing changed since the last install")
+            return
 
         self.logger.info("Installing project")
-        self.logger.info("Installing %s provider", self._data.plugins.provider.name())
+        await self._run_pipeline(update=False)
 
-        try:
-            self._data.plugins.provider.install()
-        except Exception as exception:
-            self.logger.error("Provider %s failed to install", self._data.plugins.provider.name())
-            raise exception
-
-        self._data.sync()
-
-    def update(self) -> None:
-        """Updates project dependencies
+    @traced
+    async def update_async(self) -> None:
+        """Updates project dependencies on the running event loop, so that one loop can drive many projects
 
         Raises:
             Exception: Raised if failed
@@ -85,16 +124,165 @@ class Project(API):
             self.logger.info("Skipping update because the project is not enabled")
             return
 
-        self.logger.info("Updating tools")
-        asyncio.run(self._data.download_provider_tools())
-
         self.logger.info("Updating project")
-        self.logger.info("Updating %s provider", self._data.plugins.provider.name())
+        await self._run_pipeline(update=True)
+
+    def plan(self, update: bool = False) -> dict[str, Any]:
+        """Computes what an install or update would do, without doing any of it
+
+        Args:
+            update: Whether to plan an update rather than an install
+
+        Returns:
+            The plan. Each step reports its kind, whether its work is already cached, and its duration in the last
+            run as the cost estimate. Cached steps cost nothing. The total cost is null when any uncached step has
+            no estimate, and 'unknown_steps' counts those steps
+        """
+
+        action = "update" if update else "install"
+
+        if not self._enabled:
+            return {"action": action, "enabled": False, "skipped": True, "cost": 0.0, "unknown_steps": 0, "steps": []}
+
+        # An install of an unchanged project returns before the pipeline runs
+        skipped = not update and self._data.is_current()
+
+        steps = self._create_pipeline(update).plan(self._data.timings())
+
+        if skipped:
+            steps = [dataclasses.replace(step, cached=True, cost=0.0) for step in steps]
+
+        pending = [step for step in steps if not step.cached]
+        unknown_steps = sum(step.cost is None for step in pending)
+
+        return {
+            "action": action,
+            "enabled": True,
+            "skipped": skipped,
+            "cost": None if unknown_steps else sum(step.cost or 0.0 for step in pending),
+            "unknown_steps": unknown_steps,
+            "steps": [dataclasses.asdict(step) for step in steps],
+        }
+
+    async def _run_pipeline(self, update: bool) -> None:
+        """Runs an install or update, then records how long each step took for later plans
+
+        Args:
+            update: Whether the providers should update rather than install
+        """
+
+        pipeline = self._create_pipeline(update)
+        await pipeline.run()
 
         try:
-            self._data.plugins.provider.update()
-        except Exception as exception:
-            self.logger.error("Provider %s failed to update", self._data.plugins.provider.name())
-            raise exception
+            self._data.record_timings(pipeline.durations)
+        except OSError as error:
+            self.logger.warning("The step timings could not be written: %s", error)
+
+    def _create_pipeline(self, update: bool) -> Pipeline:
+        """Lays out the steps of an install or update. Everything runs on one event loop. Asynchronous plugin hooks
+        are awaited and blocking ones are moved to worker threads, so that independent steps overlap
+
+        Args:
+            update: Whether the providers should update rather than install
+
+        Returns:
+            The pipeline
+        """
+
+        pipeline = Pipeline(self.logger)
+
+        # Providers are independent of each other, so each one's tooling and install run concurrently
+        for provider in self._data.plugins.providers:
+            name = provider.name()
+            pipeline.add(
+                f"tooling:{name}",
+                functools.partial(self._data.download_tools, provider),
+                kind="download",
+                estimate=functools.partial(self._data.estimate_tools, provider),
+            )
+            pipeline.add(
+                f"provider:{name}",
+                self._create_provider_step(provider, update),
+                [f"tooling:{name}"],
+                kind="update" if update else "install",
+                estimate=functools.partial(self._estimate_provider, provider, update),
+            )
+
+        provider_steps = [f"provider:{provider.name()}" for provider in self._data.plugins.providers]
+        pipeline.add("sync", self._data.sync_async, provider_steps, kind="sync", estimate=self._data.estimate_sync)
+        pipeline.add_blocking(
+            "state",
+            self._data.record_state,
+            ["sync"],
+            kind="state",
+            estimate=functools.partial(self._estimate_state, update),
+        )
+
+        return pipeline
+
+    def _estimate_provider(self, provider: Provider, update: bool) -> Estimate:
+        """Predicts whether a provider has work to do. Updates always reach the provider
+
+        Args:
+            provider: The provider
+            update: Whether the provider would update rather than install
+
+        Returns:
+            The estimate
+        """
+
+        return Estimate(cached=not update and self._data.provider_current(provider))
+
+    def _estimate_state(self, update: bool) -> Estimate:
+        """Predicts whether the install record has to be written
+
+        Args:
+            update: Whether the plan is for an update
+
+        Returns:
+            The estimate
+        """
+
+        return Estimate(cached=not update and self._data.is_current())
+
+    def _create_provider_step(self, provider: Provider, update: bool) -> Callable[[], Awaitable[None]]:
+        """Creates the pipeline step that installs or updates a single provider
+
+        Args:
+            provider: The provider
+            update: Whether the provider should update rather than install
+
+        Returns:
+            The step action
+        """
+
+        async def run_provider() -> None:
+            """Runs the provider
+
+            Raises:
+                Exception: Raised if the provider failed
+            """
+
+            # Concurrent runs on the same install path take turns. An install that another process finished with
+            # the same inputs while this one waited is reused
+            async with self._data.provider_lock(provider):
+                if not update and self._data.provider_current(provider):
+                    self.logger.info("Skipping the %s provider because its inputs are installed", provider.name())
+                    return
+
+                if update:
+                    self.logger.info("Updating %s provider", provider.name())
+                else:
+                    self.logger.info("Installing %s provider", provider.name())
+
+                try:
+                    with span("update" if update else "install", category=provider.name()):
+                        await self._data.call_plugin(provider, "update" if update else "install")
+                except Exception as exception:
+                    self.logger.error("Provider %s failed to %s", provider.name(), "update" if update else "install")
+                    raise exception
+
+                self._data.record_provider(provider)
 
-        self._data.sync()
+        return run_provider
@@ -0,0 +1,121 @@
+"""Read-only loading of pyproject.toml files, with validated results cached per file revision"""
+
+import tomllib
+from collections.abc import Mapping
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from cppython_core.resolution import resolve_model
+from cppython_core.schema import PyProject
+
+PROVIDERS_KEY = "providers"
+
+_cache: dict[Path, tuple[tuple[int, int], PyProject, dict[str, dict[str, Any]]]] = {}
+_cache_lock = Lock()
+
+
+def read_pyproject(path: Path) -> dict[str, Any]:
+    """Parses a pyproject.toml file without preserving its formatting
+
+    Args:
+        path: The pyproject.toml file
+
+    Returns:
+        The parsed data
+    """
+
+    with open(path, "rb") as file:
+        return tomllib.load(file)
+
+
+def split_providers(pyproject_data: Mapping[str, Any]) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Separates the 'tool.cppython.providers' tables from the rest of the data. The core schema does not know
+    them, so they must be removed before validation. The input is not modified
+
+    Args:
+        pyproject_data: The parsed pyproject.toml
+
+    Returns:
+        The data without the provider tables, and the configuration of each provider keyed by its name
+    """
+
+    tool = pyproject_data.get("tool", {})
+    cppython = tool.get("cppython", {})
+
+    if not isinstance(cppython, Mapping) or PROVIDERS_KEY not in cppython:
+        return dict(pyproject_data), {}
+
+    cppython = dict(cppython)
+    providers = {str(name): dict(table) for name, table in cppython.pop(PROVIDERS_KEY).items()}
+
+    return {**pyproject_data, "tool": {**tool, "cppython": cppython}}, providers
+
+
+def _load(path: Path) -> tuple[PyProject, dict[str, dict[str, Any]]]:
+    """Parses and validates a pyproject.toml file, reusing the previous result while the file is unchanged
+
+    Args:
+        path: The pyproject.toml file
+
+    Returns:
+        The validated pyproject data and the provider tables
+    """
+
+    path = path.resolve()
+    stat = path.stat()
+    revision = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+
+    if cached is not None and cached[0] == revision:
+        return cached[1], cached[2]
+
+    pyproject_data, providers = split_providers(read_pyproject(path))
+    pyproject = resolve_model(PyProject, pyproject_data)
+
+    with _cache_lock:
+        _cache[path] = (revision, pyproject, providers)
+
+    return pyproject, providers
+
+
+def load_pyproject(path: Path) -> PyProject:
+    """Parses and validates a pyproject.toml file. The result is shared until the file's modification time or size
+    changes, so callers must treat it as read-only
+
+    Args:
+        path: The pyproject.toml file
+
+    Raises:
+        ConfigException: Raised if the file does not validate
+
+    Returns:
+        The validated pyproject data
+    """
+
+    return _load(path)[0]
+
+
+def load_providers(path: Path) -> dict[str, dict[str, Any]]:
+    """Reads the 'tool.cppython.providers' tables of a pyproject.toml file, sharing the cache of 'load_pyproject'
+
+    Args:
+        path: The pyproject.toml file
+
+    Raises:
+        ConfigException: Raised if the file does not validate
+
+    Returns:
+        The configuration of each provider keyed by its name. Empty if the project uses a single provider
+    """
+
+    return _load(path)[1]
+
+
+def clear_pyproject_cache() -> None:
+    """Forgets every cached pyproject.toml file"""
+
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,184 @@
+"""Machine-readable descriptions of a project for the 'info' and 'list' commands
+
+Descriptions are assembled from the build snapshot and the records that installs leave behind, so describing an
+unchanged project neither imports its generator and providers nor hashes its tooling
+"""
+
+from logging import Logger
+from typing import Any
+
+from cppython_core.schema import ProjectConfiguration, PyProject
+
+from cppython.builder import Builder
+from cppython.discovery import PluginRecord, PluginRegistry
+from cppython.state import (
+    STATE_FILE_NAME,
+    TIMINGS_FILE_NAME,
+    StateFile,
+    TimingsFile,
+    fingerprint_state,
+)
+from cppython.sync import SYNC_FILE_NAME, OutputWatch, SyncFile
+from cppython.tooling import ToolingCache
+
+
+def _describe_record(record: PluginRecord) -> dict[str, Any]:
+    """Describes a selected plugin
+
+    Args:
+        record: The plugin record
+
+    Returns:
+        The description
+    """
+
+    return record.model_dump(mode="json", include={"name", "distribution", "version"})
+
+
+def describe_project(
+    project_configuration: ProjectConfiguration,
+    pyproject: PyProject,
+    logger: Logger,
+    provider_configurations: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Describes the resolved plugins, paths, cache state and last timings of a project
+
+    Args:
+        project_configuration: The project configuration
+        pyproject: The validated pyproject.toml data
+        logger: The logger
+        provider_configurations: The 'tool.cppython.providers' tables
+
+    Returns:
+        The JSON-compatible description
+    """
+
+    pyproject_file = project_configuration.pyproject_file
+
+    if not pyproject.tool or not pyproject.tool.cppython:
+        return {"pyproject_file": str(pyproject_file), "enabled": False}
+
+    cppython_local_configuration = pyproject.tool.cppython
+    provider_configurations = provider_configurations or {}
+
+    builder = Builder(project_configuration, logger)
+    snapshot, reused = builder.snapshot(pyproject.project, cppython_local_configuration, provider_configurations)
+
+    cppython_data = snapshot.core_data.cppython_data
+    providers = snapshot.providers or [snapshot.provider]
+
+    fingerprint = fingerprint_state(
+        snapshot.core_data,
+        cppython_local_configuration,
+        [snapshot.generator, *providers, snapshot.scm],
+        provider_configurations,
+    )
+    state = StateFile(cppython_data.tool_path / STATE_FILE_NAME).read()
+
+    tooling_cache = ToolingCache()
+    tooling: list[dict[str, Any]] = []
+
+    for record in providers:
+        path = cppython_data.install_path / record.name
+        manifest = tooling_cache.read_manifest(path)
+
+        tooling.append(
+            {
+                "provider": record.name,
+                "path": str(path),
+                "present": manifest is not None and manifest.version == record.version,
+                "stored": tooling_cache.stored(record.name, record.version),
+            }
+        )
+
+    sync_state = SyncFile(cppython_data.tool_path / SYNC_FILE_NAME).read()
+
+    return {
+        "pyproject_file": str(pyproject_file),
+        "enabled": True,
+        "project": snapshot.pep621_data.model_dump(mode="json"),
+        "plugins": {
+            "generator": _describe_record(snapshot.generator),
+            "providers": [_describe_record(record) for record in providers],
+            "scm": _describe_record(snapshot.scm),
+        },
+        "paths": {
+            "root": str(pyproject_file.parent),
+            "tool": str(cppython_data.tool_path),
+            "install": str(cppython_data.install_path),
+        },
+        "cache": {
+            "snapshot": reused,
+            "installed": state is not None,
+            "current": state is not None
+            and state.fingerprint == fingerprint
+            and all(entry["present"] for entry in tooling),
+            "tooling": tooling,
+            "sync": {
+                "recorded": sync_state is not None,
+                "intact": sync_state is not None and OutputWatch.intact(sync_state.outputs),
+                "outputs": sorted(sync_state.outputs) if sync_state is not None else [],
+            },
+        },
+        "timings": TimingsFile(cppython_data.tool_path / TIMINGS_FILE_NAME).read().durations,
+    }
+
+
+def list_plugins(logger: Logger, description: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    """Lists the installed plugins from the plugin index, without importing any of them
+
+    Args:
+        logger: The logger
+        description: The project description, used to mark the plugins the project selected
+
+    Returns:
+        The JSON-compatible plugin descriptions, in discovery order
+    """
+
+    selected: set[tuple[str, str]] = set()
+
+    if description is not None and description.get("enabled"):
+        plugins = description["plugins"]
+        selected.add(("generator", plugins["generator"]["name"]))
+        selected.add(("scm", plugins["scm"]["name"]))
+        selected.update(("provider", provider["name"]) for provider in plugins["providers"])
+
+    return [
+        record.model_dump(mode="json", include={"group", "name", "distribution", "version"})
+        | {"selected": (record.group, record.name) in selected}
+        for record in PluginRegistry.shared(logger).index.records
+    ]
+
+
+def format_report(data: Any, indent: int = 0) -> list[str]:
+    """Lays out a description as indented text
+
+    Args:
+        data: The JSON-compatible description
+        indent: The indentation of the first level
+
+    Returns:
+        The lines
+    """
+
+    prefix = "  " * indent
+    lines: list[str] = []
+
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, dict | list) and value:
+                lines.append(f"{prefix}{key}:")
+                lines.extend(format_report(value, indent + 1))
+            else:
+                lines.append(f"{prefix}{key}: {value}")
+    elif isinstance(data, list):
+        for value in data:
+            if isinstance(value, dict | list):
+                lines.append(f"{prefix}-")
+                lines.extend(format_report(value, indent + 1))
+            else:
+                lines.append(f"{prefix}- {value}")
+    else:
+        lines.append(f"{prefix}{data}")
+
+    return lines
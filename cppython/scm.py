@@ -0,0 +1,202 @@
+"""Memoization of source control queries, shared by every build in the process"""
+
+import os
+from pathlib import Path
+from typing import ClassVar
+
+from cppython_core.plugin_schema.scm import SCM
+from pydantic import BaseModel, ValidationError
+
+from cppython.cache import cache_directory, write_atomic
+from cppython.discovery import PluginHandle
+
+PERSIST_VARIABLE = "CPPYTHON_PERSIST_SCM_CACHE"
+
+
+def _find_repository(root: Path) -> Path | None:
+    """Locates the git metadata directory that owns a path
+
+    Args:
+        root: The project root
+
+    Returns:
+        The git directory, or None if the path is not inside a git repository
+    """
+
+    for directory in (root, *root.parents):
+        candidate = directory / ".git"
+
+        if candidate.is_dir():
+            return candidate
+
+        # Worktrees and submodules point at their metadata from a file
+        if candidate.is_file():
+            content = candidate.read_text(encoding="utf-8").strip()
+            if content.startswith("gitdir:"):
+                return (directory / content.removeprefix("gitdir:").strip()).resolve()
+
+    return None
+
+
+def _modified(path: Path) -> int:
+    """Reads a modification time, treating missing files as never modified
+
+    Args:
+        path: The file to stat
+
+    Returns:
+        The modification time in nanoseconds
+    """
+
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def repository_state(root: Path) -> str:
+    """Summarizes the repository metadata of a project root so that cached answers can be invalidated
+
+    Checkouts, commits and tags all replace one of the stat'ed files. Roots outside of any repository are keyed on
+    the directory itself so that a later 'git init' is noticed
+
+    Args:
+        root: The project root
+
+    Returns:
+        A string that changes whenever the repository state does
+    """
+
+    if (git_directory := _find_repository(root)) is None:
+        return f"none:{_modified(root)}"
+
+    head = git_directory / "HEAD"
+
+    try:
+        head_content = head.read_text(encoding="utf-8").strip()
+    except OSError:
+        head_content = ""
+
+    stamps = [head_content, str(_modified(head))]
+
+    if head_content.startswith("ref:"):
+        stamps.append(str(_modified(git_directory / head_content.removeprefix("ref:").strip())))
+
+    for name in ("index", "packed-refs", "refs/tags"):
+        stamps.append(str(_modified(git_directory / name)))
+
+    return f"{git_directory}:{':'.join(stamps)}"
+
+
+class SCMCacheEntry(BaseModel):
+    """The cached answers of one SCM plugin for one project root"""
+
+    state: str
+    repository: bool | None = None
+    version: str | None = None
+
+
+class SCMCacheData(BaseModel):
+    """The persisted form of the SCM cache"""
+
+    entries: dict[str, SCMCacheEntry] = {}
+
+
+class SCMCache:
+    """Caches SCM feature probes and version lookups, keyed on the project root and its repository state"""
+
+    _shared: ClassVar["SCMCache | None"] = None
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._data = SCMCacheData()
+
+        if path is not None:
+            try:
+                self._data = SCMCacheData.model_validate_json(path.read_bytes())
+            except (OSError, ValidationError):
+                pass
+
+    @classmethod
+    def shared(cls) -> "SCMCache":
+        """Retrieves the process-wide cache. It is persisted when 'CPPYTHON_PERSIST_SCM_CACHE' is set
+
+        Returns:
+            The shared cache
+        """
+
+        if cls._shared is None:
+            path = cache_directory() / "scm.json" if os.environ.get(PERSIST_VARIABLE) else None
+            cls._shared = cls(path)
+
+        return cls._shared
+
+    def _entry(self, scm_name: str, root: Path) -> SCMCacheEntry:
+        """Looks up the entry of a plugin and root, discarding it if the repository has changed
+
+        Args:
+            scm_name: The SCM plugin name
+            root: The project root
+
+        Returns:
+            The current entry
+        """
+
+        key = f"{scm_name}:{root}"
+        state = repository_state(root)
+
+        entry = self._data.entries.get(key)
+        if entry is None or entry.state != state:
+            entry = SCMCacheEntry(state=state)
+            self._data.entries[key] = entry
+
+        return entry
+
+    def _save(self) -> None:
+        """Persists the cache, if persistence is enabled"""
+
+        if self._path is None:
+            return
+
+        try:
+            write_atomic(self._path, self._data.model_dump_json())
+        except OSError:
+            pass
+
+    def supports(self, scm: PluginHandle[SCM], root: Path) -> bool:
+        """Queries whether an SCM plugin manages the given root, importing and probing the plugin only on a cache miss
+
+        Args:
+            scm: The SCM plugin handle
+            root: The project root
+
+        Returns:
+            The query result
+        """
+
+        entry = self._entry(scm.name(), root)
+
+        if entry.repository is None:
+            entry.repository = scm.load().features(root).repository
+            self._save()
+
+        return entry.repository
+
+    def version(self, scm: SCM, root: Path) -> str:
+        """Queries the project version from an SCM plugin, asking the plugin only on a cache miss
+
+        Args:
+            scm: The SCM plugin
+            root: The project root
+
+        Returns:
+            The version
+        """
+
+        entry = self._entry(scm.name(), root)
+
+        if entry.version is None:
+            entry.version = scm.version(root)
+            self._save()
+
+        return entry.version
@@ -0,0 +1,122 @@
+"""Snapshots of fully resolved builds, so that unchanged projects skip every resolution step"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from cppython_core.schema import (
+    CoreData,
+    CPPythonGlobalConfiguration,
+    CPPythonLocalConfiguration,
+    PEP621Configuration,
+    PEP621Data,
+    ProjectConfiguration,
+)
+from pydantic import BaseModel, ValidationError
+
+from cppython.cache import cache_directory, write_atomic
+from cppython.discovery import PluginRecord, environment_fingerprint
+from cppython.scm import repository_state
+
+SNAPSHOT_VERSION = 2
+
+
+def fingerprint_build(
+    project_configuration: ProjectConfiguration,
+    pep621_configuration: PEP621Configuration,
+    cppython_local_configuration: CPPythonLocalConfiguration,
+    global_configuration: CPPythonGlobalConfiguration,
+    provider_configurations: dict[str, dict[str, Any]] | None = None,
+) -> str:
+    """Hashes every input of a build: the configuration read from pyproject.toml, the global configuration, the
+    installed plugin set and the state of the project's repository
+
+    Args:
+        project_configuration: The project configuration
+        pep621_configuration: The PEP621 configuration
+        cppython_local_configuration: The local configuration
+        global_configuration: The global configuration
+        provider_configurations: The 'tool.cppython.providers' tables
+
+    Returns:
+        The fingerprint
+    """
+
+    content = {
+        "version": SNAPSHOT_VERSION,
+        # Output settings such as verbosity and debug don't change the resolution
+        "project": project_configuration.model_dump(mode="json", include={"pyproject_file", "version"}),
+        "pep621": pep621_configuration.model_dump(mode="json"),
+        "cppython": cppython_local_configuration.model_dump(mode="json"),
+        "global": global_configuration.model_dump(mode="json"),
+        "providers": provider_configurations or {},
+        "plugins": environment_fingerprint(),
+        "scm": repository_state(project_configuration.pyproject_file.parent),
+    }
+
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+class BuildSnapshot(BaseModel):
+    """The resolved results of a build"""
+
+    fingerprint: str
+    core_data: CoreData
+    pep621_data: PEP621Data
+    generator: PluginRecord
+    provider: PluginRecord
+    scm: PluginRecord
+    providers: list[PluginRecord] = []
+
+
+class SnapshotStore:
+    """Keeps the latest build snapshot of each project"""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory if directory is not None else cache_directory() / "snapshots"
+
+    def path(self, pyproject_file: Path) -> Path:
+        """Locates the snapshot of a project
+
+        Args:
+            pyproject_file: The project's pyproject.toml file
+
+        Returns:
+            The snapshot file
+        """
+
+        key = hashlib.sha256(str(pyproject_file.resolve()).encode()).hexdigest()
+        return self._directory / f"{key}.json"
+
+    def read(self, pyproject_file: Path, fingerprint: str) -> BuildSnapshot | None:
+        """Reads the snapshot of a project if it was taken from the same inputs
+
+        Args:
+            pyproject_file: The project's pyproject.toml file
+            fingerprint: The fingerprint of the current build inputs
+
+        Returns:
+            The snapshot, or None if it is missing or stale. Snapshots whose directories no longer exist fail
+            validation and count as missing
+        """
+
+        try:
+            snapshot = BuildSnapshot.model_validate_json(self.path(pyproject_file).read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+        if snapshot.fingerprint != fingerprint:
+            return None
+
+        return snapshot
+
+    def write(self, pyproject_file: Path, snapshot: BuildSnapshot) -> None:
+        """Records the snapshot of a project
+
+        Args:
+            pyproject_file: The project's pyproject.toml file
+            snapshot: The snapshot
+        """
+
+        write_atomic(self.path(pyproject_file), snapshot.model_dump_json())
@@ -0,0 +1,132 @@
+"""Tracking of the inputs of the last successful install, so unchanged projects can skip the work"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from cppython_core.schema import CoreData, CPPythonLocalConfiguration
+from pydantic import BaseModel, ValidationError
+
+from cppython.cache import write_atomic
+from cppython.discovery import PluginRecord
+
+STATE_FILE_NAME = "cppython.state.json"
+TIMINGS_FILE_NAME = "cppython.timings.json"
+PROVIDER_STATE_DIRECTORY = "cppython.providers"
+
+
+def fingerprint_state(
+    core_data: CoreData,
+    cppython_local_configuration: CPPythonLocalConfiguration,
+    plugins: list[PluginRecord],
+    provider_configurations: dict[str, dict[str, Any]] | None = None,
+) -> str:
+    """Hashes every input that influences the outcome of an install
+
+    Args:
+        core_data: The resolved configuration data
+        cppython_local_configuration: The 'tool.cppython' configuration
+        plugins: The selected plugins
+        provider_configurations: The 'tool.cppython.providers' tables
+
+    Returns:
+        The fingerprint
+    """
+
+    content = {
+        # Output settings don't change what gets installed
+        "core_data": core_data.model_dump(mode="json", exclude={"project_data": {"verbosity", "debug"}}),
+        "configuration": cppython_local_configuration.model_dump(mode="json"),
+        "plugins": [[plugin.group, plugin.name, plugin.target, plugin.version] for plugin in plugins],
+        "providers": provider_configurations or {},
+    }
+
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+class InstallState(BaseModel):
+    """The persisted record of the last successful install"""
+
+    fingerprint: str
+    sync_digest: str | None = None
+
+
+class StateFile:
+    """The state file of a single project"""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        """The location of the state file"""
+        return self._path
+
+    def read(self) -> InstallState | None:
+        """Reads the recorded state
+
+        Returns:
+            The state, or None if no install was recorded
+        """
+
+        try:
+            return InstallState.model_validate_json(self._path.read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    def write(self, state: InstallState) -> None:
+        """Records the state
+
+        Args:
+            state: The state of the completed install
+        """
+
+        write_atomic(self._path, state.model_dump_json())
+
+    def clear(self) -> None:
+        """Forgets the recorded state, so the next install does the full work"""
+
+        self._path.unlink(missing_ok=True)
+
+
+class StepTimings(BaseModel):
+    """The durations of the install steps of a project, as last measured"""
+
+    durations: dict[str, float] = {}
+
+
+class TimingsFile:
+    """The step timings of a single project"""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        """The location of the timings file"""
+        return self._path
+
+    def read(self) -> StepTimings:
+        """Reads the recorded timings
+
+        Returns:
+            The timings, empty if none were recorded
+        """
+
+        try:
+            return StepTimings.model_validate_json(self._path.read_bytes())
+        except (OSError, ValidationError):
+            return StepTimings()
+
+    def update(self, durations: dict[str, float]) -> None:
+        """Records the durations of a run, keeping those of steps that did not run
+
+        Args:
+            durations: The step durations in seconds
+        """
+
+        timings = self.read()
+        timings.durations.update(durations)
+
+        write_atomic(self._path, timings.model_dump_json())
@@ -0,0 +1,198 @@
+"""Skipping of generator syncs whose inputs are unchanged
+
+Generator outputs such as CMake presets feed the downstream build, which reconfigures whenever they are touched. The
+sync data of the last sync is hashed and persisted along with stamps of the files the generator wrote, so that an
+unchanged sync is skipped, and a rewrite that produced identical content keeps the file's old modification time
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from cppython_core.schema import SyncData
+from pydantic import BaseModel, ValidationError
+
+from cppython.cache import write_atomic
+from cppython.tooling import FileStamp, stamp_file
+
+SYNC_FILE_NAME = "cppython.sync.json"
+
+
+def sync_digest(generator_name: str, sync_data: Sequence[SyncData]) -> str:
+    """Hashes the input of a generator sync
+
+    Args:
+        generator_name: The generator receiving the data
+        sync_data: The sync data of every provider, in the order it is passed to the generator
+
+    Returns:
+        The digest
+    """
+
+    content = [
+        generator_name,
+        *([f"{type(data).__module__}.{type(data).__qualname__}", data.model_dump(mode="json")] for data in sync_data),
+    ]
+
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+class SyncState(BaseModel):
+    """The persisted record of the last generator sync"""
+
+    digest: str
+    outputs: dict[str, FileStamp] = {}
+
+
+class OutputWatch:
+    """Watches the files a generator may write: the files at the top of the project root, and everything below the
+    tool directory except CPPython's own records. Only files that a sync changed are ever read
+    """
+
+    def __init__(self, root: Path, tool_path: Path, excluded: Sequence[Path] = ()) -> None:
+        self._root = root
+        self._tool_path = tool_path
+        self._excluded = [path.absolute() for path in excluded]
+
+    def _files(self) -> Iterator[Path]:
+        """Lists the watched files
+
+        Yields:
+            The absolute path of each watched file
+        """
+
+        candidates: list[Path] = []
+
+        if self._root.is_dir():
+            candidates.extend(self._root.iterdir())
+
+        if self._tool_path.is_dir():
+            candidates.extend(self._tool_path.rglob("*"))
+
+        for path in candidates:
+            path = path.absolute()
+
+            if path.is_file() and not any(path == excluded or excluded in path.parents for excluded in self._excluded):
+                yield path
+
+    def survey(self) -> dict[str, tuple[int, int]]:
+        """Reads the size and modification time of every watched file, without reading the files themselves
+
+        Returns:
+            The size and modification time in nanoseconds, keyed by absolute POSIX path
+        """
+
+        survey: dict[str, tuple[int, int]] = {}
+
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            survey[path.as_posix()] = (stat.st_size, stat.st_mtime_ns)
+
+        return survey
+
+    @staticmethod
+    def intact(outputs: dict[str, FileStamp]) -> bool:
+        """Queries whether recorded outputs are still exactly as the generator left them. Only file metadata is read
+
+        Args:
+            outputs: The recorded outputs
+
+        Returns:
+            The query result
+        """
+
+        for path, stamp in outputs.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+
+            if stat.st_size != stamp.size or stat.st_mtime_ns != stamp.modified:
+                return False
+
+        return True
+
+    @staticmethod
+    def settle(
+        previous: dict[str, FileStamp], before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]
+    ) -> dict[str, FileStamp]:
+        """Stamps the outputs of a sync. Only files whose size or modification time the sync changed are hashed. An
+        earlier output that was rewritten with its recorded content gets its old modification time back, while other
+        files are never rolled back, since their content before the sync is unknown
+
+        Args:
+            previous: The outputs recorded by the last sync
+            before: The survey taken before the sync
+            after: The survey taken after the sync
+
+        Returns:
+            The stamps of the files the sync wrote and of the earlier outputs it left alone, as they are on disk now
+        """
+
+        outputs: dict[str, FileStamp] = {}
+
+        for path, metadata in after.items():
+            old = previous.get(path)
+
+            try:
+                if metadata == before.get(path):
+                    # Earlier outputs that this sync left alone are still the generator's
+                    if old is not None:
+                        outputs[path] = stamp_file(Path(path), old)
+                    continue
+
+                stamp = stamp_file(Path(path))
+            except OSError:
+                continue
+
+            if old is not None and before.get(path) == (old.size, old.modified) and old.sha256 == stamp.sha256:
+                os.utime(path, ns=(os.stat(path).st_atime_ns, old.modified))
+                stamp = old
+
+            outputs[path] = stamp
+
+        return outputs
+
+
+class SyncFile:
+    """The sync record of a single project"""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        """The location of the sync record"""
+        return self._path
+
+    def read(self) -> SyncState | None:
+        """Reads the recorded sync
+
+        Returns:
+            The state, or None if no sync was recorded
+        """
+
+        try:
+            return SyncState.model_validate_json(self._path.read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    def write(self, state: SyncState) -> None:
+        """Records a sync
+
+        Args:
+            state: The state of the completed sync
+        """
+
+        write_atomic(self._path, state.model_dump_json())
+
+    def clear(self) -> None:
+        """Forgets the recorded sync, so the next one reaches the generator"""
+
+        self._path.unlink(missing_ok=True)
@@ -0,0 +1,343 @@
+"""Caching of downloaded provider tooling, both per install directory and in the machine-wide artifact store"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from cppython.artifacts import REFERENCE_NAME, ArtifactStore, hash_file
+from cppython.cache import cache_directory, write_atomic
+from cppython.locking import FileLock
+
+MANIFEST_NAME = ".cppython-tooling.json"
+
+DEFAULT_MAX_SIZE = 5 * 1024**3
+DEFAULT_MAX_AGE = 90 * 24 * 60 * 60
+
+
+class FileStamp(BaseModel):
+    """The recorded identity of a single tooling file"""
+
+    size: int
+    modified: int
+    sha256: str
+
+
+class ToolingManifest(BaseModel):
+    """Describes the tooling downloaded into a directory"""
+
+    provider: str
+    version: str | None
+    digest: str
+    files: dict[str, FileStamp]
+
+
+class StoreEntry(BaseModel):
+    """A tooling tree in the machine-wide artifact store"""
+
+    size: int
+    last_used: float
+
+
+class StoreIndex(BaseModel):
+    """The provider versions whose tooling the artifact store holds, keyed to their tree digests"""
+
+    keys: dict[str, str] = {}
+    entries: dict[str, StoreEntry] = {}
+
+
+def stamp_file(path: Path, previous: FileStamp | None = None) -> FileStamp:
+    """Stamps a single file. The previous stamp is reused without reading the file if its size and modification
+    time are unchanged
+
+    Args:
+        path: The file
+        previous: The stamp of an earlier scan
+
+    Returns:
+        The stamp
+    """
+
+    stat = path.stat()
+
+    if previous is not None and previous.size == stat.st_size and previous.modified == stat.st_mtime_ns:
+        return previous
+
+    return FileStamp(size=stat.st_size, modified=stat.st_mtime_ns, sha256=hash_file(path))
+
+
+def scan_directory(directory: Path, previous: dict[str, FileStamp] | None = None) -> dict[str, FileStamp]:
+    """Stamps every file of a tooling directory. Files whose size and modification time are unchanged since the
+    previous scan keep their recorded hash instead of being read again
+
+    Args:
+        directory: The tooling directory
+        previous: The stamps of an earlier scan
+
+    Returns:
+        The stamps, keyed by POSIX path relative to the directory
+    """
+
+    previous = previous or {}
+    files: dict[str, FileStamp] = {}
+
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.name in (MANIFEST_NAME, REFERENCE_NAME):
+            continue
+
+        relative = path.relative_to(directory).as_posix()
+        files[relative] = stamp_file(path, previous.get(relative))
+
+    return files
+
+
+def directory_digest(files: dict[str, FileStamp]) -> str:
+    """Derives the content address of a tooling tree
+
+    Args:
+        files: The file stamps of the tree
+
+    Returns:
+        The digest
+    """
+
+    content = [[relative, stamp.sha256] for relative, stamp in sorted(files.items())]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+class ToolingCache:
+    """Skips tooling downloads that have already happened, here or in another project on the same machine. Tooling
+    is published to the artifact store, and projects link the stored files instead of holding copies
+    """
+
+    def __init__(
+        self,
+        store_path: Path | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_age: float = DEFAULT_MAX_AGE,
+        artifacts: ArtifactStore | None = None,
+    ) -> None:
+        self._store_path = store_path if store_path is not None else cache_directory() / "tooling"
+        self._max_size = max_size
+        self._max_age = max_age
+
+        # A cache with its own store path keeps its own artifacts, which keeps tests and tools apart from the machine.
+        # Tooling is never modified in place, and is released before a download replaces it, so it is hardlinked
+        if artifacts is None:
+            root = self._store_path / "artifacts" if store_path is not None else None
+            artifacts = ArtifactStore(root, hardlink=True)
+
+        self._artifacts = artifacts
+
+    @staticmethod
+    def _key(provider: str, version: str) -> str:
+        """Names a tooling tree in the store index
+
+        Args:
+            provider: The provider name
+            version: The provider version
+
+        Returns:
+            The key
+        """
+
+        return f"{provider}@{version}"
+
+    def _read_index(self) -> StoreIndex:
+        """Reads the store index
+
+        Returns:
+            The index, empty if it does not exist yet
+        """
+
+        try:
+            return StoreIndex.model_validate_json((self._store_path / "index.json").read_bytes())
+        except (OSError, ValidationError):
+            return StoreIndex()
+
+    def _index_lock(self) -> FileLock:
+        """Creates the lock that serializes updates of the store index between processes
+
+        Returns:
+            The exclusive lock, not yet acquired
+        """
+
+        return FileLock(self._store_path / "index.lock")
+
+    def _write_index(self, index: StoreIndex) -> None:
+        """Writes the store index
+
+        Args:
+            index: The index
+        """
+
+        write_atomic(self._store_path / "index.json", index.model_dump_json())
+
+    @staticmethod
+    def read_manifest(directory: Path) -> ToolingManifest | None:
+        """Reads the manifest of a tooling directory
+
+        Args:
+            directory: The tooling directory
+
+        Returns:
+            The manifest, or None if the directory has none
+        """
+
+        try:
+            return ToolingManifest.model_validate_json((directory / MANIFEST_NAME).read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    def is_valid(self, directory: Path, provider: str, version: str | None) -> bool:
+        """Checks that a directory holds complete, unmodified tooling of the given provider version
+
+        Args:
+            directory: The tooling directory
+            provider: The provider name
+            version: The provider version
+
+        Returns:
+            The query result
+        """
+
+        manifest = self.read_manifest(directory)
+
+        if manifest is None or manifest.provider != provider or manifest.version != version:
+            return False
+
+        return directory_digest(scan_directory(directory, manifest.files)) == manifest.digest
+
+    def _stored_digest(self, index: StoreIndex, provider: str, version: str | None) -> str | None:
+        """Looks up the tooling tree of a provider version in the store
+
+        Args:
+            index: The store index
+            provider: The provider name
+            version: The provider version
+
+        Returns:
+            The digest of the tree, or None if the store does not hold it
+        """
+
+        if version is None:
+            return None
+
+        if (digest := index.keys.get(self._key(provider, version))) is None or digest not in index.entries:
+            return None
+
+        if not self._artifacts.has(digest):
+            return None
+
+        return digest
+
+    def stored(self, provider: str, version: str | None) -> bool:
+        """Queries whether the machine-wide store holds a provider version, without restoring it
+
+        Args:
+            provider: The provider name
+            version: The provider version
+
+        Returns:
+            The query result
+        """
+
+        return self._stored_digest(self._read_index(), provider, version) is not None
+
+    def restore(self, directory: Path, provider: str, version: str | None) -> bool:
+        """Links the stored tooling of a provider version into a directory, if the store holds it
+
+        Args:
+            directory: The tooling directory
+            provider: The provider name
+            version: The provider version
+
+        Returns:
+            Whether the tooling was restored
+        """
+
+        if (digest := self._stored_digest(self._read_index(), provider, version)) is None:
+            return False
+
+        if not self._artifacts.checkout(digest, directory):
+            return False
+
+        with self._index_lock():
+            index = self._read_index()
+
+            if (entry := index.entries.get(digest)) is not None:
+                entry.last_used = time.time()
+                self._write_index(index)
+
+        files = scan_directory(directory, None)
+        manifest = ToolingManifest(provider=provider, version=version, digest=directory_digest(files), files=files)
+        write_atomic(directory / MANIFEST_NAME, manifest.model_dump_json())
+
+        return True
+
+    def release(self, directory: Path) -> None:
+        """Unlinks stored tooling from a directory before new tooling is downloaded into it
+
+        Args:
+            directory: The tooling directory
+        """
+
+        self._artifacts.release(directory)
+        (directory / MANIFEST_NAME).unlink(missing_ok=True)
+
+    def record(self, directory: Path, provider: str, version: str | None) -> None:
+        """Publishes freshly downloaded tooling to the artifact store, which replaces the downloaded files with links,
+        and writes the manifest of the directory
+
+        Args:
+            directory: The tooling directory
+            provider: The provider name
+            version: The provider version
+        """
+
+        # Without a version the tooling can't be told apart from other releases of the provider
+        digest = self._artifacts.publish(directory, [MANIFEST_NAME]) if version is not None else None
+
+        # Linking changes modification times, so the directory is stamped afterwards
+        files = scan_directory(directory)
+
+        manifest = ToolingManifest(provider=provider, version=version, digest=directory_digest(files), files=files)
+        write_atomic(directory / MANIFEST_NAME, manifest.model_dump_json())
+
+        if version is None or digest is None:
+            return
+
+        with self._index_lock():
+            index = self._read_index()
+
+            index.keys[self._key(provider, version)] = digest
+            index.entries[digest] = StoreEntry(size=sum(stamp.size for stamp in files.values()), last_used=time.time())
+
+            self.evict(index)
+            self._write_index(index)
+
+    def evict(self, index: StoreIndex) -> None:
+        """Forgets entries that are older than the maximum age, then the least recently used entries until the store
+        fits the maximum size. The artifact store then collects the trees that neither this index nor any project
+        directory still holds
+
+        Args:
+            index: The store index to prune in place
+        """
+
+        now = time.time()
+        by_age = sorted(index.entries.items(), key=lambda item: item[1].last_used)
+        total = sum(entry.size for entry in index.entries.values())
+
+        for digest, entry in by_age:
+            if now - entry.last_used <= self._max_age and total <= self._max_size:
+                break
+
+            del index.entries[digest]
+            total -= entry.size
+
+        index.keys = {key: digest for key, digest in index.keys.items() if digest in index.entries}
+
+        self._artifacts.collect(keep=set(index.entries))
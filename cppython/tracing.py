@@ -0,0 +1,241 @@
+"""Phase-level timing of CPPython runs
+
+Tracing is off by default and costs a single flag check per traced call. It is enabled with the CLI's '--trace'
+option or the 'CPPYTHON_TRACE' environment variable, both naming the file that receives a Chrome trace
+('chrome://tracing' or Perfetto). A summary table is printed to stderr when the process exits. Plugins add their own
+spans with 'span'
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TextIO, cast
+
+TRACE_VARIABLE = "CPPYTHON_TRACE"
+
+
+@dataclass
+class SpanEvent:
+    """A completed span"""
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects spans from every thread of the process"""
+
+    def __init__(self) -> None:
+        self._enabled = False
+        self._path: Path | None = None
+        self._events: list[SpanEvent] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._registered = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being recorded"""
+        return self._enabled
+
+    @property
+    def events(self) -> list[SpanEvent]:
+        """The spans recorded so far"""
+        with self._lock:
+            return list(self._events)
+
+    def enable(self, path: Path | None = None) -> None:
+        """Starts recording spans
+
+        Args:
+            path: The file that receives the Chrome trace when the process exits. No file is written if omitted
+        """
+
+        self._enabled = True
+        self._path = path
+
+        if not self._registered:
+            atexit.register(self.finish)
+            self._registered = True
+
+    def disable(self) -> None:
+        """Stops recording and forgets the recorded spans"""
+
+        self._enabled = False
+        self._path = None
+
+        with self._lock:
+            self._events.clear()
+
+    @contextmanager
+    def span(self, name: str, category: str = "cppython", **args: Any) -> Iterator[None]:
+        """Times the enclosed block
+
+        Args:
+            name: The span name
+            category: The span category, such as 'cppython' or a plugin name
+            args: Additional data shown with the span
+
+        Yields:
+            Nothing
+        """
+
+        if not self._enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            event = SpanEvent(
+                name, category, start - self._origin, time.perf_counter() - start, threading.get_ident(), args
+            )
+
+            with self._lock:
+                self._events.append(event)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Converts the recorded spans to the Chrome trace event format
+
+        Returns:
+            The trace document
+        """
+
+        pid = os.getpid()
+
+        return {
+            "traceEvents": [
+                {
+                    "name": event.name,
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": event.start * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": pid,
+                    "tid": event.thread,
+                    "args": {key: str(value) for key, value in event.args.items()},
+                }
+                for event in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def summary(self) -> str:
+        """Aggregates the recorded spans by name, slowest first
+
+        Returns:
+            The summary table
+        """
+
+        totals: dict[str, list[float]] = {}
+        for event in self.events:
+            totals.setdefault(event.name, []).append(event.duration)
+
+        rows = sorted(totals.items(), key=lambda item: sum(item[1]), reverse=True)
+        width = max((len(name) for name in totals), default=4)
+
+        lines = [f"{'Span':<{width}}  {'Count':>5}  {'Total ms':>10}  {'Max ms':>10}"]
+        for name, durations in rows:
+            lines.append(
+                f"{name:<{width}}  {len(durations):>5}  {sum(durations) * 1e3:>10.2f}  {max(durations) * 1e3:>10.2f}"
+            )
+
+        return "\n".join(lines)
+
+    def finish(self, stream: TextIO | None = None) -> None:
+        """Writes the trace file and prints the summary. Does nothing if tracing is disabled
+
+        Args:
+            stream: Where the summary goes. Defaults to stderr
+        """
+
+        if not self._enabled:
+            return
+
+        if self._path is not None:
+            self._path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+        print(self.summary(), file=stream or sys.stderr)
+
+        self.disable()
+
+
+_tracer = Tracer()
+
+if trace_file := os.environ.get(TRACE_VARIABLE):
+    _tracer.enable(Path(trace_file))
+
+
+def tracer() -> Tracer:
+    """Retrieves the process-wide tracer
+
+    Returns:
+        The tracer
+    """
+
+    return _tracer
+
+
+def span(name: str, category: str = "plugin", **args: Any) -> AbstractContextManager[None]:
+    """Times the enclosed block in the process-wide trace. This is the hook for plugins
+
+    Args:
+        name: The span name
+        category: The span category, typically the plugin name
+        args: Additional data shown with the span
+
+    Returns:
+        The span context manager
+    """
+
+    return _tracer.span(name, category, **args)
+
+
+def traced[**P, R](function: Callable[P, R]) -> Callable[P, R]:
+    """Decorates a function or coroutine function so that each call is a span named after it
+
+    Args:
+        function: The function to trace
+
+    Returns:
+        The traced function
+    """
+
+    name = function.__qualname__
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            if not _tracer.enabled:
+                return await function(*args, **kwargs)  # type: ignore[misc]
+
+            with _tracer.span(name):
+                return await function(*args, **kwargs)  # type: ignore[misc]
+
+        return cast(Callable[P, R], async_wrapper)
+
+    @functools.wraps(function)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        if not _tracer.enabled:
+            return function(*args, **kwargs)
+
+        with _tracer.span(name):
+            return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,153 @@
+"""Management of several CPPython projects that live in one tree"""
+
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Any
+
+from cppython_core.exceptions import ConfigException
+from cppython_core.schema import Interface, ProjectConfiguration, PyProject
+
+from cppython.project import Project
+from cppython.pyproject import load_providers, load_pyproject, read_pyproject
+
+WORKSPACE_TABLE = "cppython-workspace"
+
+
+@dataclass
+class MemberResult:
+    """The outcome of running an API call on one workspace member"""
+
+    pyproject_file: Path
+    success: bool
+    duration: float
+    error: str | None = None
+
+
+def read_member_patterns(pyproject_data: dict[str, Any]) -> list[str]:
+    """Reads the member globs of the 'tool.cppython-workspace' table
+
+    Args:
+        pyproject_data: The parsed root pyproject.toml
+
+    Returns:
+        The member globs, empty if the file declares no workspace
+    """
+
+    table = pyproject_data.get("tool", {}).get(WORKSPACE_TABLE, {})
+    return list(table.get("members", []))
+
+
+def find_members(root: Path, patterns: Sequence[str]) -> list[Path]:
+    """Resolves member globs to the pyproject.toml files of the members
+
+    Args:
+        root: The workspace root directory
+        patterns: Globs relative to the root, matching member directories or their pyproject.toml files
+
+    Returns:
+        The member pyproject.toml files, sorted and without duplicates
+    """
+
+    members: set[Path] = set()
+
+    for pattern in patterns:
+        for match in root.glob(pattern):
+            file = match if match.name == "pyproject.toml" else match / "pyproject.toml"
+            if file.is_file() and file.parent != root:
+                members.add(file.resolve())
+
+    return sorted(members)
+
+
+class Workspace:
+    """Runs the project API across the members of a workspace. Plugin discovery and global configuration are
+    process-wide, so members share them instead of rediscovering per project
+    """
+
+    def __init__(
+        self, members: Sequence[Path], interface: Interface, logger: Logger, verbosity: int = 0, debug: bool = False
+    ) -> None:
+        self._members = list(members)
+        self._interface = interface
+        self._logger = logger
+        self._verbosity = verbosity
+        self._debug = debug
+
+    @property
+    def members(self) -> list[Path]:
+        """The pyproject.toml files of the members"""
+        return self._members
+
+    def _run_member(self, pyproject_file: Path, action: str) -> MemberResult:
+        """Builds a single member project and runs an API call on it
+
+        Args:
+            pyproject_file: The member's pyproject.toml
+            action: The API call, 'install' or 'update'
+
+        Returns:
+            The outcome
+        """
+
+        start = time.perf_counter()
+
+        try:
+            configuration = ProjectConfiguration(
+                pyproject_file=pyproject_file, version=None, verbosity=self._verbosity, debug=self._debug
+            )
+
+            try:
+                pyproject_data: dict[str, Any] | PyProject = load_pyproject(pyproject_file)
+                provider_configurations: dict[str, dict[str, Any]] | None = load_providers(pyproject_file)
+            except ConfigException:
+                # The project reports the validation errors
+                pyproject_data = read_pyproject(pyproject_file)
+                provider_configurations = None
+
+            project = Project(configuration, self._interface, pyproject_data, provider_configurations)
+
+            if action == "install":
+                project.install()
+            else:
+                project.update()
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            self._logger.error("Workspace member %s failed to %s", pyproject_file.parent, action, exc_info=True)
+            return MemberResult(pyproject_file, False, time.perf_counter() - start, str(exception))
+
+        return MemberResult(pyproject_file, True, time.perf_counter() - start)
+
+    def run(self, action: str, jobs: int, report: Callable[[MemberResult], None] | None = None) -> list[MemberResult]:
+        """Runs an API call on every member with a bounded pool of workers
+
+        Args:
+            action: The API call, 'install' or 'update'
+            jobs: The maximum number of members processed at once
+            report: Called with each outcome as soon as it is known
+
+        Raises:
+            ValueError: Raised if the action is not part of the project API
+
+        Returns:
+            The outcomes, in member order
+        """
+
+        if action not in ("install", "update"):
+            raise ValueError(f"Unknown workspace action '{action}'")
+
+        results: dict[Path, MemberResult] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="cppython-workspace") as executor:
+            futures = [executor.submit(self._run_member, member, action) for member in self._members]
+
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.pyproject_file] = result
+
+                if report is not None:
+                    report(result)
+
+        return [results[member] for member in self._members]
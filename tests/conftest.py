@@ -0,0 +1,27 @@
+"""Fixtures shared by every test"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from cppython.cache import CACHE_DIRECTORY_VARIABLE
+
+
+@pytest.fixture(name="cache_directory", scope="session", autouse=True)
+def fixture_cache_directory(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Keeps the machine-wide caches out of reach of the tests. The fixture spans the session, since session scoped
+    fixtures build projects too
+
+    Args:
+        tmp_path_factory: The session's temporary directory factory
+
+    Yields:
+        The cache directory
+    """
+
+    directory = tmp_path_factory.mktemp("cache")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(directory))
+        yield directory
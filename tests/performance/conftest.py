@@ -0,0 +1,157 @@
+"""Fixtures shared by the benchmarks
+
+The benchmarks register synthetic plugins the same way real plugins are installed: a distribution whose metadata
+declares 'cppython.*' entry points, placed on the import path. Each plugin subclasses the matching mock plugin from
+pytest-cppython, so resolution has real candidates to choose from without doing any actual work
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from cppython_core.schema import (
+    CPPythonLocalConfiguration,
+    PEP621Configuration,
+    ProjectConfiguration,
+)
+
+plugin_bases = {
+    "generator": ("pytest_cppython.mock.generator", "MockGenerator", "Generator"),
+    "provider": ("pytest_cppython.mock.provider", "MockProvider", "Provider"),
+    "scm": ("pytest_cppython.mock.scm", "MockSCM", "SCM"),
+}
+
+
+def write_synthetic_plugins(directory: Path, count: int) -> None:
+    """Writes a distribution that registers 'count' plugins of every group
+
+    Args:
+        directory: The import path entry that receives the distribution
+        count: The number of plugins per group
+    """
+
+    module_name = f"cppython_synthetic_{count}"
+
+    source = [f"from {module} import {base}" for module, base, _ in plugin_bases.values()]
+    entry_points: list[str] = []
+
+    for group_name, (_, base, suffix) in plugin_bases.items():
+        entry_points.append(f"[cppython.{group_name}]")
+
+        for index in range(count):
+            class_name = f"Synthetic{index}{suffix}"
+            source.append(f"class {class_name}({base}):\n    pass")
+            entry_points.append(f"synthetic{index} = {module_name}:{class_name}")
+
+    (directory / f"{module_name}.py").write_text("\n\n".join(source) + "\n", encoding="utf-8")
+
+    dist_info = directory / f"{module_name}-0.1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {module_name}\nVersion: 0.1.0\n", encoding="utf-8"
+    )
+    (dist_info / "entry_points.txt").write_text("\n".join(entry_points) + "\n", encoding="utf-8")
+
+
+@pytest.fixture(name="cache_directory", autouse=True)
+def fixture_cache_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keeps the caches of every benchmark apart from the machine-wide ones
+
+    Args:
+        tmp_path: Temporary directory for the caches
+        monkeypatch: The patching fixture
+
+    Returns:
+        The cache directory
+    """
+
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("CPPYTHON_CACHE_DIR", str(directory))
+
+    return directory
+
+
+@pytest.fixture(name="install_plugins")
+def fixture_install_plugins(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Callable[[int], None]:
+    """Installs synthetic plugins for the duration of a test
+
+    Args:
+        tmp_path: Temporary directory for the distribution
+        monkeypatch: The patching fixture
+
+    Returns:
+        A function taking the number of plugins per group
+    """
+
+    def install(count: int) -> None:
+        directory = tmp_path / "site-packages"
+        directory.mkdir()
+
+        write_synthetic_plugins(directory, count)
+        monkeypatch.syspath_prepend(str(directory))
+
+    return install
+
+
+@pytest.fixture(name="pyproject_file")
+def fixture_pyproject_file(tmp_path: Path) -> Path:
+    """Writes a minimal CPPython project
+
+    Args:
+        tmp_path: Temporary directory for the project
+
+    Returns:
+        The pyproject.toml file
+    """
+
+    project = tmp_path / "project"
+    project.mkdir()
+
+    install_path = (tmp_path / "install").as_posix()
+
+    pyproject_file = project / "pyproject.toml"
+    pyproject_file.write_text(
+        f'[project]\nname = "benchmark"\nversion = "0.1.0"\n\n[tool.cppython]\ninstall-path = "{install_path}"\n',
+        encoding="utf-8",
+    )
+
+    return pyproject_file
+
+
+@pytest.fixture(name="project_configuration")
+def fixture_project_configuration(pyproject_file: Path) -> ProjectConfiguration:
+    """The project configuration of the minimal project
+
+    Args:
+        pyproject_file: The pyproject.toml file
+
+    Returns:
+        The project configuration
+    """
+
+    return ProjectConfiguration(pyproject_file=pyproject_file, version=None)
+
+
+@pytest.fixture(name="pep621_configuration")
+def fixture_pep621_configuration() -> PEP621Configuration:
+    """The PEP 621 configuration of the minimal project
+
+    Returns:
+        The PEP 621 configuration
+    """
+
+    return PEP621Configuration(name="benchmark", version="0.1.0")
+
+
+@pytest.fixture(name="cppython_local_configuration")
+def fixture_cppython_local_configuration(tmp_path: Path) -> CPPythonLocalConfiguration:
+    """The CPPython configuration of the minimal project
+
+    Args:
+        tmp_path: Temporary directory for installed tooling
+
+    Returns:
+        The CPPython configuration
+    """
+
+    return CPPythonLocalConfiguration.model_validate({"install-path": tmp_path / "install"})
@@ -0,0 +1,107 @@
+"""Benchmarks the Builder and Resolver types"""
+
+import logging
+from collections.abc import Callable
+
+import pytest
+from cppython_core.resolution import resolve_project_configuration
+from cppython_core.schema import (
+    CPPythonLocalConfiguration,
+    PEP621Configuration,
+    ProjectConfiguration,
+)
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cppython.builder import Builder, Resolver
+from cppython.snapshot import SnapshotStore
+
+
+class TestResolver:
+    """Benchmarks of plugin resolution"""
+
+    @pytest.mark.parametrize("count", [1, 10, 100])
+    def test_generate_plugins(
+        self,
+        benchmark: BenchmarkFixture,
+        install_plugins: Callable[[int], None],
+        project_configuration: ProjectConfiguration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        count: int,
+    ) -> None:
+        """Plugin selection as the number of installed plugins grows
+
+        Args:
+            benchmark: The benchmark fixture
+            install_plugins: Installs synthetic plugins
+            project_configuration: The project configuration
+            cppython_local_configuration: The CPPython configuration
+            count: The number of synthetic plugins per group
+        """
+
+        install_plugins(count)
+
+        resolver = Resolver(project_configuration, logging.getLogger())
+        project_data = resolve_project_configuration(project_configuration)
+
+        assert benchmark(resolver.generate_plugins, cppython_local_configuration, project_data)
+
+
+class TestBuilder:
+    """Benchmarks of project building"""
+
+    def test_build_cold(
+        self,
+        benchmark: BenchmarkFixture,
+        install_plugins: Callable[[int], None],
+        project_configuration: ProjectConfiguration,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+    ) -> None:
+        """A build that has no snapshot to reuse
+
+        Args:
+            benchmark: The benchmark fixture
+            install_plugins: Installs synthetic plugins
+            project_configuration: The project configuration
+            pep621_configuration: The PEP 621 configuration
+            cppython_local_configuration: The CPPython configuration
+        """
+
+        install_plugins(10)
+
+        builder = Builder(project_configuration, logging.getLogger())
+        snapshot_file = SnapshotStore().path(project_configuration.pyproject_file)
+
+        def forget_snapshot() -> None:
+            snapshot_file.unlink(missing_ok=True)
+
+        benchmark.pedantic(
+            builder.build, (pep621_configuration, cppython_local_configuration), setup=forget_snapshot, rounds=20
+        )
+
+    def test_build_warm(
+        self,
+        benchmark: BenchmarkFixture,
+        install_plugins: Callable[[int], None],
+        project_configuration: ProjectConfiguration,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+    ) -> None:
+        """A build served from the snapshot of an identical earlier build
+
+        Args:
+            benchmark: The benchmark fixture
+            install_plugins: Installs synthetic plugins
+            project_configuration: The project configuration
+            pep621_configuration: The PEP 621 configuration
+            cppython_local_configuration: The CPPython configuration
+        """
+
+        install_plugins(10)
+
+        builder = Builder(project_configuration, logging.getLogger())
+        builder.build(pep621_configuration, cppython_local_configuration)
+
+        assert SnapshotStore().path(project_configuration.pyproject_file).exists()
+
+        benchmark(builder.build, pep621_configuration, cppython_local_configuration)
@@ -0,0 +1,26 @@
+"""Benchmarks the CLI"""
+
+import subprocess
+import sys
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+
+class TestInterface:
+    """Benchmarks of the CLI startup"""
+
+    def test_startup(self, benchmark: BenchmarkFixture) -> None:
+        """A fresh interpreter printing the CLI help, which is the floor of every command
+
+        Args:
+            benchmark: The benchmark fixture
+        """
+
+        def run() -> None:
+            subprocess.run(
+                [sys.executable, "-c", "from cppython.console.interface import cli; cli(['--help'])"],
+                capture_output=True,
+                check=True,
+            )
+
+        benchmark.pedantic(run, rounds=10, warmup_rounds=1)
@@ -0,0 +1,83 @@
+"""Benchmarks the Project type"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from cppython_core.schema import ProjectConfiguration
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_cppython.mock.interface import MockInterface
+
+from cppython.project import Project
+from cppython.pyproject import clear_pyproject_cache, load_pyproject
+
+
+class TestProject:
+    """Benchmarks of the project entry points"""
+
+    @pytest.fixture(name="project")
+    def fixture_project(
+        self, install_plugins: Callable[[int], None], project_configuration: ProjectConfiguration
+    ) -> Project:
+        """A project resolved against the synthetic plugins
+
+        Args:
+            install_plugins: Installs synthetic plugins
+            project_configuration: The project configuration
+
+        Returns:
+            The enabled project
+        """
+
+        install_plugins(10)
+
+        project = Project(project_configuration, MockInterface(), load_pyproject(project_configuration.pyproject_file))
+        assert project.enabled
+
+        return project
+
+    def test_construction(
+        self,
+        benchmark: BenchmarkFixture,
+        install_plugins: Callable[[int], None],
+        project_configuration: ProjectConfiguration,
+        pyproject_file: Path,
+    ) -> None:
+        """Loading the pyproject.toml file and constructing the project, as every CLI command does
+
+        Args:
+            benchmark: The benchmark fixture
+            install_plugins: Installs synthetic plugins
+            project_configuration: The project configuration
+            pyproject_file: The pyproject.toml file
+        """
+
+        install_plugins(10)
+
+        def construct() -> Project:
+            clear_pyproject_cache()
+            return Project(project_configuration, MockInterface(), load_pyproject(pyproject_file))
+
+        assert benchmark(construct).enabled
+
+    def test_install(self, benchmark: BenchmarkFixture, project: Project) -> None:
+        """An install whose inputs have not changed since the last one
+
+        Args:
+            benchmark: The benchmark fixture
+            project: The enabled project
+        """
+
+        project.install()
+
+        benchmark(project.install)
+
+    def test_update(self, benchmark: BenchmarkFixture, project: Project) -> None:
+        """A full run of the install pipeline
+
+        Args:
+            benchmark: The benchmark fixture
+            project: The enabled project
+        """
+
+        benchmark(project.update)
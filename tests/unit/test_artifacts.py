@@ -0,0 +1,165 @@
+"""Tests the artifact store"""
+
+import os
+import shutil
+import stat
+from pathlib import Path
+
+from cppython.artifacts import ArtifactStore, link_file
+
+
+def _write_tree(directory: Path, content: str) -> Path:
+    """Writes a small directory to publish
+
+    Args:
+        directory: The directory
+        content: The content of its files
+
+    Returns:
+        The directory
+    """
+
+    (directory / "bin").mkdir(parents=True)
+    (directory / "empty").mkdir()
+    (directory / "tool.txt").write_text(content, encoding="utf-8")
+    (directory / "bin" / "run").write_text(f"#!/bin/sh\n# {content}\n", encoding="utf-8")
+    os.chmod(directory / "bin" / "run", 0o755)
+    (directory / "bin" / "tool").symlink_to("../tool.txt")
+
+    return directory
+
+
+class TestArtifactStore:
+    """Various tests for the ArtifactStore type"""
+
+    def test_publish(self, tmp_path: Path) -> None:
+        """Identical directories should publish to one tree, and their files should be shared
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        store = ArtifactStore(tmp_path / "store", hardlink=True)
+
+        first = _write_tree(tmp_path / "first", "tool")
+        second = _write_tree(tmp_path / "second", "tool")
+
+        digest = store.publish(first)
+
+        assert digest is not None
+        assert store.publish(second) == digest
+        assert (first / "tool.txt").read_text(encoding="utf-8") == "tool"
+        assert not (first / "tool.txt").stat().st_mode & stat.S_IWUSR
+        assert os.access(first / "bin" / "run", os.X_OK)
+        assert os.path.samefile(first / "tool.txt", second / "tool.txt")
+
+    def test_publish_without_hardlinks(self, tmp_path: Path) -> None:
+        """Without hardlinks, published directories should be left as they are, and content that can't be cloned
+        should not be stored as a copy
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        store = ArtifactStore(tmp_path / "store")
+
+        first = _write_tree(tmp_path / "first", "tool")
+        second = _write_tree(tmp_path / "second", "tool")
+
+        digest = store.publish(first)
+
+        assert store.publish(second) == digest
+        assert digest is None or store.has(digest)
+        assert (first / "tool.txt").stat().st_mode & stat.S_IWUSR
+        assert not os.path.samefile(first / "tool.txt", second / "tool.txt")
+
+    def test_checkout(self, tmp_path: Path) -> None:
+        """A published tree should be recreated in another directory, including its symlinks and empty directories
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        store = ArtifactStore(tmp_path / "store", hardlink=True)
+        digest = store.publish(_write_tree(tmp_path / "first", "tool"))
+
+        other = tmp_path / "other"
+
+        assert digest is not None
+        assert store.checkout(digest, other)
+        assert (other / "bin" / "run").read_text(encoding="utf-8") == "#!/bin/sh\n# tool\n"
+        assert os.access(other / "bin" / "run", os.X_OK)
+        assert os.readlink(other / "bin" / "tool") == "../tool.txt"
+        assert (other / "empty").is_dir()
+        assert not store.checkout("missing", tmp_path / "missing")
+
+    def test_collect(self, tmp_path: Path) -> None:
+        """Only trees that no directory holds should be collected
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        store = ArtifactStore(tmp_path / "store", hardlink=True)
+
+        kept = store.publish(_write_tree(tmp_path / "kept", "kept"))
+        dropped_directory = _write_tree(tmp_path / "dropped", "dropped")
+        dropped = store.publish(dropped_directory)
+
+        assert kept is not None and dropped is not None
+
+        shutil.rmtree(dropped_directory)
+
+        assert store.collect() > 0
+        assert store.has(kept)
+        assert not store.has(dropped)
+        assert store.checkout(kept, tmp_path / "again")
+
+    def test_release(self, tmp_path: Path) -> None:
+        """Released directories should neither keep their tree alive nor keep links into the store
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        store = ArtifactStore(tmp_path / "store", hardlink=True)
+
+        directory = _write_tree(tmp_path / "directory", "tool")
+        digest = store.publish(directory)
+
+        assert digest is not None
+
+        other = tmp_path / "other"
+        store.checkout(digest, other)
+
+        store.release(directory)
+        store.release(other)
+
+        assert not (directory / "tool.txt").exists()
+        assert not (other / "tool.txt").exists()
+
+        store.collect()
+        assert not store.has(digest)
+
+
+class TestLinkFile:
+    """Various tests for link_file"""
+
+    def test_replace(self, tmp_path: Path) -> None:
+        """Linking should replace an existing file
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        source = tmp_path / "source"
+        source.write_text("new", encoding="utf-8")
+
+        destination = tmp_path / "nested" / "destination"
+        destination.parent.mkdir()
+        destination.write_text("old", encoding="utf-8")
+
+        link_file(source, destination)
+
+        assert destination.read_text(encoding="utf-8") == "new"
+        assert not [path for path in destination.parent.iterdir() if path != destination]
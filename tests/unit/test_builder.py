@@ -1,8 +1,11 @@
 """Tests the Builder and Resolver types"""
 
 import logging
+from pathlib import Path
 
+import pytest
 import pytest_cppython
+from cppython_core.exceptions import PluginError
 from cppython_core.schema import (
     CPPythonLocalConfiguration,
     PEP621Configuration,
@@ -11,6 +14,8 @@ from cppython_core.schema import (
 )
 
 from cppython.builder import Builder, Resolver
+from cppython.discovery import PluginHandle, PluginRecord
+from cppython.snapshot import SnapshotStore
 
 
 class TestBuilder:
@@ -34,6 +39,77 @@ class TestBuilder:
 
         assert builder.build(pep621_configuration, cppython_local_configuration)
 
+    def test_build_snapshot(
+        self,
+        project_configuration: ProjectConfiguration,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Verifies that a second build with the same inputs is served from the snapshot
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+            pep621_configuration: Variant fixture for PEP 621 configuration
+            cppython_local_configuration: Variant fixture for cppython configuration
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+        monkeypatch.setenv("CPPYTHON_CACHE_DIR", str(tmp_path))
+
+        builder = Builder(project_configuration, logging.getLogger())
+        builder.build(pep621_configuration, cppython_local_configuration)
+
+        snapshot_file = SnapshotStore().path(project_configuration.pyproject_file)
+        assert snapshot_file.exists()
+
+        # A warm build must not resolve plugins again
+        resolved: list[bool] = []
+        monkeypatch.setattr(Resolver, "generate_plugins", lambda *_: resolved.append(True))
+
+        assert builder.build(pep621_configuration, cppython_local_configuration)
+        assert not resolved
+
+        # Output settings must not invalidate the snapshot
+        verbose_configuration = project_configuration.model_copy(update={"verbosity": 2, "debug": True})
+
+        assert Builder(verbose_configuration, logging.getLogger()).build(
+            pep621_configuration, cppython_local_configuration
+        )
+        assert not resolved
+
+    def test_snapshot(
+        self,
+        project_configuration: ProjectConfiguration,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Verifies that snapshots are taken without creating plugins and are reused afterwards
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+            pep621_configuration: Variant fixture for PEP 621 configuration
+            cppython_local_configuration: Variant fixture for cppython configuration
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+        monkeypatch.setenv("CPPYTHON_CACHE_DIR", str(tmp_path))
+
+        created: list[bool] = []
+        monkeypatch.setattr(Resolver, "create_generator", lambda *_: created.append(True))
+        monkeypatch.setattr(Resolver, "create_provider", lambda *_: created.append(True))
+
+        builder = Builder(project_configuration, logging.getLogger())
+
+        snapshot, reused = builder.snapshot(pep621_configuration, cppython_local_configuration)
+        assert not reused
+
+        assert builder.snapshot(pep621_configuration, cppython_local_configuration) == (snapshot, True)
+        assert not created
+
 
 class TestResolver:
     """Various tests for the Resolver type"""
@@ -55,3 +131,85 @@ class TestResolver:
         resolver = Resolver(project_configuration, logger)
 
         assert resolver.generate_plugins(cppython_local_configuration, project_data)
+
+    def test_solve(self, project_configuration: ProjectConfiguration) -> None:
+        """Verifies that the solver pairs plugins by sync type and honours preferences
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+        """
+        resolver = Resolver(project_configuration, logging.getLogger())
+
+        generators = [
+            PluginHandle(PluginRecord(group="generator", name="orphan", target="a:A", sync_types=["sync.Other"])),
+            PluginHandle(PluginRecord(group="generator", name="gen", target="b:B", sync_types=["sync.Data"])),
+        ]
+        providers = [
+            PluginHandle(
+                PluginRecord(group="provider", name="first", target="c:C", supported_sync_types=["sync.Data"])
+            ),
+            PluginHandle(
+                PluginRecord(group="provider", name="second", target="d:D", supported_sync_types=["sync.Data"])
+            ),
+        ]
+
+        generator, provider = resolver.solve(generators, providers)
+        assert (generator.name(), provider.name()) == ("gen", "first")
+        assert {rejection.generator for rejection in resolver.rejections} == {"orphan"}
+
+        _, provider = resolver.solve(generators, providers, preferences=["second"])
+        assert provider.name() == "second"
+
+        with pytest.raises(PluginError):
+            resolver.solve(generators[:1], providers)
+
+        assert len(resolver.rejections) == len(providers)
+
+    def test_solve_all(self, project_configuration: ProjectConfiguration) -> None:
+        """Verifies that every provider compatible with the chosen generator is selected, best ranked first
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+        """
+        resolver = Resolver(project_configuration, logging.getLogger())
+
+        generators = [
+            PluginHandle(PluginRecord(group="generator", name="gen", target="a:A", sync_types=["sync.A", "sync.B"])),
+        ]
+        providers = [
+            PluginHandle(PluginRecord(group="provider", name="b", target="b:B", supported_sync_types=["sync.B"])),
+            PluginHandle(PluginRecord(group="provider", name="other", target="c:C", supported_sync_types=["x.Y"])),
+            PluginHandle(PluginRecord(group="provider", name="a", target="d:D", supported_sync_types=["sync.A"])),
+        ]
+
+        generator, compatible = resolver.solve_all(generators, providers, preferences=["a"])
+
+        assert generator.name() == "gen"
+        assert [provider.name() for provider in compatible] == ["a", "b"]
+
+    def test_solve_all_required(self, project_configuration: ProjectConfiguration) -> None:
+        """Verifies that a generator working with only some of the required providers is passed over
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+        """
+        resolver = Resolver(project_configuration, logging.getLogger())
+
+        generators = [
+            PluginHandle(PluginRecord(group="generator", name="partial", target="a:A", sync_types=["sync.A"])),
+            PluginHandle(PluginRecord(group="generator", name="full", target="b:B", sync_types=["sync.A", "sync.B"])),
+        ]
+        providers = [
+            PluginHandle(PluginRecord(group="provider", name="a", target="c:C", supported_sync_types=["sync.A"])),
+            PluginHandle(PluginRecord(group="provider", name="b", target="d:D", supported_sync_types=["sync.B"])),
+        ]
+
+        generator, compatible = resolver.solve_all(generators, providers)
+        assert (generator.name(), [provider.name() for provider in compatible]) == ("partial", ["a"])
+
+        generator, compatible = resolver.solve_all(generators, providers, require_all=True)
+        assert (generator.name(), [provider.name() for provider in compatible]) == ("full", ["a", "b"])
+        assert [(rejection.generator, rejection.provider) for rejection in resolver.rejections] == [("partial", "b")]
+
+        with pytest.raises(PluginError):
+            resolver.solve_all(generators[:1], providers, require_all=True)
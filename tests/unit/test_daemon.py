@@ -0,0 +1,98 @@
+"""Tests the daemon and its client"""
+
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from cppython.client import DaemonClient, socket_path
+from cppython.daemon import Daemon
+
+
+class TestDaemon:
+    """Various tests for the Daemon type"""
+
+    @pytest.fixture(name="daemon")
+    def fixture_daemon(self, tmp_path: Path) -> Iterator[Daemon]:
+        """Runs a daemon on a background thread for the duration of a test
+
+        Args:
+            tmp_path: Temporary directory for the socket
+
+        Yields:
+            The running daemon
+        """
+
+        daemon = Daemon(logging.getLogger(), tmp_path / "daemon.sock")
+        thread = threading.Thread(target=daemon.run, daemon=True)
+        thread.start()
+
+        client = DaemonClient(daemon.path, timeout=10)
+        while not client.available():
+            assert thread.is_alive()
+            time.sleep(0.01)
+
+        yield daemon
+
+        if client.available():
+            client.request({"command": "stop"})
+
+        thread.join(timeout=10)
+
+    def test_status(self, daemon: Daemon) -> None:
+        """A running daemon should answer requests and stop on demand
+
+        Args:
+            daemon: The running daemon
+        """
+
+        client = DaemonClient(daemon.path, timeout=10)
+
+        assert client.request({"command": "status"})["success"]
+        assert not client.request({"command": "unknown"})["success"]
+
+        assert client.request({"command": "stop"})["success"]
+
+    def test_no_daemon(self, tmp_path: Path) -> None:
+        """A client without a daemon should report it as unavailable
+
+        Args:
+            tmp_path: Temporary directory for the socket
+        """
+
+        assert not DaemonClient(tmp_path / "daemon.sock").available()
+
+    def test_socket_per_interpreter(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Virtual environments sharing a cache directory should not share a daemon
+
+        Args:
+            monkeypatch: The patching fixture
+        """
+
+        first = socket_path()
+        monkeypatch.setattr(sys, "prefix", f"{sys.prefix}-other")
+
+        assert socket_path() != first
+
+    def test_warm_project(self, tmp_path: Path) -> None:
+        """Projects should be reused until their pyproject.toml changes
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text('[project]\nname = "warm"\nversion = "0.1.0"\n', encoding="utf-8")
+
+        daemon = Daemon(logging.getLogger(), tmp_path / "daemon.sock")
+
+        project = daemon.project(pyproject_file)
+        assert daemon.project(pyproject_file) is project
+
+        pyproject_file.write_text('[project]\nname = "warm"\nversion = "0.2.0"\n', encoding="utf-8")
+
+        assert daemon.project(pyproject_file) is not project
@@ -1,5 +1,6 @@
 """Tests the Data type"""
 
+import asyncio
 import logging
 
 import pytest
@@ -13,6 +14,7 @@ from cppython_core.schema import (
 from pytest_cppython.mock.generator import MockGenerator
 from pytest_cppython.mock.provider import MockProvider
 from pytest_cppython.mock.scm import MockSCM
+from pytest_mock import MockerFixture
 
 from cppython.builder import Builder
 from cppython.data import Data
@@ -56,3 +58,108 @@ class TestData:
             data: Fixture for the mocked data class
         """
         data.sync()
+
+    def test_state(self, data: Data) -> None:
+        """Verifies that a recorded install is recognized as current
+
+        Args:
+            data: Fixture for the mocked data class
+        """
+        asyncio.run(data.download_provider_tools())
+        data.sync()
+        data.record_state()
+
+        assert data.is_current()
+
+    def test_state_outputs(
+        self,
+        project_configuration: ProjectConfiguration,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+        mocker: MockerFixture,
+    ) -> None:
+        """Verifies that a recorded install stops being current once a generator output is edited
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+            pep621_configuration: Variant fixture for PEP 621 configuration
+            cppython_local_configuration: Variant fixture for cppython configuration
+            mocker: The mocking fixture
+        """
+        plugin_build_data = PluginBuildData(generator_type=MockGenerator, provider_type=MockProvider, scm_type=MockSCM)
+        data = Builder(project_configuration, logging.getLogger()).build(
+            pep621_configuration, cppython_local_configuration, plugin_build_data
+        )
+
+        output = project_configuration.pyproject_file.parent / "cppython-test-output.json"
+        mocker.patch.object(
+            data.plugins.generator, "sync", side_effect=lambda _: output.write_text("{}", encoding="utf-8")
+        )
+
+        asyncio.run(data.download_provider_tools())
+        data.sync()
+        data.record_state()
+
+        assert data.is_current()
+
+        output.write_text('{"edited": true}', encoding="utf-8")
+
+        assert not data.is_current()
+
+        output.unlink()
+
+    def test_sync_unchanged(self, data: Data, mocker: MockerFixture) -> None:
+        """Verifies that the generator is not synced again with unchanged data
+
+        Args:
+            data: Fixture for the mocked data class
+            mocker: The mocking fixture
+        """
+        data.sync()
+
+        spy = mocker.spy(data.plugins.generator, "sync")
+        data.sync()
+
+        spy.assert_not_called()
+
+    def test_provider_state(self, data: Data) -> None:
+        """Verifies that a recorded provider install is recognized as current
+
+        Args:
+            data: Fixture for the mocked data class
+        """
+        provider = data.plugins.provider
+
+        asyncio.run(data.download_tools(provider))
+        data.record_provider(provider)
+
+        assert data.provider_current(provider)
+
+    def test_state_verbosity(
+        self,
+        project_configuration: ProjectConfiguration,
+        pep621_configuration: PEP621Configuration,
+        cppython_local_configuration: CPPythonLocalConfiguration,
+    ) -> None:
+        """Verifies that output settings don't invalidate a recorded install
+
+        Args:
+            project_configuration: Variant fixture for the project configuration
+            pep621_configuration: Variant fixture for PEP 621 configuration
+            cppython_local_configuration: Variant fixture for cppython configuration
+        """
+        plugin_build_data = PluginBuildData(generator_type=MockGenerator, provider_type=MockProvider, scm_type=MockSCM)
+
+        quiet = Builder(project_configuration, logging.getLogger()).build(
+            pep621_configuration, cppython_local_configuration, plugin_build_data
+        )
+        asyncio.run(quiet.download_provider_tools())
+        quiet.sync()
+        quiet.record_state()
+
+        verbose_configuration = project_configuration.model_copy(update={"verbosity": 2, "debug": True})
+        verbose = Builder(verbose_configuration, logging.getLogger()).build(
+            pep621_configuration, cppython_local_configuration, plugin_build_data
+        )
+
+        assert verbose.is_current()
@@ -0,0 +1,125 @@
+"""Tests the plugin discovery index"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_cppython.mock.generator import MockGenerator
+from pytest_cppython.mock.provider import MockProvider
+
+from cppython.discovery import (
+    PluginHandle,
+    PluginIndex,
+    PluginRecord,
+    PluginRegistry,
+    environment_fingerprint,
+    resolve_plugin_index,
+    scan_entry_points,
+)
+
+
+class TestPluginIndex:
+    """Various tests for the PluginIndex type"""
+
+    def test_fingerprint_stable(self) -> None:
+        """The fingerprint should not change while the environment is untouched"""
+
+        assert environment_fingerprint() == environment_fingerprint()
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """A written index should be read back while the fingerprint matches
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        path = tmp_path / "plugins.json"
+        record = PluginRecord(group="generator", name="mock", target="module:Type", sync_types=["module.Sync"])
+        index = PluginIndex(fingerprint="abc", records=[record])
+
+        index.write(path)
+
+        assert PluginIndex.read(path, "abc") == index
+        assert PluginIndex.read(path, "def") is None
+
+    def test_build(self, tmp_path: Path) -> None:
+        """The built index should contain the installed test plugins and load them on demand
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        index = resolve_plugin_index(logging.getLogger(), tmp_path / "plugins.json")
+
+        generators = index.group("generator")
+        assert any(record.name == MockGenerator.name() for record in generators)
+
+        record = next(record for record in generators if record.name == MockGenerator.name())
+        assert record.load() is MockGenerator
+
+    def test_default_path(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Interpreters sharing a cache directory should each keep their own index
+
+        Args:
+            tmp_path: Temporary directory for the cache
+            monkeypatch: The patching fixture
+        """
+
+        monkeypatch.setenv("CPPYTHON_CACHE_DIR", str(tmp_path))
+
+        for prefix in ("first", "second"):
+            monkeypatch.setattr(sys, "prefix", str(tmp_path / prefix))
+            resolve_plugin_index(logging.getLogger(), fingerprint="abc")
+
+        assert len(list(tmp_path.glob("plugins-*.json"))) == 2
+
+
+class TestPluginHandle:
+    """Various tests for the PluginHandle type"""
+
+    def test_deferred_import(self) -> None:
+        """Metadata queries should not import the plugin"""
+
+        record = PluginRecord(
+            group="provider", name="missing", target="not_a_module:Missing", supported_sync_types=["module.Sync"]
+        )
+        handle: PluginHandle[MockProvider] = PluginHandle(record)
+
+        assert handle.name() == "missing"
+        assert handle.supported_sync_type("module.Sync")
+        assert not handle.supported_sync_type("module.Other")
+        assert not handle.loaded
+
+    def test_from_type(self) -> None:
+        """Wrapping a loaded type should report it as loaded"""
+
+        handle = PluginHandle.from_type("generator", MockGenerator)
+
+        assert handle.loaded
+        assert handle.name() == MockGenerator.name()
+        assert handle.load() is MockGenerator
+
+
+class TestPluginRegistry:
+    """Various tests for the PluginRegistry type"""
+
+    def test_single_scan(self) -> None:
+        """The scan should report every plugin group"""
+
+        entry_points = scan_entry_points()
+
+        assert set(entry_points) == {"generator", "provider", "scm"}
+        assert entry_points["generator"]
+
+    def test_shared(self, tmp_path: Path) -> None:
+        """Registries should be reused within a process
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        logger = logging.getLogger()
+        path = tmp_path / "plugins.json"
+
+        assert PluginRegistry.shared(logger, path) is PluginRegistry.shared(logger, path)
@@ -1,8 +1,17 @@
 """Tests the click interface type"""
 
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from click import ClickException
 from click.testing import CliRunner
+from cppython_core.exceptions import PluginError
 
-from cppython.console.interface import cli
+from cppython.console.interface import _find_pyproject_file, _search_upward, cli
 
 
 class TestInterface:
@@ -18,6 +27,34 @@ class TestInterface:
         result = cli_runner.invoke(cli, ["info"], catch_exceptions=False)
         assert result.exit_code == 0
 
+    def test_info_json(self, cli_runner: CliRunner) -> None:
+        """Verifies that the info command can report JSON
+
+        Args:
+            cli_runner: The click runner
+        """
+
+        result = cli_runner.invoke(cli, ["info", "--json"], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert '"enabled"' in result.output
+
+    def test_info_plugin_error(self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Verifies that the info command reports a project whose plugins can't be resolved
+
+        Args:
+            cli_runner: The click runner
+            monkeypatch: The patching fixture
+        """
+
+        def unresolvable(*_: Any) -> dict[str, Any]:
+            raise PluginError("No SCM plugin was found that supports the given path")
+
+        monkeypatch.setattr("cppython.report.describe_project", unresolvable)
+
+        result = cli_runner.invoke(cli, ["info", "--json"], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert "No SCM plugin" in result.output
+
     def test_list(self, cli_runner: CliRunner) -> None:
         """Verifies that the list command functions with CPPython hooks
 
@@ -28,6 +65,20 @@ class TestInterface:
         result = cli_runner.invoke(cli, ["list"], catch_exceptions=False)
         assert result.exit_code == 0
 
+    def test_list_outside_project(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Verifies that the list command works without a project to mark the selected plugins
+
+        Args:
+            tmp_path: Temporary directory without a pyproject.toml
+            monkeypatch: The patching fixture
+        """
+
+        monkeypatch.chdir(tmp_path)
+
+        result = CliRunner().invoke(cli, ["list", "--json"], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert '"selected": true' not in result.output
+
     def test_update(self, cli_runner: CliRunner) -> None:
         """Verifies that the update command functions with CPPython hooks
 
@@ -47,3 +98,90 @@ class TestInterface:
 
         result = cli_runner.invoke(cli, ["install"], catch_exceptions=False)
         assert result.exit_code == 0
+
+
+class TestFindPyproject:
+    """Various tests for the pyproject.toml search"""
+
+    def test_nested(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The search should walk upward from nested directories
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+
+        (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+
+        monkeypatch.delenv("CPPYTHON_PYPROJECT", raising=False)
+        monkeypatch.chdir(nested)
+        _search_upward.cache_clear()
+
+        assert _find_pyproject_file() == tmp_path
+
+    def test_repository_boundary(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The search should not leave the enclosing repository
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+
+        (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+        repository = tmp_path / "repository"
+        (repository / ".git").mkdir(parents=True)
+
+        monkeypatch.delenv("CPPYTHON_PYPROJECT", raising=False)
+        monkeypatch.chdir(repository)
+        _search_upward.cache_clear()
+
+        with pytest.raises(ClickException):
+            _find_pyproject_file()
+
+    def test_override(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The environment override should win over the search
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+
+        monkeypatch.setenv("CPPYTHON_PYPROJECT", str(tmp_path / "pyproject.toml"))
+
+        assert _find_pyproject_file() == tmp_path
+
+
+class TestStartup:
+    """Tracks the cost of starting the CLI"""
+
+    heavy_modules = ["tomlkit", "pydantic", "cppython_core.resolution", "cppython.project", "cppython.builder"]
+
+    def test_import_time(self, record_property: Callable[[str, object], None]) -> None:
+        """Importing the CLI should not load the project machinery. The cumulative import time is recorded with
+        the test results so that it can be tracked
+
+        Args:
+            record_property: Fixture that attaches data to the test report
+        """
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import cppython.console.interface"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        # Lines look like 'import time:       123 |        456 |   package.module'
+        cumulative: dict[str, int] = {}
+        for line in result.stderr.splitlines():
+            _, _, timing = line.partition("import time:")
+            fields = [field.strip() for field in timing.split("|")]
+            if len(fields) == 3 and fields[1].isdigit():
+                cumulative[fields[2]] = int(fields[1])
+
+        record_property("import_time_us", cumulative["cppython.console.interface"])
+
+        for module in self.heavy_modules:
+            assert module not in cumulative, f"'{module}' is imported on CLI startup"
@@ -0,0 +1,173 @@
+"""Tests the execution of plugin hooks in worker processes"""
+
+import asyncio
+import os
+import time
+
+import pytest
+from cppython_core.exceptions import PluginError
+
+from cppython.isolation import IsolationPolicy, PluginPool, PluginTimeoutError, resource
+
+
+class MockHooks:
+    """A picklable stand-in for a plugin"""
+
+    @staticmethod
+    def name() -> str:
+        """The plugin name
+
+        Returns:
+            The name
+        """
+        return "mock"
+
+    def pid(self) -> int:
+        """Reports the process the hook runs in
+
+        Returns:
+            The process ID
+        """
+        return os.getpid()
+
+    async def add(self, first: int, second: int) -> int:
+        """An asynchronous hook
+
+        Args:
+            first: The first term
+            second: The second term
+
+        Returns:
+            The sum
+        """
+        await asyncio.sleep(0)
+        return first + second
+
+    def fail(self) -> None:
+        """A failing hook
+
+        Raises:
+            RuntimeError: Always
+        """
+        raise RuntimeError("failure")
+
+    def hang(self) -> None:
+        """A hook that does not return in time"""
+        time.sleep(60)
+
+    def nap(self, seconds: float) -> None:
+        """A hook that takes a while, but returns in time
+
+        Args:
+            seconds: The duration of the hook
+        """
+        time.sleep(seconds)
+
+    def allocate(self, size: int) -> int:
+        """A hook that allocates memory
+
+        Args:
+            size: The number of bytes
+
+        Returns:
+            The allocated size
+        """
+        return len(bytearray(size))
+
+
+class TestPluginPool:
+    """Various tests for the PluginPool type"""
+
+    def test_call(self) -> None:
+        """Hooks should run in a reused worker, and asynchronous hooks should be awaited there"""
+
+        pool = PluginPool(IsolationPolicy(enabled=True), max_workers=1)
+
+        try:
+            first = asyncio.run(pool.call(MockHooks(), "pid"))
+            second = asyncio.run(pool.call(MockHooks(), "pid"))
+
+            assert first == second != os.getpid()
+            assert asyncio.run(pool.call(MockHooks(), "add", 1, 2)) == 3
+        finally:
+            pool.close()
+
+    def test_failure(self) -> None:
+        """A failing hook should raise in the caller, and its worker should be replaced"""
+
+        pool = PluginPool(IsolationPolicy(enabled=True), max_workers=1)
+
+        try:
+            worker = asyncio.run(pool.call(MockHooks(), "pid"))
+
+            with pytest.raises(PluginError, match="RuntimeError: failure"):
+                asyncio.run(pool.call(MockHooks(), "fail"))
+
+            assert asyncio.run(pool.call(MockHooks(), "pid")) != worker
+        finally:
+            pool.close()
+
+    def test_timeout(self) -> None:
+        """A hung hook should be killed once the timeout passes, leaving the pool usable"""
+
+        pool = PluginPool(IsolationPolicy(enabled=True, timeout=0.5), max_workers=1)
+
+        try:
+            start = time.perf_counter()
+
+            with pytest.raises(PluginTimeoutError):
+                asyncio.run(pool.call(MockHooks(), "hang"))
+
+            assert time.perf_counter() - start < 30
+            assert asyncio.run(pool.call(MockHooks(), "add", 2, 2)) == 4
+        finally:
+            pool.close()
+
+    def test_timeout_queued(self) -> None:
+        """Time spent waiting for a free worker should not count against the timeout of a call"""
+
+        pool = PluginPool(IsolationPolicy(enabled=True, timeout=2.5), max_workers=1)
+
+        async def queue() -> None:
+            await asyncio.gather(pool.call(MockHooks(), "nap", 1.5), pool.call(MockHooks(), "nap", 1.5))
+
+        try:
+            # The worker is started beforehand, so that neither call pays for its startup
+            asyncio.run(pool.call(MockHooks(), "pid"))
+            asyncio.run(queue())
+        finally:
+            pool.close()
+
+    def test_cancel(self) -> None:
+        """Cancelling the awaiting task should stop the hook"""
+
+        pool = PluginPool(IsolationPolicy(enabled=True), max_workers=1)
+
+        async def cancel() -> None:
+            task = asyncio.create_task(pool.call(MockHooks(), "hang"))
+            await asyncio.sleep(0.5)
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        try:
+            start = time.perf_counter()
+            asyncio.run(cancel())
+
+            assert time.perf_counter() - start < 30
+            assert asyncio.run(pool.call(MockHooks(), "add", 1, 1)) == 2
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(resource is None, reason="Memory limits need the 'resource' module")
+    def test_memory_limit(self) -> None:
+        """A hook exceeding the memory limit should fail instead of growing the worker"""
+
+        pool = PluginPool(IsolationPolicy(enabled=True, memory_limit=512 * 1024 * 1024), max_workers=1)
+
+        try:
+            with pytest.raises(PluginError, match="MemoryError"):
+                asyncio.run(pool.call(MockHooks(), "allocate", 1024 * 1024 * 1024))
+        finally:
+            pool.close()
@@ -0,0 +1,103 @@
+"""Tests the advisory file locks"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from cppython.locking import FileLock, resource_lock
+
+
+class TestFileLock:
+    """Various tests for the FileLock type"""
+
+    def test_exclusive(self, tmp_path: Path) -> None:
+        """An exclusive lock should keep other holders waiting until it is released
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        path = tmp_path / "lock"
+        order: list[str] = []
+
+        def contend() -> None:
+            with FileLock(path):
+                order.append("second")
+
+        with FileLock(path):
+            thread = threading.Thread(target=contend)
+            thread.start()
+            time.sleep(0.2)
+            order.append("first")
+
+        thread.join()
+
+        assert order == ["first", "second"]
+
+    def test_shared(self, tmp_path: Path) -> None:
+        """Shared locks should be held together, and keep writers waiting
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        path = tmp_path / "lock"
+        order: list[str] = []
+
+        def read() -> None:
+            with FileLock(path, shared=True):
+                order.append("reader")
+
+        def write() -> None:
+            with FileLock(path):
+                order.append("writer")
+
+        with FileLock(path, shared=True):
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(timeout=5)
+
+            writer = threading.Thread(target=write)
+            writer.start()
+            time.sleep(0.2)
+            order.append("released")
+
+        writer.join()
+
+        assert order == ["reader", "released", "writer"]
+
+    def test_async(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Waiting for a lock should not block the event loop
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+
+        monkeypatch.setenv("CPPYTHON_CACHE_DIR", str(tmp_path))
+        order: list[str] = []
+
+        async def hold() -> None:
+            async with resource_lock(tmp_path / "resource"):
+                await asyncio.sleep(0.2)
+                order.append("first")
+
+        async def wait() -> None:
+            await asyncio.sleep(0.05)
+
+            async with resource_lock(tmp_path / "resource"):
+                order.append("second")
+
+        async def tick() -> None:
+            await asyncio.sleep(0.1)
+            order.append("tick")
+
+        async def run() -> None:
+            await asyncio.gather(hold(), wait(), tick())
+
+        asyncio.run(run())
+
+        assert order == ["tick", "first", "second"]
@@ -0,0 +1,58 @@
+"""Tests the logging setup"""
+
+import logging
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+from cppython.logger import (
+    LOGGER_NAME,
+    ProjectFormatter,
+    install_logging,
+    project_logger,
+    set_verbosity,
+)
+
+
+class TestLogging:
+    """Various tests for the logging setup"""
+
+    def test_install_once(self) -> None:
+        """Repeated setup should not attach more handlers"""
+
+        install_logging()
+        install_logging()
+
+        handlers = logging.getLogger(LOGGER_NAME).handlers
+        assert len([handler for handler in handlers if isinstance(handler, QueueHandler)]) == 1
+
+    def test_project_prefix(self) -> None:
+        """Project messages should name their project"""
+
+        logger = project_logger(Path("example"))
+        record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, "Installed %s", ("dependency",), None)
+
+        assert ProjectFormatter().format(record) == "[example] Installed dependency"
+
+    def test_same_name(self, tmp_path: Path) -> None:
+        """Projects in directories of the same name should not share a logger
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        first = project_logger(tmp_path / "libs" / "core")
+        second = project_logger(tmp_path / "apps" / "core")
+
+        set_verbosity(first, 2)
+        set_verbosity(second, 0)
+
+        assert first is not second
+        assert first.level == logging.DEBUG
+
+    def test_verbosity(self) -> None:
+        """Verbosity counts beyond the most detailed level should clamp"""
+
+        logger = project_logger(Path("verbose"))
+        set_verbosity(logger, 5)
+
+        assert logger.level == logging.DEBUG
@@ -0,0 +1,119 @@
+"""Tests the Pipeline type"""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from cppython.pipeline import Estimate, Pipeline, call_hook
+
+
+class TestPipeline:
+    """Various tests for the Pipeline type"""
+
+    def test_dependency_order(self) -> None:
+        """Steps should start only after their dependencies finish"""
+
+        order: list[str] = []
+
+        async def slow() -> None:
+            await asyncio.sleep(0.01)
+            order.append("slow")
+
+        async def fast() -> None:
+            order.append("fast")
+
+        pipeline = Pipeline(logging.getLogger())
+        pipeline.add("slow", slow)
+        pipeline.add("fast", fast)
+        pipeline.add_blocking("last", lambda: order.append("last"), ["slow", "fast"])
+
+        asyncio.run(pipeline.run())
+
+        assert order == ["fast", "slow", "last"]
+
+    def test_failure(self) -> None:
+        """A failing step should stop its dependents and raise"""
+
+        order: list[str] = []
+
+        async def fail() -> None:
+            raise RuntimeError("failure")
+
+        pipeline = Pipeline(logging.getLogger())
+        pipeline.add("fail", fail)
+        pipeline.add_blocking("dependent", lambda: order.append("dependent"), ["fail"])
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(pipeline.run())
+
+        assert not order
+
+    def test_unknown_dependency(self) -> None:
+        """Dependencies must be added before their dependents"""
+
+        async def step() -> None:
+            pass
+
+        pipeline = Pipeline(logging.getLogger())
+
+        with pytest.raises(ValueError):
+            pipeline.add("step", step, ["missing"])
+
+    def test_plan(self) -> None:
+        """Planning should run no step, and a step should only be cached if its dependencies are"""
+
+        order: list[str] = []
+
+        async def step() -> None:
+            order.append("step")
+
+        pipeline = Pipeline(logging.getLogger())
+        pipeline.add("download", step, kind="download", estimate=lambda: Estimate(cached=False, detail=["archive"]))
+        pipeline.add("install", step, ["download"], estimate=lambda: Estimate(cached=True))
+        pipeline.add("other", step, estimate=lambda: Estimate(cached=True))
+
+        planned = {step.name: step for step in pipeline.plan({"download": 2.0, "install": 1.0, "other": 3.0})}
+
+        assert not order
+        assert planned["download"].kind == "download"
+        assert planned["download"].detail == ["archive"]
+        assert not planned["download"].cached and planned["download"].cost == 2.0
+        assert not planned["install"].cached and planned["install"].cost == 1.0
+        assert planned["other"].cached and planned["other"].cost == 0.0
+
+    def test_durations(self) -> None:
+        """Every finished step should have its duration recorded"""
+
+        async def step() -> None:
+            pass
+
+        pipeline = Pipeline(logging.getLogger())
+        pipeline.add("first", step)
+        pipeline.add("second", step, ["first"])
+
+        asyncio.run(pipeline.run())
+
+        assert set(pipeline.durations) == {"first", "second"}
+
+
+class TestCallHook:
+    """Various tests for plugin hook calls"""
+
+    def test_blocking(self) -> None:
+        """Blocking hooks should run on a worker thread"""
+
+        def hook(value: int) -> int:
+            return threading.get_ident() + value
+
+        assert asyncio.run(call_hook(hook, 0)) != threading.get_ident()
+
+    def test_async(self) -> None:
+        """Coroutine hooks should be awaited on the event loop"""
+
+        async def hook(value: int) -> int:
+            await asyncio.sleep(0)
+            return threading.get_ident() + value
+
+        assert asyncio.run(call_hook(hook, 0)) == threading.get_ident()
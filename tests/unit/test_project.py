@@ -101,3 +101,22 @@ class TestProject:
         project = Project(project_configuration, interface, pyproject.model_dump(by_alias=True))
 
         assert project.enabled
+
+    def test_plan_unknown_cost(self, tmp_path: Path) -> None:
+        """A plan without timings from an earlier run should not report a total cost
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        file_path = tmp_path / "pyproject.toml"
+        file_path.write_text("", encoding="utf8")
+
+        project_configuration = ProjectConfiguration(pyproject_file=file_path, version=None)
+        pyproject = PyProject(project=pep621, tool=ToolData(cppython=CPPythonLocalConfiguration()))
+        project = Project(project_configuration, MockInterface(), pyproject.model_dump(by_alias=True))
+
+        plan = project.plan(update=True)
+
+        assert plan["cost"] is None
+        assert plan["unknown_steps"] == sum(not step["cached"] and step["cost"] is None for step in plan["steps"]) > 0
@@ -0,0 +1,69 @@
+"""Tests the pyproject.toml loading"""
+
+from pathlib import Path
+
+from cppython.pyproject import (
+    clear_pyproject_cache,
+    load_providers,
+    load_pyproject,
+    split_providers,
+)
+
+
+class TestLoadPyProject:
+    """Various tests for load_pyproject"""
+
+    def test_cached(self, tmp_path: Path) -> None:
+        """Unchanged files should not be validated again
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        file = tmp_path / "pyproject.toml"
+        file.write_text('[project]\nname = "test"\nversion = "0.1.0"\n', encoding="utf-8")
+
+        clear_pyproject_cache()
+        first = load_pyproject(file)
+
+        assert load_pyproject(file) is first
+
+        file.write_text('[project]\nname = "changed"\nversion = "0.1.0"\n', encoding="utf-8")
+
+        assert load_pyproject(file).project.name == "changed"
+
+    def test_providers(self, tmp_path: Path) -> None:
+        """Provider tables should be split off before the core schema validates the file
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        file = tmp_path / "pyproject.toml"
+        file.write_text(
+            '[project]\nname = "test"\nversion = "0.1.0"\n\n[tool.cppython]\n\n'
+            '[tool.cppython.providers.first]\nremote = "a"\n\n[tool.cppython.providers.second]\n',
+            encoding="utf-8",
+        )
+
+        clear_pyproject_cache()
+
+        assert load_pyproject(file).tool
+        assert load_providers(file) == {"first": {"remote": "a"}, "second": {}}
+
+
+class TestSplitProviders:
+    """Various tests for split_providers"""
+
+    def test_untouched(self) -> None:
+        """The input should not be modified, and projects without provider tables should have none"""
+
+        data = {"tool": {"cppython": {"providers": {"first": {}}}}}
+
+        stripped, providers = split_providers(data)
+
+        assert stripped == {"tool": {"cppython": {}}}
+        assert providers == {"first": {}}
+        assert data == {"tool": {"cppython": {"providers": {"first": {}}}}}
+
+        assert split_providers(stripped) == (stripped, {})
@@ -0,0 +1,76 @@
+"""Tests the project descriptions"""
+
+import logging
+from pathlib import Path
+
+import pytest
+from cppython_core.schema import (
+    CPPythonLocalConfiguration,
+    PEP621Configuration,
+    ProjectConfiguration,
+    PyProject,
+    ToolData,
+)
+
+from cppython.report import describe_project, format_report, list_plugins
+
+pep621 = PEP621Configuration(name="test-project", version="0.1.0")
+
+
+class TestDescribeProject:
+    """Various tests for describe_project"""
+
+    def test_disabled(self, tmp_path: Path) -> None:
+        """Projects without the cppython table should be described as disabled
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        file_path = tmp_path / "pyproject.toml"
+        file_path.write_text("", encoding="utf-8")
+
+        project_configuration = ProjectConfiguration(pyproject_file=file_path, version=None)
+        description = describe_project(project_configuration, PyProject(project=pep621), logging.getLogger())
+
+        assert not description["enabled"]
+
+    def test_cached(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The second description should come from the snapshot, and an uninstalled project should not be current
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+
+        monkeypatch.setenv("CPPYTHON_CACHE_DIR", str(tmp_path / "cache"))
+
+        file_path = tmp_path / "pyproject.toml"
+        file_path.write_text("", encoding="utf-8")
+
+        project_configuration = ProjectConfiguration(pyproject_file=file_path, version=None)
+        pyproject = PyProject(project=pep621, tool=ToolData(cppython=CPPythonLocalConfiguration()))
+        logger = logging.getLogger()
+
+        first = describe_project(project_configuration, pyproject, logger)
+        second = describe_project(project_configuration, pyproject, logger)
+
+        assert first["enabled"]
+        assert not first["cache"]["snapshot"]
+        assert second["cache"]["snapshot"]
+        assert not second["cache"]["current"]
+        assert second["plugins"] == first["plugins"]
+
+        selected = [plugin for plugin in list_plugins(logger, second) if plugin["selected"]]
+        assert {plugin["group"] for plugin in selected} == {"generator", "provider", "scm"}
+
+
+class TestFormatReport:
+    """Various tests for format_report"""
+
+    def test_nested(self) -> None:
+        """Nested tables and lists should be indented below their key"""
+
+        lines = format_report({"name": "test", "plugins": {"providers": ["a", "b"]}, "timings": {}})
+
+        assert lines == ["name: test", "plugins:", "  providers:", "    - a", "    - b", "timings: {}"]
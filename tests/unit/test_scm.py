@@ -0,0 +1,51 @@
+"""Tests the SCM cache"""
+
+from pathlib import Path
+
+from cppython_core.plugin_schema.scm import SCM
+from pytest_mock import MockerFixture
+
+from cppython.scm import SCMCache, repository_state
+
+
+class TestSCMCache:
+    """Various tests for the SCMCache type"""
+
+    def test_repository_state(self, tmp_path: Path) -> None:
+        """The state should change when the repository HEAD moves
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        git_directory = tmp_path / ".git"
+        git_directory.mkdir()
+        (git_directory / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+
+        state = repository_state(tmp_path)
+        assert state == repository_state(tmp_path)
+
+        (git_directory / "HEAD").write_text("ref: refs/heads/feature\n", encoding="utf-8")
+        assert state != repository_state(tmp_path)
+
+    def test_version_cached(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """The SCM plugin should only be asked for the version once per repository state
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            mocker: The mocking fixture
+        """
+
+        scm = mocker.MagicMock(spec=SCM)
+        scm.name.return_value = "mock"
+        scm.version.return_value = "1.0.0"
+
+        cache = SCMCache(tmp_path / "scm.json")
+
+        assert cache.version(scm, tmp_path) == "1.0.0"
+        assert cache.version(scm, tmp_path) == "1.0.0"
+        scm.version.assert_called_once()
+
+        # The persisted entry is reused by a fresh cache
+        assert SCMCache(tmp_path / "scm.json").version(scm, tmp_path) == "1.0.0"
+        scm.version.assert_called_once()
@@ -0,0 +1,80 @@
+"""Tests the generator sync records"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from cppython import tooling
+from cppython.sync import OutputWatch
+from cppython.tooling import stamp_file
+
+
+class TestOutputWatch:
+    """Various tests for the OutputWatch type"""
+
+    def test_settle(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Rewritten outputs with identical content should keep their old modification time, and files the sync
+        left alone should not be read
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+            monkeypatch: The patching fixture
+        """
+
+        tool_path = tmp_path / "tool"
+        tool_path.mkdir()
+
+        same = tool_path / "same.json"
+        changed = tool_path / "changed.json"
+        kept = tool_path / "kept.json"
+        other = tmp_path / "other.txt"
+        untouched = tmp_path / "untouched.txt"
+
+        for path, content in ((same, "same"), (changed, "old"), (kept, "kept"), (other, "other"), (untouched, "")):
+            path.write_text(content, encoding="utf-8")
+
+        previous = {path.as_posix(): stamp_file(path) for path in (same, changed, kept)}
+
+        watch = OutputWatch(tmp_path, tool_path)
+        before = watch.survey()
+
+        same.write_text("same", encoding="utf-8")
+        changed.write_text("new", encoding="utf-8")
+        other.write_text("other", encoding="utf-8")
+
+        # Rewrites within the same clock tick would go unnoticed, so move the modification times on explicitly
+        for path in (same, changed, other):
+            modified = before[path.as_posix()][1] + 1_000_000_000
+            os.utime(path, ns=(modified, modified))
+
+        hashed: list[Path] = []
+        hash_file = tooling.hash_file
+
+        def record_hash(path: Path) -> str:
+            hashed.append(path)
+            return hash_file(path)
+
+        monkeypatch.setattr(tooling, "hash_file", record_hash)
+
+        outputs = OutputWatch.settle(previous, before, watch.survey())
+
+        assert set(outputs) == {same.as_posix(), changed.as_posix(), kept.as_posix(), other.as_posix()}
+        assert set(hashed) == {same, changed, other}
+        assert same.stat().st_mtime_ns == previous[same.as_posix()].modified
+        assert other.stat().st_mtime_ns != before[other.as_posix()][1]
+        assert OutputWatch.intact(outputs)
+
+    def test_excluded(self, tmp_path: Path) -> None:
+        """Excluded files should not be watched
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        (tmp_path / "record.json").write_text("", encoding="utf-8")
+        (tmp_path / "output.json").write_text("", encoding="utf-8")
+
+        watch = OutputWatch(tmp_path, tmp_path / "tool", [tmp_path / "record.json"])
+
+        assert list(watch.survey()) == [(tmp_path / "output.json").as_posix()]
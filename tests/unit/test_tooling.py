@@ -0,0 +1,89 @@
+"""Tests the tooling cache"""
+
+from pathlib import Path
+
+from cppython.tooling import ToolingCache
+
+
+class TestToolingCache:
+    """Various tests for the ToolingCache type"""
+
+    def test_valid_after_record(self, tmp_path: Path) -> None:
+        """Recorded tooling should be valid until it is modified
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        directory = tmp_path / "install"
+        directory.mkdir()
+        (directory / "tool.txt").write_text("tool", encoding="utf-8")
+
+        cache = ToolingCache(tmp_path / "store")
+
+        assert not cache.is_valid(directory, "mock", "1.0")
+
+        cache.record(directory, "mock", "1.0")
+        assert cache.is_valid(directory, "mock", "1.0")
+        assert not cache.is_valid(directory, "mock", "2.0")
+
+        # Recorded files are read-only links into the artifact store, so they are modified by replacement
+        (directory / "tool.txt").unlink()
+        (directory / "tool.txt").write_text("modified", encoding="utf-8")
+        assert not cache.is_valid(directory, "mock", "1.0")
+
+    def test_restore(self, tmp_path: Path) -> None:
+        """Tooling recorded by one project should be restorable into another
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        first = tmp_path / "first"
+        first.mkdir()
+        (first / "tool.txt").write_text("tool", encoding="utf-8")
+
+        cache = ToolingCache(tmp_path / "store")
+        cache.record(first, "mock", "1.0")
+
+        second = tmp_path / "second"
+        second.mkdir()
+
+        assert cache.restore(second, "mock", "1.0")
+        assert (second / "tool.txt").read_text(encoding="utf-8") == "tool"
+        assert cache.is_valid(second, "mock", "1.0")
+
+    def test_release(self, tmp_path: Path) -> None:
+        """Released tooling should no longer link into the store, so downloads can't write through to it
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        directory = tmp_path / "install"
+        directory.mkdir()
+        (directory / "tool.txt").write_text("tool", encoding="utf-8")
+
+        cache = ToolingCache(tmp_path / "store")
+        cache.record(directory, "mock", "1.0")
+        cache.release(directory)
+
+        assert not (directory / "tool.txt").exists()
+        assert not cache.is_valid(directory, "mock", "1.0")
+        assert cache.stored("mock", "1.0")
+
+    def test_eviction(self, tmp_path: Path) -> None:
+        """Entries beyond the size limit should be evicted
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        directory = tmp_path / "install"
+        directory.mkdir()
+        (directory / "tool.txt").write_text("tool", encoding="utf-8")
+
+        cache = ToolingCache(tmp_path / "store", max_size=0)
+        cache.record(directory, "mock", "1.0")
+
+        assert not cache.restore(tmp_path / "other", "mock", "1.0")
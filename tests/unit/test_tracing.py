@@ -0,0 +1,98 @@
+"""Tests the tracing module"""
+
+import asyncio
+import io
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from cppython.tracing import Tracer, traced, tracer
+
+
+class TestTracer:
+    """Various tests for the Tracer type"""
+
+    def test_disabled(self) -> None:
+        """Nothing should be recorded until tracing is enabled"""
+
+        instance = Tracer()
+
+        with instance.span("ignored"):
+            pass
+
+        assert not instance.events
+
+    def test_finish(self, tmp_path: Path) -> None:
+        """Finishing should write a Chrome trace and print the summary
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        path = tmp_path / "trace.json"
+
+        instance = Tracer()
+        instance.enable(path)
+
+        with instance.span("outer"):
+            with instance.span("inner", category="plugin", detail=1):
+                pass
+
+        stream = io.StringIO()
+        instance.finish(stream)
+
+        events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+        assert [event["name"] for event in events] == ["inner", "outer"]
+        assert events[0]["cat"] == "plugin"
+        assert events[0]["args"] == {"detail": "1"}
+        assert "outer" in stream.getvalue()
+        assert not instance.enabled
+
+
+class TestTraced:
+    """Various tests for the traced decorator"""
+
+    @pytest.fixture(name="enabled")
+    def fixture_enabled(self) -> Iterator[Tracer]:
+        """Enables the process-wide tracer for the duration of a test
+
+        Yields:
+            The tracer
+        """
+
+        instance = tracer()
+        instance.enable()
+        yield instance
+        instance.disable()
+
+    def test_function(self, enabled: Tracer) -> None:
+        """Decorated functions should keep their result and record a span named after themselves
+
+        Args:
+            enabled: The enabled tracer
+        """
+
+        @traced
+        def add(first: int, second: int) -> int:
+            return first + second
+
+        assert add(1, 2) == 3
+        assert [event.name for event in enabled.events] == [add.__qualname__]
+
+    def test_coroutine(self, enabled: Tracer) -> None:
+        """Decorated coroutine functions should stay awaitable and be timed until they complete
+
+        Args:
+            enabled: The enabled tracer
+        """
+
+        @traced
+        async def wait() -> str:
+            await asyncio.sleep(0.01)
+            return "done"
+
+        assert asyncio.run(wait()) == "done"
+        assert enabled.events[0].duration >= 0.01
@@ -0,0 +1,55 @@
+"""Tests the Workspace type"""
+
+import logging
+from pathlib import Path
+
+from pytest_cppython.mock.interface import MockInterface
+
+from cppython.workspace import Workspace, find_members, read_member_patterns
+
+
+class TestWorkspace:
+    """Various tests for the Workspace type"""
+
+    def test_find_members(self, tmp_path: Path) -> None:
+        """Member globs should resolve to member pyproject files, excluding the root
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        (tmp_path / "pyproject.toml").write_text('[tool.cppython-workspace]\nmembers = ["*"]\n', encoding="utf-8")
+
+        for name in ("first", "second"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "pyproject.toml").write_text("", encoding="utf-8")
+
+        (tmp_path / "unrelated").mkdir()
+
+        patterns = read_member_patterns({"tool": {"cppython-workspace": {"members": ["*"]}}})
+        members = find_members(tmp_path, patterns)
+
+        assert [member.parent.name for member in members] == ["first", "second"]
+
+    def test_run(self, tmp_path: Path) -> None:
+        """Every member should be reported, failures included
+
+        Args:
+            tmp_path: Temporary directory for dummy data
+        """
+
+        first = tmp_path / "first" / "pyproject.toml"
+        first.parent.mkdir()
+        first.write_text('[project]\nname = "first"\nversion = "0.1.0"\n', encoding="utf-8")
+
+        broken = tmp_path / "broken" / "pyproject.toml"
+        broken.parent.mkdir()
+        broken.write_text("not toml", encoding="utf-8")
+
+        workspace = Workspace([first, broken], MockInterface(), logging.getLogger())
+
+        reported: list[Path] = []
+        results = workspace.run("install", 2, lambda result: reported.append(result.pyproject_file))
+
+        assert sorted(reported) == sorted([first, broken])
+        assert [result.success for result in results] == [True, False]